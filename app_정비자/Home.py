@@ -2,11 +2,15 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-from utils.data_processing import load_data, merge_dataframes, extract_and_apply_region
-from utils.data_processing import calculate_previous_maintenance_dates, map_employee_data, merge_repair_costs
-from utils.data_processing import process_date_columns, preprocess_repair_costs
-from utils.visualization import setup_korean_font
+import functools
+from datetime import datetime
+from utils.ingestion import run_full_pipeline, pipeline_stages, sources_fingerprint, append_maintenance_data
+from utils.ingestion import ASSET_DATA_PATH, ORG_DATA_PATH, CLIENT_ALIAS_PATH, STAGE_LABELS
+from utils.client_names import load_alias_table
+from utils.dedup import fingerprint_digest
+from utils.jobs import get_job_runner, Job
+from utils.data_processing import Diagnostics, render_diagnostics, render_stage_profile
+from utils.tables import show_table, WON, HOURS
 import os
 
 # 페이지 설정
@@ -15,9 +19,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# 한글 폰트 설정 (한 번만 실행)
-setup_korean_font()
-
 # 세션 상태 초기화
 if 'data_loaded' not in st.session_state:
     st.session_state.data_loaded = False
@@ -29,44 +30,70 @@ st.sidebar.title("데이터 업로드")
 uploaded_file1 = st.sidebar.file_uploader("**정비일지 데이터 업로드**", type=["xlsx"])
 uploaded_file3 = st.sidebar.file_uploader("**소모품 출고 데이터 업로드**", type=["xlsx"])
 
-# 내장 데이터 로드 (자산조회 및 조직도)
-@st.cache_data
-def load_static_data():
-    try:
-        # 자산조회 데이터 로드
-        asset_data_path = "data/자산조회데이터.xlsx"
-        if os.path.exists(asset_data_path):
-            df2 = pd.read_excel(asset_data_path)
-            df2.columns = [str(col).strip().replace('\n', '') for col in df2.columns]
-        else:
-            df2 = None
-            st.sidebar.warning("자산조회 데이터 파일이 없습니다.")
-        
-        # 조직도 데이터 로드
-        org_data_path = "data/조직도데이터.xlsx"
-        if os.path.exists(org_data_path):
-            df4 = pd.read_excel(org_data_path)
-            df4.columns = [str(col).strip().replace('\n', '') for col in df4.columns]
-        else:
-            df4 = None
-            st.sidebar.warning("조직도 데이터 파일이 없습니다.")
-        
-        return df2, df4
-    except Exception as e:
-        st.sidebar.error(f"내장 데이터 로드 중 오류 발생: {e}")
-        return None, None
+# 이어 붙이기 (업로더는 파일 하나씩 받으므로, 달마다 새 파일을 올려 지금 불러온 데이터 뒤에 붙임)
+append_upload = st.sidebar.checkbox("불러온 데이터에 이어 붙이기", key='append_upload',
+                                    disabled='df1_fingerprints' not in st.session_state,
+                                    help="새로 올린 정비일지를 지금 분석 중인 데이터 뒤에 붙입니다. "
+                                         "이미 불러온 기록과 겹치는 행은 행 지문으로 찾아 제외합니다.")
 
-# 내장 데이터 로드 함수 호출
-df2, df4 = load_static_data()
+# 단계별 계측 (켜면 파이프라인을 계측 모드로 다시 실행, 결과는 '처리 정보' 탭에 표시)
+profile_pipeline = st.sidebar.toggle("처리 단계 계측", value=False,
+                                     help="파일 파싱과 각 처리 단계의 소요 시간, 행 수, 메모리 할당량을 기록합니다. "
+                                          "메모리 추적 때문에 계측 중에는 처리가 느려질 수 있습니다.")
 
-# 세션 상태에 저장
-if df2 is not None:
-    st.session_state.df2 = df2
-    st.sidebar.success("자산조회 데이터 로드 완료")
+# 입력 파일 구성 (내장 자산조회/조직도 + 업로드 파일)
+input_sources = {}
+if os.path.exists(ASSET_DATA_PATH):
+    input_sources['asset'] = ('static', ASSET_DATA_PATH)
+else:
+    st.sidebar.warning("자산조회 데이터 파일이 없습니다.")
 
-if df4 is not None:
-    st.session_state.df4 = df4
-    st.sidebar.success("조직도 데이터 로드 완료")
+if os.path.exists(ORG_DATA_PATH):
+    input_sources['org'] = ('static', ORG_DATA_PATH)
+else:
+    st.sidebar.warning("조직도 데이터 파일이 없습니다.")
+
+if uploaded_file1 is not None:
+    input_sources['maintenance'] = ('log', uploaded_file1.getvalue())
+if uploaded_file3 is not None:
+    input_sources['parts'] = ('log', uploaded_file3.getvalue())
+
+# 이어 붙일 기준 데이터: 새 파일 조합이 올라올 때 그 시점의 분석 데이터(이전에 이어 붙인 결과 포함)로 고정
+# (같은 파일로 재실행될 때 방금 붙인 결과를 다시 기준으로 삼아 모든 행이 중복 처리되지 않도록)
+append_base = None
+if append_upload and uploaded_file1 is not None and 'df1_fingerprints' in st.session_state:
+    upload_key = sources_fingerprint(input_sources)
+    append_base = st.session_state.get('append_base')
+    if append_base is None or append_base['upload_key'] != upload_key:
+        append_base = {
+            'upload_key': upload_key,
+            'df': st.session_state.df1_with_costs,
+            'part_pairs': st.session_state.get('part_pairs'),
+            'fingerprints': st.session_state.df1_fingerprints,
+            'digest': fingerprint_digest(st.session_state.df1_fingerprints),
+        }
+        st.session_state.append_base = append_base
+
+# 백그라운드 작업으로 파이프라인 실행
+# - 처리 중 위젯을 조작해도 작업이 다시 시작되지 않음 (재실행 시 진행 상황만 조회)
+# - 같은 파일 조합은 세션이 달라도 하나의 작업을 공유
+# - 계측 모드는 별도 작업으로 실행 (계측하지 않는 작업에는 계측 코드가 전혀 실행되지 않음)
+# - 이어 붙이기는 기준 데이터의 지문까지 같아야 같은 작업
+job_key = (sources_fingerprint(input_sources) + (':profile' if profile_pipeline else '')
+           + (f":append:{append_base['digest'][:16]}" if append_base else ''))
+runner = get_job_runner()
+job_stages = pipeline_stages(input_sources)
+job_func = functools.partial(run_full_pipeline, profile=profile_pipeline, alias_path=CLIENT_ALIAS_PATH,
+                             previous=append_base['fingerprints'] if append_base else None)
+if runner.get(job_key) is None and st.session_state.get('published_job_key') == job_key \
+        and 'loaded_result' in st.session_state:
+    # 이 세션에 이미 반영한 작업이 실행기에서 정리된 경우: 다시 실행하지 않고 세션에 남긴 결과 사용
+    job = Job.finished(job_key, st.session_state.loaded_result)
+else:
+    if runner.get(job_key) is None:
+        # 이 세션에서 새로 실행한 작업 (그 외에는 다른 세션/이전 실행 결과를 재사용 = 캐시 적중)
+        st.session_state.setdefault('created_job_keys', set()).add(job_key)
+    job = runner.submit(job_key, job_stages, job_func, input_sources)
 
 # 메인 제목
 st.title("산업장비 AS 분석 대시보드")
@@ -82,215 +109,132 @@ st.info("""
 분석 결과 해석 시 참고하시기 바랍니다.
 """)
 
-# 정비일지 데이터 전처리 함수 추가
-def preprocess_maintenance_data(df):
-    """정비일지 데이터 전처리 함수"""
-    try:
-        # 컬럼명 정리 (줄바꿈, 공백 제거)
-        df.columns = [str(col).strip().replace('\n', '') for col in df.columns]
-        
-        # 정비구분 컬럼 전처리
-        if '정비구분' in df.columns:
-            df['정비구분'] = df['정비구분'].astype(str).apply(lambda x: x.strip().replace('\n', '') if not pd.isna(x) else x)
-            # 'nan' 문자열을 실제 NaN으로 변환
-            df.loc[df['정비구분'] == 'nan', '정비구분'] = np.nan
-            
-            # 내부/외부 값 표준화 (대소문자 구분 없이)
-            def standardize_maintenance_type(value):
-                if pd.isna(value):
-                    return value
-                value_lower = str(value).lower()
-                if '내부' in value_lower:
-                    return '내부'
-                elif '외부' in value_lower:
-                    return '외부'
-                return value
-            
-            df['정비구분'] = df['정비구분'].apply(standardize_maintenance_type)
-        
-        # 수치형 데이터 처리
-        numeric_columns = ['가동시간', '수리시간', '수리비']
-        for col in numeric_columns:
-            if col in df.columns:
-                # 숫자가 아닌 값을 NaN으로 변환
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        return df
-    
-    except Exception as e:
-        st.error(f"정비일지 데이터 전처리 중 오류 발생: {e}")
-        return df
-
-# 소속별 수리비 통계 계산 함수
-def calculate_dept_repair_stats(df, df4=None):
-    """소속별 수리비 통계 계산 함수"""
-    try:
-        if '정비자소속' in df.columns and '수리비' in df.columns:
-            # 유효한 데이터만 필터링
-            df_valid = df[['정비자소속', '수리비']].copy()
-            df_valid = df_valid.dropna()
-            
-            if not df_valid.empty:
-                # 소속별 총 수리비 및 건수 계산
-                dept_stats = df_valid.groupby('정비자소속').agg({
-                    '수리비': ['sum', 'mean', 'count']
-                })
-                
-                dept_stats.columns = ['총수리비', '평균수리비', '건수']
-                dept_stats = dept_stats.reset_index()
-                
-                # 조직도 데이터에서 소속별 인원 수 가져오기
-                if df4 is not None and '소속' in df4.columns:
-                    total_staff_by_dept = df4['소속'].value_counts()
-                    
-                    # 소속별 인원 수 매핑
-                    dept_stats['소속인원수'] = dept_stats['정비자소속'].map(
-                        lambda x: total_staff_by_dept.get(x, 1)
-                    )
-                else:
-                    # 조직도 데이터가 없으면 기본값 1 설정
-                    dept_stats['소속인원수'] = 1
-                
-                # 인원당 수리비 계산
-                dept_stats['인원당수리비'] = (dept_stats['총수리비'] / dept_stats['소속인원수']).round(0)
-                
-                return dept_stats
-            
-        return None
-    except Exception as e:
-        st.warning(f"소속별 수리비 통계 계산 중 오류 발생: {e}")
-        return None
-
-# 사용자 업로드 파일 처리
+# 처리 진행 상황 (1초마다 이 영역만 갱신하고, 완료되면 전체 페이지 재실행)
+STAGE_ICONS = {'pending': '⏸️', 'running': '⏳', 'done': '✅', 'error': '❌'}
+
+@st.fragment(run_every=1.0)
+def show_job_progress(job):
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"데이터 처리 중... ({job.elapsed:.0f}초 경과)")
+    for stage, state in job.snapshot():
+        st.write(f"{STAGE_ICONS[state]} {STAGE_LABELS[stage]}")
+
+if not job.done:
+    show_job_progress(job)
+    st.stop()
+
+if job.error is not None:
+    st.error(f"데이터 처리 중 오류 발생: {job.error}")
+    # 실패한 작업은 자동으로 다시 실행하지 않음 (다시 처리 버튼 또는 입력 파일 변경 시에만 새로 실행)
+    if st.button("🔄 다시 처리", key="retry_pipeline"):
+        st.session_state.setdefault('created_job_keys', set()).add(job_key)
+        runner.submit(job_key, job_stages, job_func, input_sources, retry=True)
+        st.rerun()
+    loaded = {'diagnostics': Diagnostics(), 'errors': {}}
+else:
+    loaded = job.result
+
+df2 = loaded.get('asset')
+df4 = loaded.get('org')
+
+for key, label in [('asset', '자산조회'), ('org', '조직도')]:
+    if key in loaded['errors']:
+        st.sidebar.error(f"{label} 데이터 로드 중 오류 발생: {loaded['errors'][key]}")
+
+# 세션 상태에 저장
+if df2 is not None:
+    st.session_state.df2 = df2
+    st.sidebar.success("자산조회 데이터 로드 완료")
+
+if df4 is not None:
+    st.session_state.df4 = df4
+    st.sidebar.success("조직도 데이터 로드 완료")
+
+# 사용자 업로드 파일 처리 결과 반영 (처리 단계의 경고/오류 메시지 표시)
+render_diagnostics(loaded['diagnostics'])
+
+# 작업 결과는 세션 간 공유되므로, 세션별 복사본은 작업이 바뀔 때 한 번만 생성
+publish = st.session_state.get('published_job_key') != job_key
+
 if uploaded_file1 is not None:
-    try:
-        # 정비일지 데이터 로드
-        df1 = load_data(uploaded_file1)
-        
-        if df1 is not None:
-            # 기본 전처리 적용
-            df1 = preprocess_maintenance_data(df1)
-            
-            st.session_state.df1 = df1
+    if 'maintenance' in loaded['errors']:
+        st.error(f"정비일지 데이터 처리 중 오류 발생: {loaded['errors']['maintenance']}")
+    elif loaded.get('maintenance') is not None:
+        if publish:
+            st.session_state.df1 = loaded['maintenance_raw']
             st.session_state.file_name1 = uploaded_file1.name
-            
-            # 자산 데이터와 병합
-            if df2 is not None:
-                try:
-                    df1 = merge_dataframes(df1, df2)
-                except Exception as e:
-                    st.warning(f"자산 데이터 병합 중 오류 발생: {e}")
-            
-            # 최근 정비일자 계산
-            try:
-                df1 = calculate_previous_maintenance_dates(df1)
-            except Exception as e:
-                st.warning(f"정비일자 계산 중 오류 발생: {e}")
-            
-            # 현장 컬럼에서 지역 정보 추출
-            try:
-                df1 = extract_and_apply_region(df1)
-            except Exception as e:
-                st.warning(f"지역 정보 추출 중 오류 발생: {e}")
-            
-            # 날짜 처리 및 재정비 간격 계산
-            try:
-                df1 = process_date_columns(df1)
-            except Exception as e:
-                st.warning(f"날짜 처리 중 오류 발생: {e}")
-            
-            # 조직도 데이터 매핑
-            if df4 is not None:
-                try:
-                    df1 = map_employee_data(df1, df4)
-                except Exception as e:
-                    st.warning(f"조직도 데이터 매핑 중 오류 발생: {e}")
-            
-            st.session_state.df1_processed = df1
-            st.success(f"정비일지 데이터가 성공적으로 로드되었습니다.")
-    
-    except Exception as e:
-        st.error(f"정비일지 데이터 처리 중 오류 발생: {e}")
+            st.session_state.df1_processed = loaded['maintenance']
+            # 기간이 겹쳐 제외된 중복 정비 기록 (없으면 None)
+            st.session_state.df1_duplicates = loaded.get('maintenance_duplicates')
+        st.success(f"정비일지 데이터가 성공적으로 로드되었습니다.")
 
 if uploaded_file3 is not None:
-    try:
-        # 수리비 데이터 로드
-        df3 = load_data(uploaded_file3)
-        
-        if df3 is not None:
-            # 컬럼명 정리
-            df3.columns = [str(col).strip().replace('\n', '') for col in df3.columns]
-            
-            st.session_state.df3 = df3
+    if 'parts' in loaded['errors']:
+        st.error(f"소모품 출고 데이터 처리 중 오류 발생: {loaded['errors']['parts']}")
+    elif loaded.get('parts') is not None:
+        if publish:
+            st.session_state.df3 = loaded['parts_raw']
             st.session_state.file_name3 = uploaded_file3.name
-            
-            # 수리비 데이터 전처리
-            try:
-                df3 = preprocess_repair_costs(df3)
-            except Exception as e:
-                st.warning(f"수리비 데이터 전처리 중 오류 발생: {e}")
-            
-            # 조직도 데이터 매핑
-            if df4 is not None:
-                try:
-                    df3 = map_employee_data(df3, df4)
-                except Exception as e:
-                    st.warning(f"조직도 데이터 매핑 중 오류 발생: {e}")
-            
-            st.session_state.df3_processed = df3
-            st.success(f"소모품 출고 데이터가 성공적으로 로드되었습니다.")
-    
-    except Exception as e:
-        st.error(f"소모품 출고 데이터 처리 중 오류 발생: {e}")
+            st.session_state.df3_processed = loaded['parts']
+        st.success(f"소모품 출고 데이터가 성공적으로 로드되었습니다.")
 
 # **수정된 병합 로직 - 매핑률 표시**
-if 'df1_processed' in st.session_state:
-    try:
-        df1 = st.session_state.df1_processed
-        
-        # 수리비 데이터가 있는 경우 병합
-        if 'df3_processed' in st.session_state:
-            df3 = st.session_state.df3_processed
-            df1_with_costs = merge_repair_costs(df1, df3)
-            
-            # **매핑 성공률 계산 및 표시**
-            total_records = len(df1_with_costs)
-            matched_records = (df1_with_costs['수리비'] > 0).sum() if '수리비' in df1_with_costs.columns else 0
-            match_rate = (matched_records / total_records * 100) if total_records > 0 else 0
-            
-            st.info(f"📊 **데이터 매핑 결과**: 전체 {total_records:,}건 중 {matched_records:,}건 매핑 완료 ({match_rate:.1f}%)")
-            
-            message = "정비일지와 소모품 출고 데이터 매핑이 완료되었습니다."
+if 'finalize' in loaded['errors']:
+    st.error(f"데이터 처리 중 오류 발생: {loaded['errors']['finalize']}")
+    st.session_state.data_loaded = False
+elif 'df1_with_costs' in loaded:
+    if 'match_stats' in loaded:
+        stats = loaded['match_stats']
+        st.info(f"📊 **데이터 매핑 결과**: 전체 {stats['total']:,}건 중 {stats['matched']:,}건 매핑 완료 ({stats['rate']:.1f}%)")
+
+    if publish:
+        published = loaded
+        if append_base is not None:
+            # 기준 데이터 뒤에 새 데이터를 붙이고 장비 이력/소속별 통계를 합친 데이터로 다시 계산
+            published = append_maintenance_data(append_base['df'], loaded['df1_with_costs'],
+                                                append_base['part_pairs'], loaded.get('part_pairs'), df4)
+            render_diagnostics(published['diagnostics'])
+            st.info(f"📎 기존 {len(append_base['df']):,}건에 새 기록 {len(loaded['df1_with_costs']):,}건을 이어 붙였습니다.")
+        if published['dept_stats'] is not None:
+            st.session_state.dept_repair_stats = published['dept_stats']
+
+        # 결과 저장 (분석 페이지는 df_maintenance를 사용, 페이지에서 컬럼을 추가하므로 세션별 복사본 사용)
+        st.session_state.df1_with_costs = published['df1_with_costs'].copy()
+        st.session_state.df_maintenance = st.session_state.df1_with_costs
+        # 정비 건별 매칭 부품 (행번호는 df_maintenance의 행 위치, 소모품 데이터가 없으면 None)
+        st.session_state.part_pairs = published.get('part_pairs')
+        # 분석 데이터 행의 지문 (다음 업로드를 이어 붙일 때 중복 검사 기준, 이어 붙인 경우 기존 행 포함)
+        if loaded.get('maintenance_fingerprints') is not None:
+            st.session_state.df1_fingerprints = loaded['maintenance_fingerprints']
         else:
-            # 수리비 데이터가 없는 경우
-            df1_with_costs = df1.copy()
-            if '수리비' not in df1_with_costs.columns:
-                df1_with_costs['수리비'] = np.nan
-            message = "소모품 출고 데이터 없이 정비일지 데이터만 로드되었습니다."
-        
-        # 추가 전처리
-        df1_with_costs = preprocess_maintenance_data(df1_with_costs)
+            st.session_state.pop('df1_fingerprints', None)
+        # 페이지 집계 캐시 키 (같은 입력 파일이면 같은 버전)
+        st.session_state.dataset_version = job_key
+    st.success(loaded['message'])
 
-        from utils.data_processing import generate_fault_type_column
-        df1_with_costs = generate_fault_type_column(df1_with_costs)
-        
-        # 소속별 수리비 통계 계산
-        dept_stats = calculate_dept_repair_stats(df1_with_costs, df4)
-        if dept_stats is not None:
-            st.session_state.dept_repair_stats = dept_stats
-        
-        df1_with_costs = extract_and_apply_region(df1_with_costs)
-        
-        # 결과 저장
-        st.session_state.df1_with_costs = df1_with_costs
-        st.success(message)
-        
-        # 데이터 로드 상태 업데이트
-        st.session_state.data_loaded = True
-    
-    except Exception as e:
-        st.error(f"데이터 처리 중 오류 발생: {e}")
-        st.session_state.data_loaded = False
+    # 데이터 로드 상태 업데이트
+    st.session_state.data_loaded = True
+
+# 단계별 계측 기록 (세션별로 최근 10회 보관)
+if publish and loaded['diagnostics'].stages:
+    cache = 'miss' if job_key in st.session_state.get('created_job_keys', ()) else 'hit'
+    profile_runs = st.session_state.setdefault('pipeline_profiles', [])
+    profile_runs.append({
+        'job_key': job_key[:12],
+        'loaded_at': datetime.now().isoformat(timespec='seconds'),
+        'total_seconds': job.elapsed,
+        'cache': cache,
+        'stages': [dict(record, cache=cache) for record in loaded['diagnostics'].stages],
+    })
+    del profile_runs[:-10]
+
+st.session_state.published_job_key = job_key
+if publish:
+    # 실행기에서 작업이 정리된 뒤 재실행에 쓸 결과 (다시 반영하지 않으므로 분석 데이터는 세션 복사본을 참조해 추가 메모리 없음)
+    st.session_state.loaded_result = dict(loaded)
+    if 'df1_with_costs' in loaded and 'df1_with_costs' in st.session_state:
+        st.session_state.loaded_result['df1_with_costs'] = st.session_state.df1_with_costs
 
 # 로드된 데이터 확인 및 미리보기
 if st.session_state.data_loaded:
@@ -302,11 +246,13 @@ if st.session_state.data_loaded:
     with data_tabs[0]:
         if 'df1_with_costs' in st.session_state:
             df1 = st.session_state.df1_with_costs
-            st.write(df1.head())
+            show_table(df1, 'preview_maintenance', {'수리비': WON, '수리시간': HOURS},
+                       cache_key=(st.session_state.get('dataset_version'), 'df1_with_costs'))
     
     with data_tabs[1]:
         if 'df3_processed' in st.session_state:
-            st.write(st.session_state.df3_processed.head())
+            show_table(st.session_state.df3_processed, 'preview_parts', {'출고금액': WON},
+                       cache_key=(st.session_state.get('dataset_version'), 'df3_processed'))
         else:
             st.info("소모품 출고 데이터가 로드되지 않았습니다.")
     
@@ -336,6 +282,12 @@ if st.session_state.data_loaded:
                     st.write(f"- 브랜드 수: {df1['브랜드'].nunique()}개")
                 if '모델명' in df1.columns:
                     st.write(f"- 모델 수: {df1['모델명'].nunique()}개")
+                if '현장명_원본' in df1.columns:
+                    st.write(f"- 현장명: 표기 {df1['현장명_원본'].nunique():,}개 → 업체 {df1['현장명'].nunique():,}개")
+                duplicates = st.session_state.get('df1_duplicates')
+                if duplicates is not None:
+                    exact = int((duplicates['구분'] == '완전 중복').sum())
+                    st.write(f"- 중복 제외: {len(duplicates):,}건 (완전 중복 {exact:,}건, 근접 중복 {len(duplicates) - exact:,}건)")
         
         with col2:
             if 'df3_processed' in st.session_state:
@@ -348,6 +300,27 @@ if st.session_state.data_loaded:
             else:
                 st.info("소모품 출고 데이터가 로드되지 않았습니다.")
 
+        # 현장명 별칭표 (표기가 통합된 이름만)
+        if os.path.exists(CLIENT_ALIAS_PATH):
+            with st.expander("🏷️ 현장명 별칭표"):
+                aliases = load_alias_table(CLIENT_ALIAS_PATH)
+                st.caption(f"`data/{os.path.basename(CLIENT_ALIAS_PATH)}` 파일의 대표명을 고치면 다음 업로드부터 적용됩니다.")
+                show_table(aliases[aliases['원본명'] != aliases['대표명']], 'alias_table', hide_index=True)
+
+        # 제외된 중복 정비 기록
+        if st.session_state.get('df1_duplicates') is not None:
+            with st.expander("🧹 제외된 중복 정비 기록"):
+                st.caption("기간이 겹치는 파일에서 반복된 기록입니다. 행번호는 업로드한 파일을 합친 순서 기준이며, 각 묶음의 첫 행은 분석에 남아 있습니다.")
+                show_table(st.session_state.df1_duplicates, 'duplicate_rows', {'수리시간': HOURS}, hide_index=True,
+                           cache_key=(st.session_state.get('dataset_version'), 'df1_duplicates'))
+
+        # 단계별 처리 기록
+        st.write("### 단계별 처리 기록")
+        if st.session_state.get('pipeline_profiles'):
+            render_stage_profile(st.session_state.pipeline_profiles)
+        else:
+            st.caption("사이드바에서 '처리 단계 계측'을 켜면 파일 파싱과 각 처리 단계의 소요 시간, 행 수, 메모리 할당량, 캐시 적중 여부가 기록됩니다.")
+
 else:
     # 데이터가 로드되지 않은 경우 안내 메시지 표시
     st.info("좌측 사이드바에서 정비일지 및 소모품 출고 데이터를 업로드해 주세요.")
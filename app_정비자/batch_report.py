@@ -0,0 +1,150 @@
+# batch_report.py
+# Streamlit 없이 전체 파이프라인을 실행하고 월별 종합 분석 리포트를 파일로 저장하는 배치 스크립트
+#
+# 사용 예:
+#   python batch_report.py --input-dir exports/ --output reports/
+#   python batch_report.py --maintenance 정비일지.xlsx --parts 소모품.xlsx --months 2024-05 2024-06 --formats csv xlsx
+
+import os
+import sys
+import glob
+import argparse
+import itertools
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, APP_DIR)
+
+from utils.ingestion import run_full_pipeline, submit_task, get_executor
+from utils.ingestion import ASSET_DATA_PATH, ORG_DATA_PATH, STAGE_LABELS
+from utils import monthly_report as report
+from utils.export import export_report_bundle
+
+EQUIPMENT_OPTIONS = ["전체", "지게차", "AWP"]
+OUTPUT_FORMATS = ["csv", "parquet", "xlsx"]
+
+
+def classify_input_files(input_dir):
+    """디렉터리의 엑셀 파일을 헤더 기준으로 정비일지/소모품 출고 파일로 분류"""
+    maintenance_files, parts_files = [], []
+    for path in sorted(glob.glob(os.path.join(input_dir, '*.xlsx'))):
+        if os.path.basename(path).startswith('~$'):
+            continue
+        header = [str(col).strip().replace('\n', '') for col in pd.read_excel(path, nrows=0).columns]
+        if '정비일자' in header:
+            maintenance_files.append(path)
+        elif '출고일자' in header:
+            parts_files.append(path)
+        else:
+            print(f"[건너뜀] 정비일지/소모품 출고 파일이 아닙니다: {path}")
+    return maintenance_files, parts_files
+
+
+def print_progress(stage, state):
+    """파이프라인 단계 완료/실패 출력"""
+    if state != 'running':
+        print(f"  - {STAGE_LABELS[stage]}: {'완료' if state == 'done' else '실패'}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="정비일지/소모품 출고 데이터로 월별 종합 분석 리포트를 일괄 생성합니다.")
+    parser.add_argument('--input-dir', help="정비일지/소모품 출고 엑셀 파일이 있는 디렉터리 (헤더로 자동 분류)")
+    parser.add_argument('--maintenance', nargs='+', default=[], help="정비일지 엑셀 파일")
+    parser.add_argument('--parts', nargs='+', default=[], help="소모품 출고 엑셀 파일")
+    parser.add_argument('--asset', default=os.path.join(APP_DIR, ASSET_DATA_PATH), help="자산조회 데이터 파일")
+    parser.add_argument('--org', default=os.path.join(APP_DIR, ORG_DATA_PATH), help="조직도 데이터 파일")
+    parser.add_argument('--output', default='reports', help="리포트 저장 디렉터리")
+    parser.add_argument('--months', nargs='+', help="대상 월 (YYYY-MM, 기본값: 데이터에 있는 모든 월)")
+    parser.add_argument('--equipment', nargs='+', choices=EQUIPMENT_OPTIONS, default=EQUIPMENT_OPTIONS,
+                        help="장비 구분")
+    parser.add_argument('--maintenance-types', nargs='+',
+                        help="정비구분 (기본값: 전체 + 데이터에 있는 모든 정비구분)")
+    parser.add_argument('--formats', nargs='+', choices=OUTPUT_FORMATS, default=['csv'], help="저장 형식")
+    parser.add_argument('--save-dataset', action='store_true', help="병합된 전체 데이터도 parquet로 저장")
+    parser.add_argument('--profile', action='store_true', help="단계별 소요 시간/행 수/메모리 할당량 출력")
+    parser.add_argument('--client-aliases', metavar='CSV',
+                        help="현장명 별칭표 파일 (지정하면 대표명을 적용하고 새 표기를 추가 저장, 기본값: 파일 없이 통합)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    maintenance_files, parts_files = list(args.maintenance), list(args.parts)
+    if args.input_dir:
+        found_maintenance, found_parts = classify_input_files(args.input_dir)
+        maintenance_files += found_maintenance
+        parts_files += found_parts
+    if not maintenance_files:
+        print("정비일지 파일이 없습니다. --input-dir 또는 --maintenance를 지정하세요.")
+        return 1
+
+    sources = {'maintenance': ('log', maintenance_files)}
+    if parts_files:
+        sources['parts'] = ('log', parts_files)
+    if os.path.exists(args.asset):
+        sources['asset'] = ('static', args.asset)
+    if os.path.exists(args.org):
+        sources['org'] = ('static', args.org)
+
+    # 1. 전체 파이프라인 (Home.py 업로드 처리와 동일)
+    print(f"정비일지 {len(maintenance_files)}개, 소모품 출고 {len(parts_files)}개 파일 처리 중...")
+    result = run_full_pipeline(sources, progress=print_progress, profile=args.profile, alias_path=args.client_aliases)
+    for level, message in result['diagnostics'].messages:
+        if level != 'info':
+            print(f"[{'경고' if level == 'warning' else '오류'}] {message}")
+    if result['errors']:
+        for key, error in result['errors'].items():
+            print(f"[오류] {key}: {error}")
+    for record in result['diagnostics'].stages:
+        print(f"  [계측] {record['stage']:<24} {record['seconds']:>8.3f}초  "
+              f"{record['rows_in'] or 0:>10,} → {record['rows_out'] or 0:>10,}행  "
+              f"{record['bytes_allocated'] / 2**20:>8.1f}MB")
+    if 'df1_with_costs' not in result:
+        return 1
+
+    df = report.add_period_columns(result['df1_with_costs'])
+    if 'match_stats' in result:
+        stats = result['match_stats']
+        print(f"수리비 매핑: 전체 {stats['total']:,}건 중 {stats['matched']:,}건 ({stats['rate']:.1f}%)")
+
+    os.makedirs(args.output, exist_ok=True)
+    if args.save_dataset:
+        df.astype({'년월': str}).to_parquet(os.path.join(args.output, 'dataset.parquet'), index=False)
+
+    # 2. 월 × 장비 구분 × 정비구분 조합별 리포트를 작업 프로세스에서 병렬 계산
+    months = sorted(df['년월'].dropna().unique())
+    if args.months:
+        months = [month for month in months if str(month) in set(args.months)]
+    maintenance_types = args.maintenance_types
+    if maintenance_types is None:
+        maintenance_types = ['전체']
+        if '정비구분' in df.columns:
+            maintenance_types += sorted(df['정비구분'].dropna().unique())
+
+    futures = []
+    for period in months:
+        # 작업 프로세스에는 해당 월 데이터만 전달
+        month_df = df[df['년월'] == period]
+        for equipment_filter, maintenance_type in itertools.product(args.equipment, maintenance_types):
+            futures.append(submit_task(export_report_bundle, month_df, period.year, period.month,
+                                       equipment_filter, maintenance_type, args.output, args.formats))
+
+    generated = 0
+    for future in as_completed(futures):
+        outcome = future.result()
+        if outcome is None:
+            continue
+        bundle_name, row_count, written = outcome
+        generated += 1
+        print(f"  [완료] {bundle_name}: {row_count:,}건 → 파일 {len(written)}개")
+
+    print(f"리포트 {generated}개를 {os.path.abspath(args.output)}에 저장했습니다.")
+    get_executor().shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
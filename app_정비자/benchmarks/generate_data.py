@@ -0,0 +1,219 @@
+# benchmarks/generate_data.py
+# 벤치마크용 합성 데이터 생성기
+# 정비일지 / 소모품 출고 / 자산조회 / 조직도 데이터를 현재 컬럼명 그대로 생성합니다.
+# 장비(관리번호), 정비자, 현장, 고장유형, 자재는 지프(Zipf) 분포로 편중시켜 실제 데이터처럼 소수 항목에 건수가 몰리게 합니다.
+#
+# 사용 예:
+#   python benchmarks/generate_data.py --rows 100000 --output bench_data/
+#   python benchmarks/generate_data.py --rows 10000 --output bench_data/ --format xlsx
+
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+BRANDS = {
+    '도요타': ['7FB15', '7FBR14', '8FBN25', '8FD30'],
+    '두산': ['B20X-7', 'D30S-7', 'BR18S-7', 'G25E-5'],
+    '현대': ['20B-9', '25D-9', '30L-7M', '16BRJ-9'],
+    '클라크': ['C25D', 'GTS25', 'ECX25'],
+    '린데': ['E20', 'H30D', 'R16'],
+    '니찌유': ['FB15P', 'FBRM14'],
+    '스카이잭': ['SJIII3219', 'SJ4632'],
+    '지니': ['GS-1930', 'GS-2632', 'Z-45'],
+    'JLG': ['1930ES', '2646ES'],
+}
+AWP_BRANDS = {'스카이잭', '지니', 'JLG'}
+
+FORKLIFT_SPECS = ['전동 좌식', '전동 입식', '디젤 좌식', 'LPG 좌식']
+AWP_SPECS = ['AWP 수직형', 'AWP 굴절형', '고소작업대 수직형']
+
+DEPARTMENTS = ['TM센터', '경기1파트', '경기2파트', '인천파트', '충청파트', '영남파트', '호남파트', '강원파트']
+
+ADDRESS_PREFIXES = [
+    '경기 화성시', '경기 평택시', '경기 이천시', '경기 용인시', '경기 안산시', '인천 서구', '인천 남동구',
+    '서울 강서구', '서울 구로구', '충남 천안시', '충남 아산시', '충북 청주시', '경북 구미시', '경남 김해시',
+    '부산 강서구', '대구 달서구', '울산 남구', '광주 광산구', '전북 군산시', '전남 여수시', '강원 원주시',
+]
+COMPANY_STEMS = ['대한물류', '한빛로지스', '삼성전자', '현대글로비스', '우리식품', '동방창고', '미래유통', '세방',
+                 '한국제지', '씨제이대한통운', '롯데글로벌', '태평양물산', '신세계푸드', '오뚜기물류', '동원산업']
+COMPANY_VARIANTS = ['{stem}', '(주){stem}', '{stem} 주식회사', '주식회사 {stem}', '{stem}(주)', '{stem} {branch}지점',
+                    '{stem}  ', '㈜{stem}']
+
+WORK_TYPES = {
+    '수리': {'마스트': ['체인교환', '실린더수리', '롤러교환'], '엔진': ['오일누유수리', '시동불량수리'],
+             '배터리': ['셀교환', '충전기수리'], '유압': ['호스교환', '펌프수리'], '전장': ['배선수리', '컨트롤러교환']},
+    '점검': {'정기점검': ['월간점검', '분기점검'], '안전점검': ['브레이크점검', '경보장치점검']},
+    '교체': {'타이어': ['타이어교환'], '소모품': ['오일교환', '필터교환', '브레이크패드교환']},
+}
+
+PART_NAMES = ['체인', '배터리', '타이어', '오일필터', '에어필터', '브레이크패드', '유압호스', '실린더씰킷', '롤러',
+              '컨트롤러', '충전기', '엔진오일', '유압오일', '퓨즈', '릴레이', '포크', '백레스트', '경광등']
+
+
+def zipf_weights(n, s=1.1):
+    """순위 기반 지프 가중치 (1위 항목에 가장 많이 몰림)"""
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return weights / weights.sum()
+
+
+def zipf_choice(rng, values, size, s=1.1):
+    """values를 무작위 순서로 섞은 뒤 지프 분포로 추출"""
+    values = np.asarray(values)
+    shuffled = values[rng.permutation(len(values))]
+    return shuffled[rng.choice(len(values), size=size, p=zipf_weights(len(values), s))]
+
+
+def generate_asset_data(n_assets, rng):
+    """자산조회 데이터 (관리번호, 제조사/모델, 제조년도, 취득 정보, 자재내역)"""
+    brands = rng.choice(list(BRANDS), size=n_assets, p=zipf_weights(len(BRANDS), 0.8))
+    models = np.array([rng.choice(BRANDS[brand]) for brand in brands])
+    is_awp = np.isin(brands, list(AWP_BRANDS))
+
+    specs = np.where(is_awp, rng.choice(AWP_SPECS, n_assets), rng.choice(FORKLIFT_SPECS, n_assets))
+    capacity = np.where(is_awp, rng.choice(['6m', '8m', '10m', '12m'], n_assets),
+                        rng.choice(['1.5톤', '2.5톤', '3톤', '5톤'], n_assets))
+    mast = rng.choice(['2단', '3단'], n_assets)
+    height = rng.choice(['3000', '4000', '4500', '6000'], n_assets)
+
+    acquired = pd.Timestamp('2012-01-01') + pd.to_timedelta(rng.integers(0, 4000, n_assets), unit='D')
+    price = rng.integers(8_000_000, 60_000_000, n_assets) // 1000 * 1000
+
+    return pd.DataFrame({
+        '관리번호': [f'{brand[:1]}{i:07d}' for i, brand in enumerate(brands)],
+        '제조사모델명': models,
+        '제조년도': acquired.year - rng.integers(0, 3, n_assets),
+        '취득일자': acquired,
+        '취득가': price,
+        '장부가': (price * rng.uniform(0.1, 0.9, n_assets)).astype(np.int64),
+        '자재번호': [f'851BX{n:03d}' for n in rng.integers(0, 1000, n_assets)],
+        '자재내역': pd.Series(specs) + ' ' + capacity + ' ' + mast + ' ' + height,
+        '제조사명': brands,
+    })
+
+
+def generate_org_data(n_staff, rng):
+    """조직도 데이터 (사번, 소속)"""
+    employee_ids = rng.choice(np.arange(200000, 240000), size=n_staff, replace=False)
+    return pd.DataFrame({
+        '사번': employee_ids,
+        '소속': rng.choice(DEPARTMENTS, size=n_staff, p=zipf_weights(len(DEPARTMENTS), 0.7)),
+    })
+
+
+def generate_sites(n_sites, rng):
+    """현장 문자열: 주소형(지역 추출 대상)과 업체명 표기 변형(중복 업체명)이 섞인 목록"""
+    sites = []
+    for i in range(n_sites):
+        if rng.random() < 0.5:
+            prefix = ADDRESS_PREFIXES[rng.integers(len(ADDRESS_PREFIXES))]
+            sites.append(f'{prefix} 산업로 {rng.integers(1, 500)}')
+        else:
+            stem = COMPANY_STEMS[rng.integers(len(COMPANY_STEMS))]
+            if i >= len(COMPANY_STEMS):
+                stem = f'{stem}{rng.integers(1, 40)}'
+            template = COMPANY_VARIANTS[rng.integers(len(COMPANY_VARIANTS))]
+            sites.append(template.format(stem=stem, branch=ADDRESS_PREFIXES[rng.integers(len(ADDRESS_PREFIXES))][-3:-1]))
+    return np.array(sites)
+
+
+def generate_maintenance_logs(n_rows, assets, org, rng, start='2023-01-01', days=730):
+    """정비일지 데이터 (엑셀 내보내기 컬럼명 그대로: 대분류/중분류/소분류)"""
+    fault_types = [(w, t, a) for w, targets in WORK_TYPES.items() for t, actions in targets.items() for a in actions]
+    fault_index = rng.choice(len(fault_types), size=n_rows, p=zipf_weights(len(fault_types), 1.0))
+    faults = np.array(fault_types)[fault_index]
+
+    technicians = org['사번'].astype(str).values
+    technician_ids = zipf_choice(rng, technicians, n_rows, s=0.9)
+    sites = generate_sites(max(50, n_rows // 40), rng)
+
+    # 계절성: 여름철 정비가 조금 더 많도록 일자 가중치 부여
+    day_offsets = np.arange(days)
+    day_weights = 1.0 + 0.3 * np.sin((day_offsets % 365) / 365 * 2 * np.pi - np.pi / 2)
+    dates = pd.Timestamp(start) + pd.to_timedelta(
+        rng.choice(days, size=n_rows, p=day_weights / day_weights.sum()), unit='D')
+
+    return pd.DataFrame({
+        '관리번호': zipf_choice(rng, assets['관리번호'].values, n_rows, s=0.8),
+        '정비일자': dates,
+        '정비자번호': technician_ids,
+        '정비자': np.char.add('정비자', np.char.mod('%d', technician_ids.astype(np.int64) % 1000)),
+        '대분류': faults[:, 0],
+        '중분류': faults[:, 1],
+        '소분류': faults[:, 2],
+        '정비구분': rng.choice(['내부', '외부'], size=n_rows, p=[0.6, 0.4]),
+        '가동시간': rng.gamma(2.0, 1800.0, n_rows).round(0),
+        '수리시간': rng.gamma(2.0, 1.2, n_rows).round(1),
+        '현장': zipf_choice(rng, sites, n_rows, s=1.0),
+        '정비내용': np.char.add(np.char.add(faults[:, 1].astype(str), ' '), faults[:, 2].astype(str)),
+        '고장내용': rng.choice(['소음 발생', '작동 불량', '누유', '파손', '마모', '경고등 점등'], size=n_rows),
+    })
+
+
+def generate_parts_issues(maintenance, rng, match_ratio=0.7, parts_per_event=1.4, n_skus=500):
+    """소모품 출고 데이터: 일부 정비 건과 관리번호/출고자/±30일로 매칭되도록 생성하고, 매칭되지 않는 출고도 섞음"""
+    n_events = len(maintenance)
+    matched_events = rng.choice(n_events, size=int(n_events * match_ratio), replace=False)
+    counts = rng.poisson(parts_per_event - 1, len(matched_events)) + 1
+    event_index = np.repeat(matched_events, counts)
+    n_rows = len(event_index)
+
+    skus = np.char.add(np.char.add(np.array(PART_NAMES)[np.arange(n_skus) % len(PART_NAMES)], ' '),
+                       np.char.mod('P-%04d', np.arange(n_skus)))
+    sku_index = rng.choice(n_skus, size=n_rows, p=zipf_weights(n_skus, 1.0))
+
+    issues = pd.DataFrame({
+        '관리번호': maintenance['관리번호'].values[event_index],
+        '출고일자': maintenance['정비일자'].values[event_index] + pd.to_timedelta(rng.integers(-25, 26, n_rows), unit='D').values,
+        '출고자': maintenance['정비자번호'].values[event_index],
+        '출고금액': (rng.lognormal(11.0, 1.0, n_rows) // 1000 * 1000).astype(np.int64),
+        '자재명': skus[sku_index],
+    })
+
+    # 매칭되지 않는 출고 (다른 장비/기간)
+    noise = issues.sample(frac=0.1, random_state=int(rng.integers(1 << 31)))
+    noise = noise.assign(출고일자=noise['출고일자'] + pd.Timedelta(days=90))
+    return pd.concat([issues, noise], ignore_index=True)
+
+
+def generate_dataset(n_rows, seed=0):
+    """정비일지 n_rows건 규모의 전체 데이터 묶음 생성"""
+    rng = np.random.default_rng(seed)
+    assets = generate_asset_data(max(500, n_rows // 15), rng)
+    org = generate_org_data(max(60, min(2000, n_rows // 200)), rng)
+    maintenance = generate_maintenance_logs(n_rows, assets, org, rng)
+    parts = generate_parts_issues(maintenance, rng)
+    return {'maintenance': maintenance, 'parts': parts, 'asset': assets, 'org': org}
+
+
+def save_dataset(dataset, output_dir, fmt='parquet'):
+    """데이터 묶음을 파일로 저장 (엑셀은 시트 행 수 제한으로 약 100만 행까지만 가능)"""
+    os.makedirs(output_dir, exist_ok=True)
+    file_names = {'maintenance': '정비일지', 'parts': '소모품출고', 'asset': '자산조회데이터', 'org': '조직도데이터'}
+    paths = {}
+    for key, frame in dataset.items():
+        path = os.path.join(output_dir, f'{file_names[key]}.{fmt}')
+        if fmt == 'xlsx':
+            frame.to_excel(path, index=False)
+        else:
+            frame.to_parquet(path, index=False)
+        paths[key] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 정비 데이터 생성")
+    parser.add_argument('--rows', type=int, default=100_000, help="정비일지 행 수")
+    parser.add_argument('--output', default='bench_data', help="저장 디렉터리")
+    parser.add_argument('--format', choices=['parquet', 'xlsx'], default='parquet')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = generate_dataset(args.rows, args.seed)
+    for key, path in save_dataset(dataset, args.output, args.format).items():
+        print(f"{path}: {len(dataset[key]):,}행")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/import_time.py
+# 페이지 시작(import) 시간 측정
+# Home.py와 pages/*.py의 최상위 import 문만 뽑아 새 프로세스에서 실행하고 소요 시간을 기록합니다.
+# 새 프로세스마다 측정하므로 배포 직후 첫 페이지 로딩(콜드 스타트)과 같은 조건입니다.
+# 한글 폰트 결정(utils.visualization.resolve_korean_font)은 폰트 목록 검색과 저장된 결과 사용을 나눠 측정합니다.
+#
+# 사용 예:
+#   python benchmarks/import_time.py
+#   python benchmarks/import_time.py --repeat 10 --output benchmarks/results/import_time.jsonl
+
+import os
+import sys
+import ast
+import glob
+import json
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+
+_TIMED = """
+import time
+_started = time.perf_counter()
+{code}
+print(time.perf_counter() - _started)
+"""
+
+_FONT = """
+import time
+import matplotlib
+from utils.visualization import resolve_korean_font
+_started = time.perf_counter()
+resolve_korean_font(refresh={refresh})
+print(time.perf_counter() - _started)
+"""
+
+
+def page_imports(path):
+    """파일의 최상위 import 문 (소스 그대로)"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return "\n".join(ast.get_source_segment(source, node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def timed_run(code, repeat):
+    """code를 새 프로세스에서 repeat번 실행한 소요 시간 목록 (초)"""
+    seconds = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=APP_DIR, text=True,
+                                         env=dict(os.environ, PYTHONPATH=APP_DIR))
+        seconds.append(float(output.strip().splitlines()[-1]))
+    return seconds
+
+
+def targets():
+    """측정 대상 [(이름, 실행 코드)]"""
+    pages = [os.path.join(APP_DIR, 'Home.py')] + sorted(glob.glob(os.path.join(APP_DIR, 'pages', '*.py')))
+    items = [(os.path.basename(path), _TIMED.format(code=page_imports(path))) for path in pages]
+    # 저장된 결과가 없는 첫 실행 → 저장된 결과 사용 순서로 실행
+    items.append(("한글 폰트 결정 (폰트 목록 검색)", _FONT.format(refresh=True)))
+    items.append(("한글 폰트 결정 (저장된 결과)", _FONT.format(refresh=False)))
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 시작(import) 시간 측정")
+    parser.add_argument('--repeat', type=int, default=5, help="대상별 반복 횟수 (중앙값 사용)")
+    parser.add_argument('--output', help="결과를 추가할 파일 (JSON lines)")
+    args = parser.parse_args(argv)
+
+    records = []
+    for name, code in targets():
+        try:
+            seconds = timed_run(code, args.repeat)
+        except subprocess.CalledProcessError:
+            print(f"  {name:<36} 실행 실패")
+            continue
+        record = {'target': name, 'median_seconds': round(statistics.median(seconds), 4),
+                  'min_seconds': round(min(seconds), 4), 'repeat': args.repeat}
+        records.append(record)
+        print(f"  {name:<36} 중앙값 {record['median_seconds']:>7.3f}s  최소 {record['min_seconds']:>7.3f}s")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        with open(args.output, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(dict(record, timestamp=timestamp), ensure_ascii=False) + '\n')
+        print(f"결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
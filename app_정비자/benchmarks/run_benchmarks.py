@@ -0,0 +1,230 @@
+# benchmarks/run_benchmarks.py
+# 처리 단계별 성능 측정 (회귀 추적용)
+# 합성 데이터로 파이프라인 단계와 페이지 집계를 순서대로 실행하며 단계별 소요 시간과 최대 메모리(RSS)를 기록합니다.
+# 데이터 크기마다 별도 프로세스에서 실행하여 크기 간 메모리 측정이 섞이지 않게 합니다.
+#
+# 사용 예:
+#   python benchmarks/run_benchmarks.py                        # 10k, 100k, 1M
+#   python benchmarks/run_benchmarks.py --sizes 10000 10000000
+#   python benchmarks/run_benchmarks.py --sizes 100000 --compare benchmarks/results/baseline.jsonl
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import multiprocessing
+from datetime import datetime
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from utils import engine
+from utils import monthly_report as report
+from utils.periods import PeriodCube
+from generate_data import generate_dataset
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def _read_status(field):
+    """/proc/self/status의 메모리 항목 (바이트, 없으면 None)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def _reset_peak_rss():
+    """최대 RSS(VmHWM)를 현재 RSS로 초기화 (리눅스 전용, 실패 시 False)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss():
+    """현재까지의 최대 RSS (리눅스는 VmHWM, 그 외에는 ru_maxrss)"""
+    peak = _read_status('VmHWM')
+    if peak is not None:
+        return peak
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def page01_comparison(df):
+    """01 페이지의 기간 집계 큐브 생성 + 당월/전월 비교 (데이터의 마지막 달 기준)"""
+    cube = PeriodCube(df)
+    period = cube.periods('월별')[0]
+    base_period = cube.baseline(period, '월별', '전월 대비')
+    return {
+        dimension: cube.compare(dimension, period, base_period, '월별')
+        for dimension in ('정비자소속', '현장명') if dimension in cube.monthly
+    }
+
+
+def page04_report(df):
+    """04 페이지의 월별 리포트 표 전체 (데이터의 마지막 달 기준)"""
+    df = report.add_period_columns(df)
+    latest = df['년월'].max()
+    return report.build_report_tables(report.filter_month(df, latest.year, latest.month))
+
+
+def _unwrap(stage_result):
+    """엔진 단계 결과에서 데이터만 꺼냄"""
+    return stage_result[0] if isinstance(stage_result, tuple) else stage_result
+
+
+def benchmark_steps():
+    """
+    측정할 단계 목록 [(이름, 함수)]. 각 함수는 state 딕셔너리를 받아 (입력 행 수, 결과 행 수)를 반환합니다.
+    Home.py 업로드 처리(utils/ingestion.py)와 같은 순서로 실행합니다 (수리비 매핑 후 재전처리와 소속별 통계는 제외).
+    """
+    def step(key, func, *arg_keys):
+        def run(state):
+            args = [state[name] for name in arg_keys]
+            rows_in = len(args[0])
+            state[key] = _unwrap(func(*args))
+            return rows_in, len(state[key])
+        return run
+
+    return [
+        ('normalize_log_frame', step('df1', engine.normalize_log_frame, 'raw_maintenance')),
+        ('normalize_parts_frame', step('df3', engine.normalize_log_frame, 'raw_parts')),
+        ('preprocess_maintenance_data', step('df1', engine.preprocess_maintenance_data, 'df1')),
+        ('deduplicate_maintenance_records', step('df1', engine.deduplicate_maintenance_records, 'df1')),
+        ('merge_dataframes', step('df1', engine.merge_dataframes, 'df1', 'asset')),
+        ('calculate_previous_maintenance_dates', step('df1', engine.calculate_previous_maintenance_dates, 'df1')),
+        ('extract_and_apply_region', step('df1', engine.extract_and_apply_region, 'df1')),
+        ('process_date_columns', step('df1', engine.process_date_columns, 'df1')),
+        ('map_employee_data', step('df1', engine.map_employee_data, 'df1', 'org')),
+        ('preprocess_repair_costs', step('df3', engine.preprocess_repair_costs, 'df3')),
+        ('merge_repair_costs', step('df', engine.merge_repair_costs, 'df1', 'df3')),
+        ('generate_fault_type_column', step('df', engine.generate_fault_type_column, 'df')),
+        # 별칭표 파일 없이 실행 (매번 같은 조건으로 측정)
+        ('canonicalize_client_names', step('df', engine.canonicalize_client_names, 'df')),
+        ('page01_comparison', step('page01', page01_comparison, 'df')),
+        ('page04_report', step('page04', page04_report, 'df')),
+    ]
+
+
+def run_size(n_rows, seed=0):
+    """데이터 크기 하나에 대해 모든 단계를 측정 (작업 프로세스에서 실행)"""
+    data = generate_dataset(n_rows, seed)
+    # 엑셀 내보내기를 문자열로 읽은 상태(parse_log_excel의 dtype=str)와 같게 맞춤
+    state = {
+        'raw_maintenance': data['maintenance'].astype(str),
+        'raw_parts': data['parts'].astype(str),
+        'asset': data['asset'],
+        'org': data['org'],
+    }
+    del data
+
+    records = []
+    for name, run in benchmark_steps():
+        _reset_peak_rss()
+        rss_before = _read_status('VmRSS') or 0
+        started = time.perf_counter()
+        rows_in, rows_out = run(state)
+        seconds = time.perf_counter() - started
+        records.append({
+            'size': n_rows,
+            'stage': name,
+            'seconds': round(seconds, 4),
+            'rows_in': rows_in,
+            'rows_out': rows_out,
+            'peak_rss_mb': round(_peak_rss() / 2**20, 1),
+            'peak_delta_mb': round(max(_peak_rss() - rss_before, 0) / 2**20, 1),
+        })
+    return records
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path):
+    """결과 파일(JSON lines)을 (size, stage) 기준 딕셔너리로 로드 (같은 키는 마지막 값 사용)"""
+    results = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                results[(record['size'], record['stage'])] = record
+    return results
+
+
+def compare_results(records, baseline, threshold=0.2):
+    """기준 결과 대비 시간/메모리가 threshold 이상 늘어난 단계 목록"""
+    regressions = []
+    for record in records:
+        base = baseline.get((record['size'], record['stage']))
+        if base is None:
+            continue
+        for metric in ('seconds', 'peak_delta_mb'):
+            # 아주 짧은 단계는 측정 오차가 커서 제외
+            if base[metric] >= 0.05 and record[metric] > base[metric] * (1 + threshold):
+                regressions.append((record['size'], record['stage'], metric, base[metric], record[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="처리 단계별 소요 시간/최대 메모리 벤치마크")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help="정비일지 행 수 목록")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과 파일 (기본값: benchmarks/results/<날짜>.jsonl)")
+    parser.add_argument('--compare', help="비교할 기준 결과 파일")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀 판정 비율 (기본 20%%)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.jsonl')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    meta = {'commit': _git_commit(), 'host': socket.gethostname(), 'timestamp': datetime.now().isoformat(timespec='seconds')}
+
+    records = []
+    context = multiprocessing.get_context('spawn')
+    for size in args.sizes:
+        print(f"[{size:,}행]")
+        # 크기마다 새 프로세스 (이전 크기의 메모리/캐시 영향 제거)
+        with context.Pool(1) as pool:
+            size_records = pool.apply(run_size, (size, args.seed))
+        for record in size_records:
+            print(f"  {record['stage']:<38} {record['seconds']:>9.3f}s  "
+                  f"{record['rows_in']:>10,} → {record['rows_out']:>10,}행  "
+                  f"peak {record['peak_rss_mb']:>8.1f}MB (+{record['peak_delta_mb']:.1f})")
+            record.update(meta)
+        records += size_records
+
+    with open(output, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        regressions = compare_results(records, load_results(args.compare), args.threshold)
+        for size, stage_name, metric, before, after in regressions:
+            print(f"[회귀] {size:,}행 {stage_name} {metric}: {before} → {after}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
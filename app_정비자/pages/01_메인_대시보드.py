@@ -3,11 +3,14 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-import plotly.express as px
-import plotly.graph_objects as go
+from utils.lazy_import import lazy_module
+from utils.figure_cache import cached_figure
+from utils.data_processing import dataset_version
+from utils.periods import PeriodCube, period_label
+from utils.anomaly import EwmaDetector, detect
+
+# 차트 라이브러리는 캐시에 없는 차트를 만들 때 불러옴
+go = lazy_module("plotly.graph_objects")
 
 st.set_page_config(page_title="경영 대시보드", layout="wide")
 st.title("📊 경영 대시보드 - 실시간 AS 현황")
@@ -18,8 +21,15 @@ if 'df_maintenance' not in st.session_state:
 
 df = st.session_state.df_maintenance
 
+# 기간별 집계 (데이터셋마다 한 번 월별로 집계하고, 분기/반기는 월별 집계를 합쳐 사용)
+@st.cache_resource(max_entries=4, show_spinner="기간별 집계 중...")
+def load_period_cube(version, _df):
+    return PeriodCube(_df)
+
+cube = load_period_cube(dataset_version(df), df)
+
 # 날짜 필터
-col1, col2, col3 = st.columns([2, 2, 1])
+col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
 with col1:
     # 기간 선택
     period_type = st.selectbox("분석 기간", ["월별", "분기별", "반기별"], key="period_main")
@@ -27,42 +37,51 @@ with col2:
     # 비교 기준 선택  
     compare_type = st.selectbox("비교 기준", ["전월 대비", "전년 동기 대비", "전분기 대비"], key="compare_main")
 with col3:
+    # 분석 시점 (데이터가 있는 기간, 기본값은 가장 최근 기간)
+    available_periods = cube.periods(period_type)
+    if not available_periods:
+        st.warning("정비일자 정보가 있는 데이터가 없습니다.")
+        st.stop()
+    current_period = st.selectbox("분석 시점", available_periods, key=f"period_point_{period_type}",
+                                  format_func=lambda period: period_label(period, period_type))
+with col4:
     # 자동 새로고침
     auto_refresh = st.checkbox("자동 새로고침 (30초)")
 
+base_period = cube.baseline(current_period, period_type, compare_type)
+current_label = period_label(current_period, period_type)
+base_label = period_label(base_period, period_type)
+
 # 핵심 KPI 영역
 st.header("🎯 핵심 지표 (Key Performance Indicators)")
+st.caption(f"분석 기간: {current_label} / 비교 기간: {base_label} ({compare_type})")
 
-# 현재 월 vs 이전 기간 비교
-current_month = datetime.now().replace(day=1)
-prev_month = (current_month - timedelta(days=1)).replace(day=1)
-
-current_data = df[df['정비일자'].dt.to_period('M') == pd.Timestamp(current_month).to_period('M')]
-prev_data = df[df['정비일자'].dt.to_period('M') == pd.Timestamp(prev_month).to_period('M')]
+current_totals = cube.totals(current_period, period_type)
+prev_totals = cube.totals(base_period, period_type)
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    current_cases = len(current_data)
-    prev_cases = len(prev_data)
+    current_cases = current_totals['건수']
+    prev_cases = prev_totals['건수']
     case_change = ((current_cases - prev_cases) / prev_cases * 100) if prev_cases > 0 else 0
     
-    st.metric("📋 이번달 AS 건수", 
+    st.metric(f"📋 {current_label} AS 건수", 
              f"{current_cases:,}건", 
              f"{case_change:+.1f}%")
 
 with col2:
-    current_cost = current_data['수리비'].sum() if '수리비' in current_data.columns else 0
-    prev_cost = prev_data['수리비'].sum() if '수리비' in prev_data.columns else 0
+    current_cost = current_totals['수리비']
+    prev_cost = prev_totals['수리비']
     cost_change = ((current_cost - prev_cost) / prev_cost * 100) if prev_cost > 0 else 0
     
-    st.metric("💰 이번달 수리비", 
+    st.metric(f"💰 {current_label} 수리비", 
              f"{current_cost:,.0f}원", 
              f"{cost_change:+.1f}%")
 
 with col3:
-    current_avg = current_cost / current_cases if current_cases > 0 else 0
-    prev_avg = prev_cost / prev_cases if prev_cases > 0 else 0
+    current_avg = current_totals['건당평균']
+    prev_avg = prev_totals['건당평균']
     avg_change = ((current_avg - prev_avg) / prev_avg * 100) if prev_avg > 0 else 0
     
     st.metric("📊 건당 평균 수리비", 
@@ -71,8 +90,8 @@ with col3:
 
 with col4:
     # 가장 문제가 되는 파트 찾기
-    if '정비자소속' in current_data.columns:
-        problem_parts = current_data.groupby('정비자소속')['수리비'].sum().nlargest(1)
+    if '정비자소속' in df.columns:
+        problem_parts = cube.top('정비자소속', current_period, period_type, n=1)['수리비']
         if not problem_parts.empty:
             worst_part = problem_parts.index[0]
             worst_cost = problem_parts.iloc[0]
@@ -86,8 +105,8 @@ with col4:
 
 with col5:
     # 가장 문제가 되는 업체 찾기  
-    if '현장명' in current_data.columns:
-        problem_clients = current_data.groupby('현장명')['수리비'].sum().nlargest(1)
+    if '현장명' in df.columns:
+        problem_clients = cube.top('현장명', current_period, period_type, n=1)['수리비']
         if not problem_clients.empty:
             worst_client = problem_clients.index[0]
             worst_client_cost = problem_clients.iloc[0]
@@ -109,107 +128,108 @@ st.header("📈 실시간 트렌드 분석")
 col1, col2 = st.columns(2)
 
 with col1:
-    st.subheader("월별 수리비 추이 (최근 12개월)")
-    
-    # 최근 12개월 데이터
-    df['년월'] = df['정비일자'].dt.to_period('M')
-    recent_months = sorted(df['년월'].dropna().unique())[-12:]
+    st.subheader(f"{period_type} 수리비 추이 (최근 12개 기간)")
     
-    monthly_analysis = df[df['년월'].isin(recent_months)].groupby('년월').agg({
-        '수리비': 'sum',
-        '관리번호': 'count'  # AS 건수
-    }).reset_index()
-    monthly_analysis['년월_str'] = monthly_analysis['년월'].astype(str)
+    # 최근 12개 기간 데이터 (기간별 집계에서 조회)
+    monthly_analysis = cube.trend(period_type, last=12).rename(columns={'건수': '관리번호', '기간': '년월_str'})
     
-    # Plotly 인터랙티브 차트
-    fig = go.Figure()
+    def build_figure():
+        # Plotly 인터랙티브 차트
+        fig = go.Figure()
     
-    # 수리비 라인
-    fig.add_trace(go.Scatter(
-        x=monthly_analysis['년월_str'],
-        y=monthly_analysis['수리비'],
-        mode='lines+markers',
-        name='월별 수리비',
-        line=dict(color='#FF6B6B', width=3),
-        marker=dict(size=8)
-    ))
+        # 수리비 라인
+        fig.add_trace(go.Scatter(
+            x=monthly_analysis['년월_str'],
+            y=monthly_analysis['수리비'],
+            mode='lines+markers',
+            name=f'{period_type} 수리비',
+            line=dict(color='#FF6B6B', width=3),
+            marker=dict(size=8)
+        ))
     
-    # 평균선 추가
-    avg_cost = monthly_analysis['수리비'].mean()
-    fig.add_hline(y=avg_cost, line_dash="dash", line_color="gray", 
-                  annotation_text=f"평균: {avg_cost:,.0f}원")
+        # 평균선 추가
+        avg_cost = monthly_analysis['수리비'].mean()
+        fig.add_hline(y=avg_cost, line_dash="dash", line_color="gray", 
+                      annotation_text=f"평균: {avg_cost:,.0f}원")
     
-    fig.update_layout(
-        title="최근 12개월 수리비 트렌드",
-        xaxis_title="월",
-        yaxis_title="수리비 (원)",
-        height=400,
-        showlegend=False
-    )
+        fig.update_layout(
+            title="최근 12개 기간 수리비 트렌드",
+            xaxis_title="기간",
+            yaxis_title="수리비 (원)",
+            height=400,
+            showlegend=False
+        )
+        return fig
+    fig = cached_figure(('수리비 추이', period_type, monthly_analysis), build_figure)
     
     st.plotly_chart(fig, use_container_width=True)
 
 with col2:
-    st.subheader("월별 AS 건수 추이 (최근 12개월)")
+    st.subheader(f"{period_type} AS 건수 추이 (최근 12개 기간)")
     
-    # AS 건수 차트
-    fig2 = go.Figure()
+    def build_figure():
+        # AS 건수 차트
+        fig2 = go.Figure()
     
-    fig2.add_trace(go.Bar(
-        x=monthly_analysis['년월_str'],
-        y=monthly_analysis['관리번호'],
-        name='월별 AS 건수',
-        marker_color='#4ECDC4'
-    ))
+        fig2.add_trace(go.Bar(
+            x=monthly_analysis['년월_str'],
+            y=monthly_analysis['관리번호'],
+            name=f'{period_type} AS 건수',
+            marker_color='#4ECDC4'
+        ))
     
-    # 평균선 추가
-    avg_cases = monthly_analysis['관리번호'].mean()
-    fig2.add_hline(y=avg_cases, line_dash="dash", line_color="gray",
-                   annotation_text=f"평균: {avg_cases:.0f}건")
+        # 평균선 추가
+        avg_cases = monthly_analysis['관리번호'].mean()
+        fig2.add_hline(y=avg_cases, line_dash="dash", line_color="gray",
+                       annotation_text=f"평균: {avg_cases:.0f}건")
     
-    fig2.update_layout(
-        title="최근 12개월 AS 건수 트렌드", 
-        xaxis_title="월",
-        yaxis_title="AS 건수",
-        height=400,
-        showlegend=False
-    )
+        fig2.update_layout(
+            title="최근 12개 기간 AS 건수 트렌드", 
+            xaxis_title="기간",
+            yaxis_title="AS 건수",
+            height=400,
+            showlegend=False
+        )
+        return fig2
+    fig2 = cached_figure(('AS 건수 추이', period_type, monthly_analysis), build_figure)
     
     st.plotly_chart(fig2, use_container_width=True)
 
+# 이상 탐지 (기간별 시계열을 EWMA 기대값과 비교한 z 점수)
+# 탐지기는 데이터셋이 바뀌어도 유지하여, 같은 이력 뒤에 새 기간만 추가된 경우 새 기간만 계산
+@st.cache_resource
+def get_detector(period_type, dimension, value):
+    return EwmaDetector()
+
+def find_anomalies(dimension, value='수리비'):
+    """분석 시점에 기대값보다 유의하게 높은 그룹 (dimension=None이면 전체 합계)"""
+    if dimension is not None and dimension not in cube.monthly:
+        return pd.DataFrame(columns=['현재', '기대값', '초과액', 'z'])
+    keys, periods, matrix = cube.matrix(dimension, period_type, value)
+    return detect(get_detector(period_type, dimension, value), keys, periods, matrix,
+                  current_period, threshold=anomaly_threshold)
+
 # 핵심 문제 영역 분석
 st.header("🚨 주요 이슈 및 액션 포인트")
+anomaly_threshold = st.slider("급증 판정 기준 (z 점수)", min_value=2.0, max_value=5.0, value=3.0, step=0.5,
+                              key="anomaly_threshold",
+                              help="그룹별 과거 추세(EWMA)로 예상한 값보다 표준편차의 몇 배 이상 높을 때 급증으로 판정합니다. "
+                                   "이력이 3개 기간 미만인 그룹은 판정하지 않습니다.")
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
     st.subheader("🔥 수리비 급증 파트 TOP 5")
     
-    # 이번달 vs 지난달 파트별 비교
+    # 파트별 수리비 시계열 이상 탐지
+    top_increases = find_anomalies('정비자소속')
     if '정비자소속' in df.columns:
-        current_part_cost = current_data.groupby('정비자소속')['수리비'].sum()
-        prev_part_cost = prev_data.groupby('정비자소속')['수리비'].sum()
-        
-        # 증감률 계산
-        part_comparison = pd.DataFrame({
-            '이번달': current_part_cost,
-            '지난달': prev_part_cost
-        }).fillna(0)
-        
-        part_comparison['증감률'] = ((part_comparison['이번달'] - part_comparison['지난달']) / 
-                                   part_comparison['지난달'].replace(0, 1) * 100)
-        part_comparison['증감액'] = part_comparison['이번달'] - part_comparison['지난달']
-        
-        # 급증한 파트 TOP 5
-        top_increases = part_comparison.nlargest(5, '증감률')
-        
-        for idx, (part, row) in enumerate(top_increases.iterrows()):
-            if row['증감률'] > 20:  # 20% 이상 증가한 경우만
-                color = "🔴" if row['증감률'] > 50 else "🟡"
-                st.write(f"{color} **{part}**")
-                st.write(f"   증감: +{row['증감률']:.1f}% (+{row['증감액']:,.0f}원)")
-            else:
-                break
+        for part, row in top_increases.head(5).iterrows():
+            color = "🔴" if row['z'] >= anomaly_threshold + 2 else "🟡"
+            st.write(f"{color} **{part}**")
+            st.write(f"   수리비 {row['현재']:,.0f}원 (예상 {row['기대값']:,.0f}원, +{row['초과액']:,.0f}원, z={row['z']:.1f})")
+        if top_increases.empty:
+            st.write("🟢 추세 대비 급증한 파트가 없습니다.")
     else:
         st.info("파트 정보가 없습니다.")
 
@@ -217,50 +237,35 @@ with col2:
     st.subheader("⚠️ 문제 업체 TOP 5")
     
     # 업체별 수리비 급증 분석
+    problem_clients = pd.DataFrame()
     if '현장명' in df.columns:
-        current_client_cost = current_data.groupby('현장명')['수리비'].sum()
-        prev_client_cost = prev_data.groupby('현장명')['수리비'].sum()
-        
-        client_comparison = pd.DataFrame({
-            '이번달': current_client_cost,
-            '지난달': prev_client_cost
-        }).fillna(0)
-        
-        client_comparison['증감률'] = ((client_comparison['이번달'] - client_comparison['지난달']) / 
-                                     client_comparison['지난달'].replace(0, 1) * 100)
-        client_comparison['증감액'] = client_comparison['이번달'] - client_comparison['지난달']
+        client_comparison = cube.compare('현장명', current_period, base_period, period_type)
         
         # 문제 업체 TOP 5 (수리비 절대액 기준)
-        problem_clients = client_comparison.nlargest(5, '이번달')
+        problem_clients = client_comparison.nlargest(5, '현재')
         
         for idx, (client, row) in enumerate(problem_clients.iterrows()):
-            if row['이번달'] > 1000000:  # 100만원 이상인 경우
-                color = "🔴" if row['이번달'] > 5000000 else "🟡"
+            if row['현재'] > 1000000:  # 100만원 이상인 경우
+                color = "🔴" if row['현재'] > 5000000 else "🟡"
                 client_short = client[:15] + "..." if len(client) > 15 else client
                 st.write(f"{color} **{client_short}**")
-                st.write(f"   수리비: {row['이번달']:,.0f}원")
-                if row['지난달'] > 0:
-                    st.write(f"   전월대비: {row['증감률']:+.1f}%")
+                st.write(f"   수리비: {row['현재']:,.0f}원")
+                if row['비교'] > 0:
+                    st.write(f"   {compare_type}: {row['증감률']:+.1f}%")
     else:
         st.info("업체 정보가 없습니다.")
 
 with col3:
     st.subheader("🔧 주요 고장 유형")
     
-    # 이번달 주요 고장 유형 분석
-    if '작업유형' in current_data.columns and '정비대상' in current_data.columns:
-        current_faults = current_data.groupby(['작업유형', '정비대상']).agg({
-            '수리비': 'sum',
-            '관리번호': 'count'
-        }).reset_index()
-        
-        current_faults['고장유형'] = current_faults['작업유형'] + ' > ' + current_faults['정비대상']
-        top_faults = current_faults.nlargest(5, '수리비')
+    # 분석 기간 주요 고장 유형 분석
+    if '작업유형' in df.columns and '정비대상' in df.columns:
+        top_faults = cube.top('작업유형 > 정비대상', current_period, period_type, n=5)
         
-        for idx, row in top_faults.iterrows():
+        for fault, row in top_faults.iterrows():
             cost_level = "🔴" if row['수리비'] > 2000000 else "🟡" if row['수리비'] > 1000000 else "🟢"
-            st.write(f"{cost_level} **{row['고장유형']}**")
-            st.write(f"   수리비: {row['수리비']:,.0f}원 ({row['관리번호']}건)")
+            st.write(f"{cost_level} **{fault}**")
+            st.write(f"   수리비: {row['수리비']:,.0f}원 ({row['건수']:,.0f}건)")
     else:
         st.info("고장 유형 정보가 없습니다.")
 
@@ -270,22 +275,33 @@ st.header("📋 이번 주 액션 아이템")
 
 action_items = []
 
-# 자동으로 액션 아이템 생성
+# 자동으로 액션 아이템 생성 (추세 대비 유의한 급증만, z 점수 순)
 if len(top_increases) > 0:
     worst_part = top_increases.index[0]
-    worst_increase = top_increases.iloc[0]['증감률']
-    if worst_increase > 30:
-        action_items.append(f"🔥 **긴급**: {worst_part} 파트 수리비 {worst_increase:.1f}% 급증 → 원인 분석 및 대책 수립")
-
-if len(problem_clients) > 0:
-    worst_client = problem_clients.index[0]
-    worst_cost = problem_clients.iloc[0]['이번달']
-    if worst_cost > 3000000:
-        client_short = worst_client[:20] + "..." if len(worst_client) > 20 else worst_client
-        action_items.append(f"📞 **업체 미팅**: {client_short} (수리비 {worst_cost:,.0f}원) → 디마케팅 검토")
-
-if case_change > 20:
-    action_items.append(f"📈 **트렌드 주의**: AS 건수 {case_change:.1f}% 증가 → 계절성/특이사항 분석")
+    row = top_increases.iloc[0]
+    action_items.append(f"🔥 **긴급**: {worst_part} 수리비 예상 대비 +{row['초과액']:,.0f}원 급증 "
+                        f"(z={row['z']:.1f}) → 원인 분석 및 대책 수립")
+
+client_anomalies = find_anomalies('현장명')
+if len(client_anomalies) > 0:
+    worst_client = client_anomalies.index[0]
+    row = client_anomalies.iloc[0]
+    client_short = worst_client[:20] + "..." if len(worst_client) > 20 else worst_client
+    action_items.append(f"📞 **업체 미팅**: {client_short} (수리비 {row['현재']:,.0f}원, 예상 대비 +{row['초과액']:,.0f}원, "
+                        f"z={row['z']:.1f}) → 디마케팅 검토")
+
+fault_anomalies = find_anomalies('고장유형')
+if len(fault_anomalies) > 0:
+    worst_fault = fault_anomalies.index[0]
+    row = fault_anomalies.iloc[0]
+    action_items.append(f"🔧 **고장 급증**: {worst_fault} 수리비 예상 대비 +{row['초과액']:,.0f}원 (z={row['z']:.1f}) "
+                        f"→ 해당 고장 유형 점검 계획 수립")
+
+case_anomalies = find_anomalies(None, value='건수')
+if len(case_anomalies) > 0:
+    row = case_anomalies.iloc[0]
+    action_items.append(f"📈 **트렌드 주의**: AS 건수 {row['현재']:,.0f}건 (예상 {row['기대값']:,.0f}건, z={row['z']:.1f}) "
+                        f"→ 계절성/특이사항 분석")
 
 if not action_items:
     action_items.append("✅ 현재 특이사항 없음 - 정상 운영 중")
@@ -1,10 +1,56 @@
 # 2. 상세 분석 페이지들
 # pages/02_파트별_심층_분석.py
 
+import streamlit as st
+import pandas as pd
+from utils.data_processing import dataset_version
+from utils.periods import PeriodCube, month_index
+from utils.sketch import RELATIVE_ACCURACY
+from utils import tables
+
+st.set_page_config(page_title="파트별 심층 분석", layout="wide")
 st.title("🔍 파트별 심층 분석")
 
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+# 월별 집계와 분위수 스케치 (데이터셋마다 한 번, 기간/파트별 분위수는 스케치를 합쳐 계산)
+@st.cache_resource(max_entries=4, show_spinner="월별 집계 중...")
+def load_period_cube(version, _df):
+    return PeriodCube(_df)
+
+cube = load_period_cube(version, df)
+
+# 사이드바 - 분석 기간
+st.sidebar.header("🔍 분석 조건 설정")
+years = sorted(df['정비일자'].dropna().dt.year.unique(), reverse=True)
+year = st.sidebar.selectbox("분석 기간", ["전체"] + [int(y) for y in years],
+                            format_func=lambda y: y if y == "전체" else f"{y}년")
+months = None if year == "전체" else (year * 12, year * 12 + 11)
+# 파트 목록은 기간과 관계없이 고정 (기간을 바꿔도 선택 유지)
+parts = sorted(df['정비자소속'].dropna().unique())
+if months is not None:
+    month_numbers = month_index(df['정비일자'])
+    df = df[(month_numbers >= months[0]) & (month_numbers <= months[1])]
+
+# 파트별 수리비/수리시간 분위수
+part_percentiles = {value: cube.percentiles(value, '정비자소속', months) for value in cube.sketches}
+if '수리비' in part_percentiles and not part_percentiles['수리비'].empty:
+    st.subheader("📐 파트별 수리비 분위수")
+    tables.show_table(part_percentiles['수리비'].sort_values('P90', ascending=False), 'table_part_cost_percentiles', {
+        '건수': tables.COUNT,
+        'P50': tables.WON,
+        'P90': tables.WON,
+        'P99': tables.WON,
+    }, cache_key=(version, year, 'cost_percentiles'))
+    st.caption(f"월별 분위수 스케치를 합쳐 계산한 근사값입니다 (상대 오차 {RELATIVE_ACCURACY:.0%} 이내).")
+
 # 파트 선택
-selected_parts = st.multiselect("분석할 파트 선택", df['정비자소속'].unique())
+selected_parts = st.multiselect("분석할 파트 선택", parts)
 
 if selected_parts:
     for part in selected_parts:
@@ -33,8 +79,19 @@ if selected_parts:
             for brand, count in brands.items():
                 st.write(f"• {brand}: {count}건")
         
+        # 수리비/수리시간 분위수 (파트 스케치 기준)
+        columns = st.columns(6)
+        for position, (value, unit) in enumerate([('수리비', "원"), ('수리시간', "시간")]):
+            percentiles = part_percentiles.get(value)
+            if percentiles is None or part not in percentiles.index:
+                continue
+            for offset, label in enumerate(['P50', 'P90', 'P99']):
+                number = percentiles.loc[part, label]
+                text = f"{number:,.0f}{unit}" if unit == "원" else f"{number:.1f}{unit}"
+                columns[position * 3 + offset].metric(f"{value} {label}", text)
+
         # 파트별 월별 트렌드
-        part_monthly = part_data.groupby('년월').agg({
+        part_monthly = part_data.groupby(part_data['정비일자'].dt.to_period('M')).agg({
             '수리비': 'sum',
             '관리번호': 'count'
         })
@@ -42,11 +99,15 @@ if selected_parts:
         # 상세 분석을 위한 드릴다운 기능
         st.write("**상세 분석이 필요한 케이스들:**")
         
-        # 고비용 케이스 찾기
-        high_cost_cases = part_data[part_data['수리비'] > part_data['수리비'].quantile(0.9)]
+        # 고비용 케이스 찾기 (파트 수리비 P90 초과)
+        if '수리비' in part_percentiles and part in part_percentiles['수리비'].index:
+            high_cost_threshold = part_percentiles['수리비'].loc[part, 'P90']
+        else:
+            high_cost_threshold = part_data['수리비'].quantile(0.9)
+        high_cost_cases = part_data[part_data['수리비'] > high_cost_threshold]
         if not high_cost_cases.empty:
             st.write("🔴 **고비용 수리 케이스들:**")
             for idx, case in high_cost_cases.head(5).iterrows():
                 st.write(f"• {case.get('현장명', 'N/A')} - {case.get('브랜드', 'N/A')} {case.get('모델명', 'N/A')} - {case['수리비']:,.0f}원")
                 if '사용부품' in case and pd.notna(case['사용부품']):
-                    st.write(f"  └ 사용부품: {case['사용부품']}")
\ No newline at end of file
+                    st.write(f"  └ 사용부품: {case['사용부품']}")
@@ -3,14 +3,23 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from utils.visualization import create_figure, get_image_download_link
+from utils.lazy_import import lazy_module
+from utils import monthly_report as report
+from utils.data_processing import dataset_version, get_fleet_index
+from utils.periods import PeriodCube
+from utils.leaderboard import TechnicianLedger, RANKING_METRICS, REWORK_DAYS
+from utils.sketch import RELATIVE_ACCURACY
+from utils.export import export_bytes, EXCEL_MAX_ROWS
+from utils import scatter
+from utils import tables
+from utils.figure_cache import cached_figure
+from utils.render_profiler import RenderProfiler, AGGREGATION, FIGURE, SERIALIZATION
 import calendar
 
+# 차트 라이브러리는 선택한 구역에서 차트를 처음 만들 때 불러옴
+px = lazy_module("plotly.express")
+go = lazy_module("plotly.graph_objects")
+
 st.set_page_config(page_title="월별 종합 분석", layout="wide")
 st.title("📅 월별 종합 분석 리포트")
 
@@ -19,11 +28,19 @@ if 'df_maintenance' not in st.session_state:
     st.stop()
 
 df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+# 렌더링 시간 측정 (켜면 집계/차트 생성/직렬화 호출을 구역별로 측정)
+profiler = RenderProfiler("04_월별_종합_분석", enabled=st.sidebar.toggle("⏱️ 렌더링 시간 측정", key='profile_render_04'))
+report = profiler.instrument(report, AGGREGATION)
+px = profiler.instrument(px, FIGURE)
+go = profiler.instrument(go, FIGURE)
+scatter = profiler.instrument(scatter, FIGURE)
+st = profiler.instrument(st, SERIALIZATION, names=('plotly_chart', 'dataframe'))
 
-# 날짜 전처리
-df['년월'] = df['정비일자'].dt.to_period('M')
-df['년'] = df['정비일자'].dt.year
-df['월'] = df['정비일자'].dt.month
+# 날짜 전처리 (데이터셋마다 한 번, 세션 데이터에 컬럼 추가)
+if '년월' not in df.columns:
+    df = report.add_period_columns(df)
 
 # 사이드바 - 분석 조건 선택
 st.sidebar.header("📊 분석 조건 설정")
@@ -46,17 +63,71 @@ if '정비구분' in df.columns:
 else:
     selected_maintenance_type = "전체"
 
-# 데이터 필터링
-filtered_df = df[(df['년'] == selected_year) & (df['월'] == selected_month)].copy()
-
-if equipment_filter != "전체":
-    if equipment_filter == "지게차" and '자재내역' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['자재내역'].str.contains('지게차|FORKLIFT|전동|디젤', na=False, case=False)]
-    elif equipment_filter == "AWP" and '자재내역' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['자재내역'].str.contains('AWP|고소작업대|수직형', na=False, case=False)]
-
-if selected_maintenance_type != "전체" and '정비구분' in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df['정비구분'] == selected_maintenance_type]
+# 데이터 필터링 및 집계 결과 재사용
+# - 각 구역의 집계는 (데이터 버전, 필터 상태)의 함수로 캐시되어, 한 번 본 조건으로 돌아오면 다시 계산하지 않음
+filter_state = (selected_year, selected_month, equipment_filter, selected_maintenance_type)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def load_filtered(version, filter_state, _df):
+    """(데이터 버전, 필터 상태)별 필터링 결과 (읽기 전용으로 공유)"""
+    return report.filter_month(_df, *filter_state)
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def compute_table(version, filter_state, name, args, kwargs, _filtered_df):
+    """(데이터 버전, 필터 상태)별 리포트 집계 결과"""
+    return getattr(report, name)(_filtered_df, *args, **dict(kwargs))
+
+def cached_table(name, *args, **kwargs):
+    return compute_table(version, filter_state, name, args, tuple(sorted(kwargs.items())), filtered_df)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_export(version, filter_state, target, file_format, _filtered_df):
+    """(데이터 버전, 필터 상태)별 다운로드 파일 (요청한 경우에만 생성)"""
+    if target == 'detail':
+        return export_bytes({'상세데이터': _filtered_df}, file_format, index=False)
+    if target == 'part':
+        return export_bytes({'파트별요약': report.part_export_summary(_filtered_df)}, file_format)
+    if target == 'client':
+        return export_bytes({'업체별요약': report.client_export_summary(_filtered_df)}, file_format)
+    return export_bytes(report.build_report_tables(_filtered_df), file_format)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_fleet_rates(version, fleet_version, filter_state, dimension, _filtered_df):
+    """(데이터 버전, 필터 상태)별 보유 대수 대비 AS 지표"""
+    return get_fleet_index().rates(_filtered_df, dimension).drop(columns=['AS장비수'])
+
+# 월별 집계와 분위수 스케치 (데이터셋마다 한 번, 여러 달의 분위수는 월별 스케치를 합쳐 계산)
+@st.cache_resource(max_entries=4, show_spinner="월별 집계 중...")
+def load_period_cube(version, _df):
+    return PeriodCube(_df)
+
+# 선택 월에서 거슬러 올라간 개월 수
+PERIOD_WINDOWS = {"선택 월": 1, "최근 3개월": 3, "최근 6개월": 6, "최근 12개월": 12}
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_percentiles(version, filter_state, value):
+    """(데이터 버전, 필터 상태)별 기간 창마다 value의 건수/P50/P90/P99 (장비 구분/정비구분 필터 적용)"""
+    year, month, equipment, maintenance_type = filter_state
+    end = int(year) * 12 + int(month) - 1
+    cube = load_period_cube(version, df)
+    windows = {label: cube.percentiles(value, months=(end - n + 1, end), equipment=equipment,
+                                       maintenance_type=maintenance_type)
+               for label, n in PERIOD_WINDOWS.items()}
+    windows = {label: frame for label, frame in windows.items() if not frame.empty}
+    if not windows:
+        return None
+    return pd.concat(windows).droplevel(1).rename_axis('기간')
+
+# 정비자 × 월 누적합 (장비 구분/정비구분 조합마다 한 번, 기간 창 합계는 누적합 차이로 계산)
+@st.cache_resource(max_entries=8, show_spinner="정비자 월별 집계 중...")
+def load_ledger(version, segment_state, _df):
+    return TechnicianLedger(report.filter_segment(_df, *segment_state))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_leaderboard(version, segment_state, end_month, n_months, by, min_jobs):
+    return load_ledger(version, segment_state, df).leaderboard(end_month, n_months, by=by, min_jobs=min_jobs)
+
+filtered_df = load_filtered(version, filter_state, df)
 
 # 메인 제목
 st.header(f"🗓️ {selected_year}년 {selected_month}월 ({equipment_filter}) 상세 분석 리포트")
@@ -66,9 +137,10 @@ if filtered_df.empty:
     st.stop()
 
 # 기본 통계
-total_cases = len(filtered_df)
-total_cost = filtered_df['수리비'].sum() if '수리비' in filtered_df.columns else 0
-avg_cost_per_case = total_cost / total_cases if total_cases > 0 else 0
+metrics = cached_table('summary_metrics')
+total_cases = metrics['total_cases']
+total_cost = metrics['total_cost']
+avg_cost_per_case = metrics['avg_cost_per_case']
 
 # 대시보드 상단 - 핵심 지표
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -83,614 +155,625 @@ with col3:
     st.metric("건당 평균 수리비", f"{avg_cost_per_case:,.0f}원")
 
 with col4:
-    unique_clients = filtered_df['현장명'].nunique() if '현장명' in filtered_df.columns else 0
+    unique_clients = metrics['unique_clients']
     st.metric("관련 업체 수", f"{unique_clients}개")
 
 with col5:
-    unique_equipment = filtered_df['관리번호'].nunique()
+    unique_equipment = metrics['unique_equipment']
     st.metric("수리 장비 수", f"{unique_equipment}대")
 
 st.markdown("---")
 
-# 탭으로 구분된 상세 분석
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-    "👥 정비자/파트별", "🔧 고장유형별", "⏱️ 시간분석", "🏢 업체/지역별", "🚛 장비별", "💰 수리비분석"
-])
-
-# 탭 1: 정비자/파트별 분석
-with tab1:
-    st.subheader("👥 정비자 및 소속파트별 분석")
+# 구역별 상세 분석 (선택한 구역만 계산하여 표시)
+SECTIONS = [
+    "👥 정비자/파트별", "🔧 고장유형별", "⏱️ 시간분석", "🏢 업체/지역별", "🚛 장비별", "💰 수리비분석",
+    "📋 월말 리포트 요약", "📥 리포트 다운로드"
+]
+selected_section = st.segmented_control("분석 구역", SECTIONS, default=SECTIONS[0], key='report_section_04',
+                                        label_visibility="collapsed") or SECTIONS[0]
+
+# 구역 1: 정비자/파트별 분석
+if selected_section == SECTIONS[0]:
+    with profiler.section("정비자/파트별"):
+        st.subheader("👥 정비자 및 소속파트별 분석")
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        # 파트별 건수 분석
-        if '정비자소속' in filtered_df.columns:
-            st.write("**📊 소속파트별 건수 및 비율**")
-            
-            part_analysis = filtered_df.groupby('정비자소속').agg({
-                '관리번호': 'count',
-                '수리비': 'sum'
-            }).rename(columns={'관리번호': '건수', '수리비': '총수리비'})
-            
-            part_analysis['건수비율(%)'] = (part_analysis['건수'] / part_analysis['건수'].sum() * 100).round(1)
-            part_analysis['평균수리비'] = (part_analysis['총수리비'] / part_analysis['건수']).round(0)
-            part_analysis = part_analysis.sort_values('건수', ascending=False)
-            
-            # 파트별 건수 차트
-            fig = px.bar(
-                x=part_analysis.index,
-                y=part_analysis['건수'],
-                title="파트별 AS 건수",
-                color=part_analysis['건수'],
-                color_continuous_scale='Blues'
-            )
-            fig.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            # 파트별 건수 분석
+            if '정비자소속' in filtered_df.columns:
+                st.write("**📊 소속파트별 건수 및 비율**")
+            
+                part_analysis = cached_table('part_summary')
+            
+                # 파트별 건수 차트
+                def build_figure():
+                    fig = px.bar(
+                        x=part_analysis.index,
+                        y=part_analysis['건수'],
+                        title="파트별 AS 건수",
+                        color=part_analysis['건수'],
+                        color_continuous_scale='Blues'
+                    )
+                    fig.update_layout(height=400, showlegend=False)
+                    return fig
+                fig = cached_figure(('파트별 건수', part_analysis), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # 상세 테이블
-            st.dataframe(
-                part_analysis.style.format({
-                    '총수리비': '{:,.0f}원',
-                    '평균수리비': '{:,.0f}원',
-                    '건수비율(%)': '{:.1f}%'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("정비자소속 정보가 없습니다.")
+                # 상세 테이블
+                tables.show_table(part_analysis, 'table_part_summary', {
+                    '총수리비': tables.WON,
+                    '평균수리비': tables.WON,
+                    '건수비율(%)': tables.PERCENT
+                }, container=st)
+            else:
+                st.info("정비자소속 정보가 없습니다.")
     
-    with col2:
-        # 개별 정비자 분석
-        if '정비자' in filtered_df.columns:
-            st.write("**👤 개별 정비자 성과 분석**")
-            
-            worker_analysis = filtered_df.groupby(['정비자', '정비자소속']).agg({
-                '관리번호': 'count',
-                '수리비': ['sum', 'mean'],
-                '수리시간': 'mean' if '수리시간' in filtered_df.columns else lambda x: 0
-            }).round(1)
-            
-            worker_analysis.columns = ['건수', '총수리비', '평균수리비', '평균수리시간']
-            worker_analysis = worker_analysis.reset_index()
-            worker_analysis = worker_analysis.sort_values('건수', ascending=False).head(10)
-            
-            # Top 10 정비자 차트
-            fig = px.scatter(
-                worker_analysis,
-                x='건수',
-                y='평균수리비',
-                size='총수리비',
-                color='정비자소속',
-                hover_name='정비자',
-                title="정비자별 성과 (건수 vs 평균수리비)"
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            # 개별 정비자 분석
+            if '정비자' in filtered_df.columns:
+                st.write("**👤 개별 정비자 성과 분석**")
+            
+                worker_analysis = cached_table('worker_summary', top_n=10)
+            
+                # Top 10 정비자 차트
+                def build_figure():
+                    fig = px.scatter(
+                        worker_analysis,
+                        x='건수',
+                        y='평균수리비',
+                        size='총수리비',
+                        color='정비자소속',
+                        hover_name='정비자',
+                        title="정비자별 성과 (건수 vs 평균수리비)",
+                        render_mode='webgl'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                fig = cached_figure(('정비자 성과', worker_analysis), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.dataframe(
-                worker_analysis.style.format({
-                    '총수리비': '{:,.0f}원',
-                    '평균수리비': '{:,.0f}원',
-                    '평균수리시간': '{:.1f}시간'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("정비자 정보가 없습니다.")
+                tables.show_table(worker_analysis, 'table_worker_summary', {
+                    '총수리비': tables.WON,
+                    '평균수리비': tables.WON,
+                    '평균수리시간': tables.HOURS
+                }, container=st)
+            else:
+                st.info("정비자 정보가 없습니다.")
 
-# 탭 2: 고장유형별 분석
-with tab2:
-    st.subheader("🔧 고장유형별 상세 분석")
-    
-    # 대분류/중분류/소분류 분석
-    col1, col2, col3 = st.columns(3)
+        # 전체 정비자 목록 (켠 경우에만 집계/표시, 행이 많으면 서버에서 정렬 후 페이지 단위로 표시)
+        if '정비자' in filtered_df.columns:
+            if st.toggle("📋 전체 정비자 목록", key='show_worker_all_04'):
+                tables.show_table(cached_table('worker_summary', top_n=None), 'table_worker_all', {
+                    '총수리비': tables.WON,
+                    '평균수리비': tables.WON,
+                    '평균수리시간': tables.HOURS
+                }, cache_key=(version, filter_state, 'worker_summary'), container=st, hide_index=True)
+
+        # 정비자 리더보드 (선택 월까지 여러 달 기간 창)
+        if '정비자' in filtered_df.columns:
+            st.markdown("---")
+            st.write("**🏆 정비자 리더보드 (기간 창)**")
+            segment_state = (equipment_filter, selected_maintenance_type)
+            end_month = int(selected_year) * 12 + int(selected_month) - 1
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                window_label = st.selectbox("기간 창", list(PERIOD_WINDOWS), index=2, key='leaderboard_window_04')
+            with col2:
+                ranking_metric = st.selectbox("순위 지표", list(RANKING_METRICS), key='leaderboard_metric_04')
+            with col3:
+                min_jobs = st.number_input("최소 건수", min_value=1, max_value=100, value=5, key='leaderboard_min_jobs_04',
+                                           help="건수가 적은 정비자는 재정비율/평균수리시간이 크게 흔들리므로 순위에서 제외합니다.")
+            n_months = PERIOD_WINDOWS[window_label]
+            leaderboard = compute_leaderboard(version, segment_state, end_month, n_months, ranking_metric, int(min_jobs))
+
+            if leaderboard.empty:
+                st.info(f"기간 안에 {int(min_jobs)}건 이상 정비한 정비자가 없습니다.")
+            else:
+                tables.show_table(leaderboard, 'table_worker_leaderboard', {
+                    '건수': tables.COUNT,
+                    '수리비': tables.WON,
+                    '평균수리비': tables.WON,
+                    '평균수리시간': tables.HOURS,
+                    '재정비건수': tables.COUNT,
+                    '재정비율(%)': tables.PERCENT,
+                    '소속내백분위': ('', '%.0f', 0),
+                    '전체백분위': ('', '%.0f', 0),
+                }, cache_key=(version, segment_state, end_month, n_months, ranking_metric, int(min_jobs)),
+                    container=st, hide_index=True)
+                st.caption(f"재정비율: 정비 후 {REWORK_DAYS}일 안에 같은 장비가 다시 정비된 비율 (앞선 정비를 한 정비자 기준, "
+                           f"최근 {REWORK_DAYS}일 정비는 아직 집계 중) · 백분위: 같은 소속(또는 전체)에서 이 정비자보다 "
+                           "나쁘거나 같은 정비자 비율")
+
+                # 상위 5명의 이동 합계 추이
+                top_workers = leaderboard.index[:5]
+                trend = load_ledger(version, segment_state, df).rolling(top_workers, n_months, ranking_metric)
+
+                trend_basis = "합계" if ranking_metric in ('건수', '수리비') else "기준"
+
+                def build_figure():
+                    fig = px.line(trend, markers=True,
+                                  title=f"상위 {len(top_workers)}명 {ranking_metric} 추이 ({n_months}개월 이동 {trend_basis})")
+                    fig.update_layout(height=400, xaxis_title="월", yaxis_title=ranking_metric, legend_title="정비자")
+                    return fig
+                fig = cached_figure(('정비자 리더보드 추이', version, segment_state, n_months, ranking_metric,
+                                     tuple(top_workers)), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
+
+# 구역 2: 고장유형별 분석
+if selected_section == SECTIONS[1]:
+    with profiler.section("고장유형별"):
+        st.subheader("🔧 고장유형별 상세 분석")
     
-    classification_cols = {
-        '대분류': '작업유형',
-        '중분류': '정비대상', 
-        '소분류': '정비작업'
-    }
+        # 대분류/중분류/소분류 분석
+        col1, col2, col3 = st.columns(3)
     
-    for i, (title, col_name) in enumerate(classification_cols.items()):
-        with [col1, col2, col3][i]:
-            if col_name in filtered_df.columns:
-                st.write(f"**{title} 분석**")
+        for i, (title, col_name) in enumerate(report.CLASSIFICATION_COLS.items()):
+            with [col1, col2, col3][i]:
+                if col_name in filtered_df.columns:
+                    st.write(f"**{title} 분석**")
                 
-                category_analysis = filtered_df.groupby(col_name).agg({
-                    '관리번호': 'count',
-                    '수리비': 'sum'
-                }).rename(columns={'관리번호': '건수'})
+                    category_analysis = cached_table('category_summary', col_name)
                 
-                category_analysis['비율(%)'] = (category_analysis['건수'] / category_analysis['건수'].sum() * 100).round(1)
-                category_analysis = category_analysis.sort_values('건수', ascending=False)
+                    # 파이 차트
+                    def build_figure():
+                        fig = px.pie(
+                            values=category_analysis['건수'],
+                            names=category_analysis.index,
+                            title=f"{title} 건수 분포"
+                        )
+                        fig.update_layout(height=300, showlegend=False)
+                        return fig
+                    fig = cached_figure(('분류별 건수', title, category_analysis), build_figure)
+                    st.plotly_chart(fig, use_container_width=True)
                 
-                # 파이 차트
-                fig = px.pie(
-                    values=category_analysis['건수'],
-                    names=category_analysis.index,
-                    title=f"{title} 건수 분포"
-                )
-                fig.update_layout(height=300, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # 상위 5개 표시
-                st.write("**Top 5:**")
-                for idx, (cat, row) in enumerate(category_analysis.head(5).iterrows()):
-                    st.write(f"{idx+1}. {cat}: {row['건수']}건 ({row['비율(%)']:.1f}%)")
-            else:
-                st.info(f"{title} 정보가 없습니다.")
+                    # 상위 5개 표시
+                    st.write("**Top 5:**")
+                    for idx, (cat, row) in enumerate(category_analysis.head(5).iterrows()):
+                        st.write(f"{idx+1}. {cat}: {row['건수']}건 ({row['비율(%)']:.1f}%)")
+                else:
+                    st.info(f"{title} 정보가 없습니다.")
     
-    # 조합된 정비사유 분석 (대>중>소)
-    if all(col in filtered_df.columns for col in ['작업유형', '정비대상', '정비작업']):
-        st.write("**📋 상세 정비사유 분석 (대>중>소 조합)**")
-        
-        filtered_df['정비사유조합'] = (filtered_df['작업유형'].astype(str) + ' > ' + 
-                                   filtered_df['정비대상'].astype(str) + ' > ' + 
-                                   filtered_df['정비작업'].astype(str))
+        # 조합된 정비사유 분석 (대>중>소)
+        if all(col in filtered_df.columns for col in ['작업유형', '정비대상', '정비작업']):
+            st.write("**📋 상세 정비사유 분석 (대>중>소 조합)**")
         
-        repair_reason_analysis = filtered_df.groupby('정비사유조합').agg({
-            '관리번호': 'count',
-            '수리비': ['sum', 'mean'],
-            '수리시간': 'mean' if '수리시간' in filtered_df.columns else lambda x: 0
-        }).round(1)
+            repair_reason_analysis = cached_table('repair_reason_summary', top_n=15)
         
-        repair_reason_analysis.columns = ['건수', '총수리비', '평균수리비', '평균수리시간']
-        repair_reason_analysis = repair_reason_analysis.sort_values('건수', ascending=False).head(15)
-        
-        st.dataframe(
-            repair_reason_analysis.style.format({
-                '총수리비': '{:,.0f}원',
-                '평균수리비': '{:,.0f}원',
-                '평균수리시간': '{:.1f}시간'
-            }),
-            use_container_width=True
-        )
-
-# 탭 3: 시간분석
-with tab3:
-    st.subheader("⏱️ 가동시간 및 수리시간 분석")
+            tables.show_table(repair_reason_analysis, 'table_repair_reason_summary', {
+                '총수리비': tables.WON,
+                '평균수리비': tables.WON,
+                '평균수리시간': tables.HOURS
+            }, container=st)
+
+# 구역 3: 시간분석
+if selected_section == SECTIONS[2]:
+    with profiler.section("시간분석"):
+        st.subheader("⏱️ 가동시간 및 수리시간 분석")
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        # 가동시간 분포 분석
-        if '가동시간' in filtered_df.columns:
-            st.write("**⚡ 가동시간 분포 분석**")
-            
-            # 가동시간 구간별 분석
-            operation_time_bins = [0, 1000, 3000, 5000, 8000, float('inf')]
-            operation_time_labels = ['0-1000h', '1000-3000h', '3000-5000h', '5000-8000h', '8000h+']
-            
-            filtered_df['가동시간구간'] = pd.cut(filtered_df['가동시간'], 
-                                             bins=operation_time_bins, 
-                                             labels=operation_time_labels)
-            
-            operation_analysis = filtered_df.groupby('가동시간구간').agg({
-                '관리번호': 'count',
-                '수리비': 'mean',
-                '수리시간': 'mean' if '수리시간' in filtered_df.columns else lambda x: 0
-            }).round(1)
-            
-            operation_analysis.columns = ['건수', '평균수리비', '평균수리시간']
-            
-            # 가동시간과 수리비 관계 차트
-            fig = px.bar(
-                x=operation_analysis.index,
-                y=operation_analysis['건수'],
-                title="가동시간 구간별 AS 건수"
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            # 가동시간 분포 분석
+            if '가동시간' in filtered_df.columns:
+                st.write("**⚡ 가동시간 분포 분석**")
+            
+                # 가동시간 구간별 분석
+                operation_analysis = cached_table('operation_time_summary')
+            
+                # 가동시간과 수리비 관계 차트
+                def build_figure():
+                    fig = px.bar(
+                        x=operation_analysis.index,
+                        y=operation_analysis['건수'],
+                        title="가동시간 구간별 AS 건수"
+                    )
+                    return fig
+                fig = cached_figure(('가동시간 구간별 건수', operation_analysis), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.dataframe(
-                operation_analysis.style.format({
-                    '평균수리비': '{:,.0f}원',
-                    '평균수리시간': '{:.1f}시간'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("가동시간 정보가 없습니다.")
+                tables.show_table(operation_analysis, 'table_operation_time_summary', {
+                    '평균수리비': tables.WON,
+                    '평균수리시간': tables.HOURS
+                }, container=st)
+            else:
+                st.info("가동시간 정보가 없습니다.")
     
-    with col2:
-        # 수리시간 분석
-        if '수리시간' in filtered_df.columns:
-            st.write("**🔧 수리시간 상세 분석**")
+        with col2:
+            # 수리시간 분석
+            if '수리시간' in filtered_df.columns:
+                st.write("**🔧 수리시간 상세 분석**")
             
-            # 분류별 수리시간 분석
-            if '작업유형' in filtered_df.columns:
-                repair_time_analysis = filtered_df.groupby('작업유형').agg({
-                    '수리시간': ['count', 'sum', 'mean', 'min', 'max']
-                }).round(1)
+                # 분류별 수리시간 분석
+                if '작업유형' in filtered_df.columns:
+                    repair_time_analysis = cached_table('repair_time_summary')
                 
-                repair_time_analysis.columns = ['건수', '총수리시간', '평균수리시간', '최단시간', '최장시간']
-                repair_time_analysis = repair_time_analysis.sort_values('총수리시간', ascending=False)
+                    # 수리시간 분포 차트
+                    def build_figure():
+                        fig = go.Figure()
+                        fig.add_trace(go.Bar(
+                            x=repair_time_analysis.index,
+                            y=repair_time_analysis['총수리시간'],
+                            name='총수리시간',
+                            marker_color='lightblue'
+                        ))
                 
-                # 수리시간 분포 차트
-                fig = go.Figure()
-                fig.add_trace(go.Bar(
-                    x=repair_time_analysis.index,
-                    y=repair_time_analysis['총수리시간'],
-                    name='총수리시간',
-                    marker_color='lightblue'
-                ))
+                        fig.update_layout(
+                            title="작업유형별 총 수리시간",
+                            xaxis_title="작업유형",
+                            yaxis_title="총 수리시간 (시간)",
+                            height=400
+                        )
+                        return fig
+                    fig = cached_figure(('작업유형별 수리시간', repair_time_analysis), build_figure)
+                    st.plotly_chart(fig, use_container_width=True)
                 
-                fig.update_layout(
-                    title="작업유형별 총 수리시간",
-                    xaxis_title="작업유형",
-                    yaxis_title="총 수리시간 (시간)",
-                    height=400
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                st.dataframe(
-                    repair_time_analysis.style.format({
-                        '총수리시간': '{:.1f}시간',
-                        '평균수리시간': '{:.1f}시간',
-                        '최단시간': '{:.1f}시간',
-                        '최장시간': '{:.1f}시간'
-                    }),
-                    use_container_width=True
-                )
-        else:
-            st.info("수리시간 정보가 없습니다.")
+                    tables.show_table(repair_time_analysis, 'table_repair_time_summary', {
+                        '총수리시간': tables.HOURS,
+                        '평균수리시간': tables.HOURS,
+                        '최단시간': tables.HOURS,
+                        '최장시간': tables.HOURS
+                    }, container=st)
+
+                # 수리시간 분위수 (월별 스케치를 합친 근사값)
+                repair_time_percentiles = compute_percentiles(version, filter_state, '수리시간')
+                if repair_time_percentiles is not None:
+                    st.write("**📐 수리시간 분위수 (기간별)**")
+                    tables.show_table(repair_time_percentiles, 'table_repair_time_percentiles', {
+                        '건수': tables.COUNT,
+                        'P50': tables.HOURS,
+                        'P90': tables.HOURS,
+                        'P99': tables.HOURS,
+                    }, container=st)
+            else:
+                st.info("수리시간 정보가 없습니다.")
     
-    # 가동시간과 수리시간의 연계성 분석
-    if all(col in filtered_df.columns for col in ['가동시간', '수리시간']):
-        st.write("**🔗 가동시간과 수리시간 연계성 분석**")
+        # 가동시간과 수리시간의 연계성 분석
+        if all(col in filtered_df.columns for col in ['가동시간', '수리시간']):
+            st.write("**🔗 가동시간과 수리시간 연계성 분석**")
         
-        # 산점도로 관계 분석
-        fig = px.scatter(
-            filtered_df,
-            x='가동시간',
-            y='수리시간',
-            color='작업유형' if '작업유형' in filtered_df.columns else None,
-            title="가동시간 vs 수리시간 관계",
-            trendline="ols"
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+            # 산점도로 관계 분석 (WebGL, 추세선은 전체 데이터 기준 최소제곱 직선)
+            # 점이 많으면 밀도 보존 표본 또는 구간 집계로 표시
+            scatter_mode = scatter.MODE_SAMPLE
+            if len(filtered_df) > scatter.LARGE_SCATTER_THRESHOLD:
+                scatter_mode = st.radio(
+                    f"표시 방식 (전체 {len(filtered_df):,}건)",
+                    [scatter.MODE_SAMPLE, scatter.MODE_BINNED],
+                    format_func={scatter.MODE_SAMPLE: "밀도 보존 표본", scatter.MODE_BINNED: "구간 집계"}.get,
+                    horizontal=True
+                )
+            def build_figure():
+                fig = scatter.large_scatter(
+                    filtered_df,
+                    x='가동시간',
+                    y='수리시간',
+                    color='작업유형' if '작업유형' in filtered_df.columns else None,
+                    title="가동시간 vs 수리시간 관계",
+                    mode=scatter_mode
+                )
+                fig.update_layout(height=400)
+                return fig
+            fig = cached_figure(('가동시간 vs 수리시간', version, filter_state, scatter_mode), build_figure)
+            st.plotly_chart(fig, use_container_width=True)
         
-        # 상관관계 계산
-        correlation = filtered_df['가동시간'].corr(filtered_df['수리시간'])
+            # 상관관계 계산
+            correlation = cached_table('operation_repair_correlation')
         
-        if correlation > 0.3:
-            st.success(f"🔗 양의 상관관계 (상관계수: {correlation:.3f}) - 가동시간이 길수록 수리시간도 증가하는 경향")
-        elif correlation < -0.3:
-            st.warning(f"🔗 음의 상관관계 (상관계수: {correlation:.3f}) - 가동시간이 길수록 수리시간은 감소하는 경향")
-        else:
-            st.info(f"🔗 상관관계 약함 (상관계수: {correlation:.3f}) - 가동시간과 수리시간 간 뚜렷한 관계없음")
+            if correlation > 0.3:
+                st.success(f"🔗 양의 상관관계 (상관계수: {correlation:.3f}) - 가동시간이 길수록 수리시간도 증가하는 경향")
+            elif correlation < -0.3:
+                st.warning(f"🔗 음의 상관관계 (상관계수: {correlation:.3f}) - 가동시간이 길수록 수리시간은 감소하는 경향")
+            else:
+                st.info(f"🔗 상관관계 약함 (상관계수: {correlation:.3f}) - 가동시간과 수리시간 간 뚜렷한 관계없음")
 
-# 탭 4: 업체/지역별 분석
-with tab4:
-    st.subheader("🏢 업체 및 지역별 분석")
+# 구역 4: 업체/지역별 분석
+if selected_section == SECTIONS[3]:
+    with profiler.section("업체/지역별"):
+        st.subheader("🏢 업체 및 지역별 분석")
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        # 지역별 분석
-        if '지역' in filtered_df.columns:
-            st.write("**🗺️ 지역별 AS 현황**")
-            
-            region_analysis = filtered_df.groupby('지역').agg({
-                '관리번호': 'count',
-                '수리비': 'sum',
-                '현장명': 'nunique'
-            }).rename(columns={'관리번호': '건수', '현장명': '업체수'})
-            
-            region_analysis['평균수리비'] = (region_analysis['수리비'] / region_analysis['건수']).round(0)
-            region_analysis = region_analysis.sort_values('건수', ascending=False)
-            
-            # 지역별 건수 맵
-            fig = px.bar(
-                x=region_analysis.index,
-                y=region_analysis['건수'],
-                title="지역별 AS 건수",
-                color=region_analysis['건수'],
-                color_continuous_scale='Blues'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            # 지역별 분석
+            if '지역' in filtered_df.columns:
+                st.write("**🗺️ 지역별 AS 현황**")
+            
+                region_analysis = cached_table('region_summary')
+            
+                # 지역별 건수 맵
+                def build_figure():
+                    fig = px.bar(
+                        x=region_analysis.index,
+                        y=region_analysis['건수'],
+                        title="지역별 AS 건수",
+                        color=region_analysis['건수'],
+                        color_continuous_scale='Blues'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                fig = cached_figure(('지역별 건수', region_analysis), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.dataframe(
-                region_analysis.style.format({
-                    '수리비': '{:,.0f}원',
-                    '평균수리비': '{:,.0f}원'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("지역 정보가 없습니다.")
+                tables.show_table(region_analysis, 'table_region_summary', {
+                    '수리비': tables.WON,
+                    '평균수리비': tables.WON
+                }, container=st)
+            else:
+                st.info("지역 정보가 없습니다.")
     
-    with col2:
-        # 업체별 상세 분석
-        if '현장명' in filtered_df.columns:
-            st.write("**🏢 주요 업체별 AS 현황**")
-            
-            client_analysis = filtered_df.groupby('현장명').agg({
-                '관리번호': 'count',
-                '수리비': 'sum',
-                '관리번호': lambda x: x.nunique()  # 수리한 장비 수
-            })
-            client_analysis.columns = ['건수', '총수리비', '수리장비수']
-            client_analysis['건당평균수리비'] = (client_analysis['총수리비'] / client_analysis['건수']).round(0)
-            
-            # 수리비 기준 상위 10개 업체
-            top_clients = client_analysis.nlargest(10, '총수리비')
-            
-            fig = px.bar(
-                x=top_clients['총수리비'],
-                y=top_clients.index,
-                orientation='h',
-                title="수리비 상위 10개 업체",
-                color=top_clients['총수리비'],
-                color_continuous_scale='Reds'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            # 업체별 상세 분석
+            if '현장명' in filtered_df.columns:
+                st.write("**🏢 주요 업체별 AS 현황**")
+            
+                # 수리비 기준 상위 10개 업체
+                top_clients = cached_table('client_summary', top_n=10)
+            
+                def build_figure():
+                    fig = px.bar(
+                        x=top_clients['총수리비'],
+                        y=top_clients.index,
+                        orientation='h',
+                        title="수리비 상위 10개 업체",
+                        color=top_clients['총수리비'],
+                        color_continuous_scale='Reds'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                fig = cached_figure(('업체별 수리비', top_clients), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.dataframe(
-                top_clients.style.format({
-                    '총수리비': '{:,.0f}원',
-                    '건당평균수리비': '{:,.0f}원'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("업체 정보가 없습니다.")
+                tables.show_table(top_clients, 'table_client_summary', {
+                    '총수리비': tables.WON,
+                    '건당평균수리비': tables.WON
+                }, container=st)
+            else:
+                st.info("업체 정보가 없습니다.")
 
-# 탭 5: 장비별 분석
-with tab5:
-    st.subheader("🚛 장비별 상세 분석")
+        # 전체 업체 목록 (켠 경우에만 집계/표시, 행이 많으면 서버에서 정렬 후 페이지 단위로 표시)
+        if '현장명' in filtered_df.columns:
+            if st.toggle("📋 전체 업체 목록", key='show_client_all_04'):
+                tables.show_table(cached_table('client_summary', top_n=None), 'table_client_all', {
+                    '총수리비': tables.WON,
+                    '건당평균수리비': tables.WON
+                }, cache_key=(version, filter_state, 'client_summary'), container=st)
+
+# 구역 5: 장비별 분석
+if selected_section == SECTIONS[4]:
+    with profiler.section("장비별"):
+        st.subheader("🚛 장비별 상세 분석")
     
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
     
-    with col1:
-        # 제조사별 분석
-        if '브랜드' in filtered_df.columns:
-            st.write("**🏭 제조사별 건수 및 비율**")
-            
-            brand_analysis = filtered_df.groupby('브랜드').agg({
-                '관리번호': 'count',
-                '수리비': 'sum'
-            }).rename(columns={'관리번호': '건수'})
-            
-            brand_analysis['비율(%)'] = (brand_analysis['건수'] / brand_analysis['건수'].sum() * 100).round(1)
-            brand_analysis['평균수리비'] = (brand_analysis['수리비'] / brand_analysis['건수']).round(0)
-            brand_analysis = brand_analysis.sort_values('건수', ascending=False)
-            
-            # 제조사별 파이 차트
-            fig = px.pie(
-                values=brand_analysis['건수'],
-                names=brand_analysis.index,
-                title="제조사별 AS 건수 비율"
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        with col1:
+            # 제조사별 분석
+            if '브랜드' in filtered_df.columns:
+                st.write("**🏭 제조사별 건수 및 비율**")
+            
+                brand_analysis = cached_table('brand_summary')
+            
+                # 제조사별 파이 차트
+                def build_figure():
+                    fig = px.pie(
+                        values=brand_analysis['건수'],
+                        names=brand_analysis.index,
+                        title="제조사별 AS 건수 비율"
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                fig = cached_figure(('제조사별 건수', brand_analysis), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.dataframe(
-                brand_analysis.style.format({
-                    '수리비': '{:,.0f}원',
-                    '평균수리비': '{:,.0f}원',
-                    '비율(%)': '{:.1f}%'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("브랜드 정보가 없습니다.")
+                tables.show_table(brand_analysis, 'table_brand_summary', {
+                    '수리비': tables.WON,
+                    '평균수리비': tables.WON,
+                    '비율(%)': tables.PERCENT
+                }, container=st)
+            else:
+                st.info("브랜드 정보가 없습니다.")
     
-    with col2:
-        # 도입연도별 분석
-        if '제조년도' in filtered_df.columns:
-            st.write("**📅 도입연도별 AS 현황**")
-            
-            # 연식 구간별 분석
-            current_year = pd.Timestamp.now().year
-            filtered_df['장비연식'] = current_year - pd.to_numeric(filtered_df['제조년도'], errors='coerce')
-            
-            age_bins = [0, 5, 10, 15, 20, float('inf')]
-            age_labels = ['0-5년', '6-10년', '11-15년', '16-20년', '20년+']
-            
-            filtered_df['연식구간'] = pd.cut(filtered_df['장비연식'], bins=age_bins, labels=age_labels)
-            
-            age_analysis = filtered_df.groupby('연식구간').agg({
-                '관리번호': 'count',
-                '수리비': 'mean'
-            }).rename(columns={'관리번호': '건수', '수리비': '평균수리비'})
-            
-            # 연식별 AS 건수 차트
-            fig = px.bar(
-                x=age_analysis.index,
-                y=age_analysis['건수'],
-                title="장비 연식별 AS 건수",
-                color=age_analysis['건수'],
-                color_continuous_scale='Oranges'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            # 도입연도별 분석
+            if '제조년도' in filtered_df.columns:
+                st.write("**📅 도입연도별 AS 현황**")
+            
+                # 연식 구간별 분석
+                age_analysis = cached_table('age_summary')
+            
+                # 연식별 AS 건수 차트
+                def build_figure():
+                    fig = px.bar(
+                        x=age_analysis.index,
+                        y=age_analysis['건수'],
+                        title="장비 연식별 AS 건수",
+                        color=age_analysis['건수'],
+                        color_continuous_scale='Oranges'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                fig = cached_figure(('연식별 건수', age_analysis), build_figure)
+                st.plotly_chart(fig, use_container_width=True)
             
-            st.dataframe(
-                age_analysis.style.format({
-                    '평균수리비': '{:,.0f}원'
-                }),
-                use_container_width=True
-            )
-        else:
-            st.info("제조년도 정보가 없습니다.")
-
-# 탭 6: 수리비 분석
-with tab6:
-    st.subheader("💰 수리비 상세 분석")
+                tables.show_table(age_analysis, 'table_age_summary', {
+                    '평균수리비': tables.WON
+                }, container=st)
+            else:
+                st.info("제조년도 정보가 없습니다.")
+
+        # 보유 대수 대비 (자산조회 기준 모수 인덱스와 관리번호로 연결, 켠 경우에만 집계/표시)
+        fleet = get_fleet_index()
+        if fleet is not None:
+            if st.toggle("🚛 보유 대수 대비 AS (자산조회 기준)", key='show_fleet_04'):
+                st.caption("보유 대수는 장비 구분 필터와 관계없이 자산조회 데이터 전체 기준입니다.")
+                col1, col2 = st.columns(2)
+                for column, dimension in [(col1, '브랜드'), (col2, '연식구간')]:
+                    fleet_rates = compute_fleet_rates(version, fleet.version, filter_state, dimension, filtered_df)
+                    tables.show_table(fleet_rates[fleet_rates['AS건수'] > 0], f'table_fleet_{dimension}', {
+                        '보유대수': ('대', 'localized', 0),
+                        'AS건수': tables.COUNT,
+                        '수리비': tables.WON,
+                        '대당AS건수': ('건', '%.3f', 3),
+                        '대당수리비': tables.WON,
+                        'AS발생률(%)': tables.PERCENT,
+                    }, container=column)
+
+# 구역 6: 수리비 분석
+if selected_section == SECTIONS[5]:
+    with profiler.section("수리비분석"):
+        st.subheader("💰 수리비 상세 분석")
     
-    if '수리비' in filtered_df.columns:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 수리비 구간별 분석
-            st.write("**💵 수리비 구간별 분포**")
-            
-            cost_bins = [0, 100000, 500000, 1000000, 2000000, float('inf')]
-            cost_labels = ['10만원 이하', '10-50만원', '50-100만원', '100-200만원', '200만원+']
-            
-            filtered_df['수리비구간'] = pd.cut(filtered_df['수리비'], bins=cost_bins, labels=cost_labels)
-            
-            cost_distribution = filtered_df['수리비구간'].value_counts()
-            
-            fig = px.bar(
-                x=cost_distribution.index,
-                y=cost_distribution.values,
-                title="수리비 구간별 건수 분포",
-                color=cost_distribution.values,
-                color_continuous_scale='Reds'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # 통계 정보
-            st.write("**📊 수리비 통계**")
-            st.write(f"• 평균: {filtered_df['수리비'].mean():,.0f}원")
-            st.write(f"• 중앙값: {filtered_df['수리비'].median():,.0f}원")
-            st.write(f"• 최소값: {filtered_df['수리비'].min():,.0f}원")
-            st.write(f"• 최대값: {filtered_df['수리비'].max():,.0f}원")
-            st.write(f"• 표준편차: {filtered_df['수리비'].std():,.0f}원")
+        if '수리비' in filtered_df.columns:
+            col1, col2 = st.columns(2)
         
-        with col2:
-            # 고액 수리 케이스 분석
-            st.write("**🚨 고액 수리 케이스 분석**")
-            
-            # 상위 10% 고액 케이스
-            high_cost_threshold = filtered_df['수리비'].quantile(0.9)
-            high_cost_cases = filtered_df[filtered_df['수리비'] >= high_cost_threshold]
-            
-            if not high_cost_cases.empty:
-                high_cost_analysis = high_cost_cases.groupby('작업유형').agg({
-                    '관리번호': 'count',
-                    '수리비': ['mean', 'max']
-                })
-                high_cost_analysis.columns = ['건수', '평균수리비', '최대수리비']
-                high_cost_analysis = high_cost_analysis.sort_values('평균수리비', ascending=False)
-                
-                fig = px.bar(
-                    x=high_cost_analysis.index,
-                    y=high_cost_analysis['평균수리비'],
-                    title=f"고액 수리 케이스 작업유형별 분석 (상위 10%)",
-                    color=high_cost_analysis['평균수리비'],
-                    color_continuous_scale='Reds'
-                )
-                fig.update_layout(height=400)
+            with col1:
+                # 수리비 구간별 분석
+                st.write("**💵 수리비 구간별 분포**")
+            
+                cost_distribution = cached_table('cost_distribution')
+            
+                def build_figure():
+                    fig = px.bar(
+                        x=cost_distribution.index,
+                        y=cost_distribution.values,
+                        title="수리비 구간별 건수 분포",
+                        color=cost_distribution.values,
+                        color_continuous_scale='Reds'
+                    )
+                    fig.update_layout(height=400)
+                    return fig
+                fig = cached_figure(('수리비 구간', cost_distribution), build_figure)
                 st.plotly_chart(fig, use_container_width=True)
+            
+                # 통계 정보 (중앙값은 아래 분위수 표의 P50)
+                st.write("**📊 수리비 통계**")
+                cost_statistics = cached_table('cost_statistics')
+                for stat_name in ['평균', '최소값', '최대값', '표준편차']:
+                    st.write(f"• {stat_name}: {cost_statistics[stat_name]:,.0f}원")
+
+                # 수리비 분위수 (월별 스케치를 합친 근사값)
+                cost_percentiles = compute_percentiles(version, filter_state, '수리비')
+                if cost_percentiles is not None:
+                    st.write("**📐 수리비 분위수 (기간별)**")
+                    tables.show_table(cost_percentiles, 'table_cost_percentiles', {
+                        '건수': tables.COUNT,
+                        'P50': tables.WON,
+                        'P90': tables.WON,
+                        'P99': tables.WON,
+                    }, container=st)
+                    st.caption(f"월별 분위수 스케치를 합쳐 계산한 근사값입니다 (상대 오차 {RELATIVE_ACCURACY:.0%} 이내).")
+
+            with col2:
+                # 고액 수리 케이스 분석
+                st.write("**🚨 고액 수리 케이스 분석**")
+
+                # 상위 10% 고액 케이스 (기준 금액은 선택 월 스케치의 P90)
+                if cost_percentiles is not None and '선택 월' in cost_percentiles.index:
+                    high_cost_analysis = cached_table('high_cost_summary',
+                                                      threshold=float(cost_percentiles.loc['선택 월', 'P90']))
+                else:
+                    high_cost_analysis = cached_table('high_cost_summary', quantile=0.9)
+            
+                if high_cost_analysis is not None:
+                    def build_figure():
+                        fig = px.bar(
+                            x=high_cost_analysis.index,
+                            y=high_cost_analysis['평균수리비'],
+                            title=f"고액 수리 케이스 작업유형별 분석 (상위 10%)",
+                            color=high_cost_analysis['평균수리비'],
+                            color_continuous_scale='Reds'
+                        )
+                        fig.update_layout(height=400)
+                        return fig
+                    fig = cached_figure(('고액 수리', high_cost_analysis), build_figure)
+                    st.plotly_chart(fig, use_container_width=True)
                 
-                st.dataframe(
-                    high_cost_analysis.style.format({
-                        '평균수리비': '{:,.0f}원',
-                        '최대수리비': '{:,.0f}원'
-                    }),
-                    use_container_width=True
-                )
-            else:
-                st.info("고액 수리 케이스가 없습니다.")
-    else:
-        st.info("수리비 정보가 없습니다.")
+                    tables.show_table(high_cost_analysis, 'table_high_cost_summary', {
+                        '평균수리비': tables.WON,
+                        '최대수리비': tables.WON
+                    }, container=st)
+                else:
+                    st.info("고액 수리 케이스가 없습니다.")
+        else:
+            st.info("수리비 정보가 없습니다.")
 
 # 하단 - 월말 리포트 요약
-st.markdown("---")
-st.header("📋 월말 리포트 요약")
+if selected_section == SECTIONS[6]:
+    with profiler.section("리포트 요약"):
+        st.markdown("---")
+        st.header("📋 월말 리포트 요약")
 
-col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-with col1:
-    st.subheader("🎯 주요 성과 지표")
+        with col1:
+            st.subheader("🎯 주요 성과 지표")
     
-    # 주요 지표들을 카드 형태로 표시
-    metrics_data = [
-        ("총 AS 건수", f"{total_cases:,}건"),
-        ("총 수리비", f"{total_cost:,.0f}원"),
-        ("건당 평균 수리비", f"{avg_cost_per_case:,.0f}원"),
-        ("참여 정비자 수", f"{filtered_df['정비자'].nunique() if '정비자' in filtered_df.columns else 0}명"),
-        ("관련 업체 수", f"{unique_clients}개"),
-        ("수리 장비 수", f"{unique_equipment}대")
-    ]
+            # 주요 지표들을 카드 형태로 표시
+            metrics_data = [
+                ("총 AS 건수", f"{total_cases:,}건"),
+                ("총 수리비", f"{total_cost:,.0f}원"),
+                ("건당 평균 수리비", f"{avg_cost_per_case:,.0f}원"),
+                ("참여 정비자 수", f"{metrics['unique_workers']}명"),
+                ("관련 업체 수", f"{unique_clients}개"),
+                ("수리 장비 수", f"{unique_equipment}대")
+            ]
     
-    for metric, value in metrics_data:
-        st.write(f"• **{metric}**: {value}")
+            for metric, value in metrics_data:
+                st.write(f"• **{metric}**: {value}")
 
-with col2:
-    st.subheader("⚠️ 주의사항 및 개선점")
-    
-    recommendations = []
-    
-    # 자동 추천사항 생성
-    if '정비자소속' in filtered_df.columns:
-        part_costs = filtered_df.groupby('정비자소속')['수리비'].sum()
-        if len(part_costs) > 0:
-            top_cost_part = part_costs.idxmax()
-            top_cost_amount = part_costs.max()
-            recommendations.append(f"🔴 **{top_cost_part}** 파트의 수리비가 {top_cost_amount:,.0f}원으로 가장 높음")
-    
-    if '현장명' in filtered_df.columns:
-        client_costs = filtered_df.groupby('현장명')['수리비'].sum()
-        if len(client_costs) > 0:
-            top_cost_client = client_costs.idxmax()
-            top_cost_client_amount = client_costs.max()
-            if len(top_cost_client) > 20:
-                top_cost_client = top_cost_client[:20] + "..."
-            recommendations.append(f"🟡 **{top_cost_client}** 업체의 수리비가 {top_cost_client_amount:,.0f}원으로 높음")
-    
-    if avg_cost_per_case > 500000:
-        recommendations.append(f"🟠 건당 평균 수리비({avg_cost_per_case:,.0f}원)가 높은 편임")
+        with col2:
+            st.subheader("⚠️ 주의사항 및 개선점")
     
-    if not recommendations:
-        recommendations.append("✅ 특별한 주의사항 없음")
+            # 자동 추천사항 생성
+            recommendations = cached_table('recommendations', avg_cost_per_case)
     
-    for rec in recommendations:
-        st.write(f"• {rec}")
+            for rec in recommendations:
+                st.write(f"• {rec}")
 
 # 데이터 다운로드 기능
-st.markdown("---")
-st.subheader("📥 리포트 다운로드")
-
-col1, col2, col3 = st.columns(3)
+if selected_section == SECTIONS[7]:
+    with profiler.section("다운로드"):
+        st.markdown("---")
+        st.subheader("📥 리포트 다운로드")
 
-with col1:
-    # 필터링된 데이터 다운로드
-    csv_data = filtered_df.to_csv(index=False, encoding='utf-8-sig')
-    st.download_button(
-        label="📄 상세 데이터 다운로드 (CSV)",
-        data=csv_data,
-        file_name=f"{selected_year}년{selected_month}월_AS상세데이터.csv",
-        mime="text/csv"
-    )
+        # 다운로드 파일은 '파일 생성'을 눌렀을 때만 만들고, 같은 조건이면 다시 만들지 않음
+        export_targets = {"📄 상세 데이터": ('detail', "AS상세데이터")}
+        if '정비자소속' in filtered_df.columns:
+            export_targets["📊 파트별 요약"] = ('part', "파트별요약")
+        if '현장명' in filtered_df.columns:
+            export_targets["🏢 업체별 요약"] = ('client', "업체별요약")
+        export_targets["📑 전체 리포트 (표별 시트/파일)"] = ('report', "월별리포트")
+        export_formats = {"CSV": ('csv', "text/csv"),
+                          "Excel": ('xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+                          "Parquet": ('parquet', "application/octet-stream")}
 
-with col2:
-    # 요약 리포트 다운로드 (파트별)
-    if '정비자소속' in filtered_df.columns:
-        summary_data = filtered_df.groupby('정비자소속').agg({
-            '관리번호': 'count',
-            '수리비': 'sum',
-            '현장명': 'nunique'
-        }).rename(columns={'관리번호': '건수', '현장명': '업체수'})
-        
-        summary_csv = summary_data.to_csv(encoding='utf-8-sig')
-        st.download_button(
-            label="📊 파트별 요약 (CSV)",
-            data=summary_csv,
-            file_name=f"{selected_year}년{selected_month}월_파트별요약.csv",
-            mime="text/csv"
-        )
+        col1, col2 = st.columns(2)
+        with col1:
+            target_label = st.selectbox("다운로드 항목", list(export_targets))
+        with col2:
+            format_label = st.radio("파일 형식", list(export_formats), horizontal=True)
+
+        target, file_stem = export_targets[target_label]
+        file_format, mime = export_formats[format_label]
+        export_key = (version, filter_state, target, file_format)
+
+        if file_format == 'xlsx' and target == 'detail' and len(filtered_df) >= EXCEL_MAX_ROWS:
+            st.caption(f"엑셀 시트 한 장에 {EXCEL_MAX_ROWS - 1:,}행까지만 들어가므로 상세 데이터를 여러 시트로 나눠 저장합니다.")
+
+        if st.button("파일 생성", type="primary"):
+            with st.spinner("다운로드 파일 생성 중..."):
+                build_export(version, filter_state, target, file_format, filtered_df)
+            st.session_state.export_04 = export_key
+
+        if st.session_state.get('export_04') == export_key:
+            # 여러 표를 CSV/Parquet로 받으면 표별 파일을 zip으로 묶음
+            extension = 'zip' if target == 'report' and file_format != 'xlsx' else file_format
+            st.download_button(
+                label=f"{target_label} 다운로드 ({format_label})",
+                data=build_export(version, filter_state, target, file_format, filtered_df),
+                file_name=f"{selected_year}년{selected_month}월_{file_stem}.{extension}",
+                mime="application/zip" if extension == 'zip' else mime
+            )
 
-with col3:
-    # 업체별 리포트 다운로드
-    if '현장명' in filtered_df.columns:
-        client_summary = filtered_df.groupby('현장명').agg({
-            '관리번호': 'count',
-            '수리비': 'sum',
-            '지역': 'first' if '지역' in filtered_df.columns else lambda x: ''
-        }).rename(columns={'관리번호': '건수'})
-        
-        client_csv = client_summary.to_csv(encoding='utf-8-sig')
-        st.download_button(
-            label="🏢 업체별 요약 (CSV)",
-            data=client_csv,
-            file_name=f"{selected_year}년{selected_month}월_업체별요약.csv",
-            mime="text/csv"
-        )
\ No newline at end of file
+# 렌더링 시간 측정 결과
+profiler.render()
@@ -0,0 +1,133 @@
+# 5. 정비 예측
+# pages/05_정비_예측.py
+
+import streamlit as st
+import pandas as pd
+from utils.lazy_import import lazy_module
+from utils.data_processing import dataset_version
+from utils.figure_cache import cached_figure
+from utils.prediction import IntervalModel
+from utils import tables
+
+# 차트 라이브러리는 캐시에 없는 차트를 만들 때 불러옴
+px = lazy_module("plotly.express")
+
+st.set_page_config(page_title="정비 예측", layout="wide")
+st.title("🔮 정비 예측 - 장비별 다음 정비 위험도")
+
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+if '재정비간격' not in df.columns or df['정비일자'].notna().sum() == 0:
+    st.warning("재정비간격 정보가 없어 예측할 수 없습니다.")
+    st.stop()
+
+# 재정비간격 분포 모델 (데이터 버전, 기준일마다 한 번 적합)
+@st.cache_resource(max_entries=4, show_spinner="재정비간격 분포 적합 중...")
+def load_interval_model(version, as_of, _df):
+    return IntervalModel(_df, as_of=as_of)
+
+# 장비 전체 위험도 (모델과 예측 기간별로 한 번 계산)
+@st.cache_data(max_entries=16, show_spinner=False)
+def score_fleet(version, as_of, horizon_days, _model):
+    return _model.score(horizon_days)
+
+# 사이드바 - 예측 조건
+st.sidebar.header("🔮 예측 조건 설정")
+latest_date = df['정비일자'].max().date()
+as_of = st.sidebar.date_input("기준일", value=latest_date, max_value=latest_date,
+                              help="이 날짜까지의 정비 이력으로 예측합니다. 기본값은 데이터의 마지막 정비일자입니다.")
+horizon_days = st.sidebar.slider("예측 기간 (일)", min_value=7, max_value=180, value=30, step=7)
+
+model = load_interval_model(version, pd.Timestamp(as_of), df)
+risk_list = score_fleet(version, pd.Timestamp(as_of), horizon_days, model)
+
+if risk_list.empty:
+    st.info("기준일 이전의 정비 이력이 없습니다.")
+    st.stop()
+
+# 상단 지표
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("🚛 예측 대상 장비", f"{len(risk_list):,}대")
+with col2:
+    st.metric("🔴 우선순위 높음", f"{(risk_list['우선순위'] == '높음').sum():,}대")
+with col3:
+    st.metric(f"📈 {horizon_days}일 내 예상 정비 건수", f"{risk_list['위험도'].sum():,.0f}건")
+with col4:
+    st.metric("⏱️ 재정비간격 중앙값", f"{model.params['중앙값(일)'].median():,.0f}일")
+
+st.caption(f"위험도: {as_of} 이후 {horizon_days}일 안에 정비가 발생할 확률 (마지막 정비 후 경과일수 기준). "
+           f"재정비간격은 브랜드_모델별 Weibull 분포로 추정하며, 이력이 적은 모델은 브랜드 또는 전체 분포를 사용합니다.")
+
+st.markdown("---")
+
+# 위험도 순위
+st.header("🚨 정비 우선순위 (위험도 순)")
+
+priorities = st.multiselect("우선순위", ["높음", "중간", "낮음"], default=["높음", "중간", "낮음"], key="priority_05")
+columns = [column for column in ['관리번호', '브랜드_모델', '현장명', '최근정비일자', '경과일수', '정비횟수',
+                                 '평균재정비간격', '위험도', '예상다음정비일', '예상고장유형', '우선순위', '적용분포']
+           if column in risk_list.columns]
+ranked = risk_list.loc[risk_list['우선순위'].isin(priorities), columns]
+ranked = ranked.assign(위험도=ranked['위험도'] * 100)
+
+tables.show_table(ranked, 'table_risk_05', {
+    '위험도': tables.PERCENT,
+    '평균재정비간격': ('일', '%.0f', 0),
+    '경과일수': ('일', '%d', 0),
+}, cache_key=(version, str(as_of), horizon_days, tuple(priorities)), hide_index=True)
+
+# 모델별 예상 정비 건수
+st.markdown("---")
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("🚛 모델별 예상 정비 건수")
+    if '브랜드_모델' in risk_list.columns:
+        expected = (risk_list.groupby('브랜드_모델')['위험도'].agg(['sum', 'count'])
+                    .rename(columns={'sum': '예상정비건수', 'count': '장비수'})
+                    .nlargest(15, '예상정비건수'))
+
+        def build_figure():
+            fig = px.bar(
+                x=expected['예상정비건수'],
+                y=expected.index,
+                orientation='h',
+                title=f"{horizon_days}일 내 예상 정비 건수 상위 15개 모델",
+                color=expected['예상정비건수'],
+                color_continuous_scale='Oranges'
+            )
+            fig.update_layout(height=450, yaxis={'categoryorder': 'total ascending'},
+                              xaxis_title="예상 정비 건수", yaxis_title="브랜드_모델")
+            return fig
+        fig = cached_figure(('모델별 예상 정비 건수', horizon_days, expected), build_figure)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("브랜드/모델 정보가 없습니다.")
+
+with col2:
+    st.subheader("🔧 예상 고장 유형")
+    if '예상고장유형' in risk_list.columns:
+        high_risk = risk_list[risk_list['우선순위'] != '낮음']
+        fault_counts = high_risk['예상고장유형'].value_counts().head(10)
+        if fault_counts.empty:
+            st.info("우선순위 중간 이상인 장비가 없습니다.")
+        else:
+            st.write("**우선순위 중간 이상 장비의 예상 고장 유형 Top 10**")
+            tables.show_table(fault_counts.rename('장비수').to_frame(), 'table_fault_05', {'장비수': ('대', '%d', 0)})
+    else:
+        st.info("고장유형 정보가 없습니다.")
+
+# 분포 모수
+with st.expander("📐 브랜드_모델별 재정비간격 분포"):
+    st.caption("형상 < 1: 정비 직후 재정비가 잦음 (초기 불량형), 형상 ≈ 1: 무작위 발생, 형상 > 1: 사용할수록 정비 가능성 증가 (마모형)")
+    tables.show_table(model.params.reset_index(), 'table_params_05', {
+        '형상': ('', '%.2f', 2),
+        '척도(일)': ('일', '%.0f', 0),
+        '중앙값(일)': ('일', '%.0f', 0),
+    }, cache_key=(version, str(as_of), 'params'), hide_index=True)
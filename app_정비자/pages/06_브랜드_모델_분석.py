@@ -0,0 +1,122 @@
+# 6. 브랜드/모델 분석
+# pages/06_브랜드_모델_분석.py
+
+import streamlit as st
+from utils.lazy_import import lazy_module
+from utils.data_processing import dataset_version, get_fleet_index
+from utils.figure_cache import cached_figure
+from utils import tables
+
+# 차트 라이브러리는 캐시에 없는 차트를 만들 때 불러옴
+px = lazy_module("plotly.express")
+
+st.set_page_config(page_title="브랜드/모델 분석", layout="wide")
+st.title("🏭 브랜드/모델 분석 - 보유 대수 대비 AS")
+
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+fleet = get_fleet_index()
+if fleet is None:
+    st.warning("자산조회 데이터 파일이 없어 보유 대수 기준 분석을 할 수 없습니다.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+# 기간/차원별 대당 지표 (보유 대수는 인덱스에서 바로 연결)
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_rates(version, fleet_version, year, dimension, _df):
+    if year != "전체":
+        _df = _df[_df['정비일자'].dt.year == year]
+    return fleet.rates(_df, dimension), len(_df), fleet.unmatched_cases(_df)
+
+# 사이드바 - 분석 조건
+st.sidebar.header("🏭 분석 조건 설정")
+dimension = st.sidebar.selectbox("분석 기준", fleet.dimensions, index=fleet.dimensions.index('브랜드_모델'))
+years = sorted(df['정비일자'].dropna().dt.year.unique(), reverse=True)
+year = st.sidebar.selectbox("분석 기간", ["전체"] + [int(y) for y in years],
+                            format_func=lambda y: y if y == "전체" else f"{y}년")
+min_fleet = st.sidebar.slider("최소 보유 대수", min_value=1, max_value=100, value=10,
+                              help="보유 대수가 적은 그룹은 한두 건의 AS로도 대당 지표가 크게 튀므로 제외합니다.")
+METRICS = {'대당AS건수': "대당 AS 건수", '대당수리비': "대당 수리비", 'AS발생률(%)': "AS 발생률 (%)"}
+metric = st.sidebar.radio("순위 지표", list(METRICS), format_func=METRICS.get)
+
+rates, total_cases, unmatched = compute_rates(version, fleet.version, year, dimension, df)
+shown = rates[rates['보유대수'] >= min_fleet]
+
+# 상단 지표 (전체 보유 장비 기준)
+fleet_size = fleet.size
+matched_cases = int(rates['AS건수'].sum())
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("🚛 보유 장비", f"{fleet_size:,}대")
+with col2:
+    st.metric("🔧 대당 AS 건수", f"{matched_cases / fleet_size:.2f}건")
+with col3:
+    st.metric("💰 대당 수리비", f"{rates['수리비'].sum() / fleet_size:,.0f}원")
+with col4:
+    st.metric("📈 AS 발생률", f"{rates['AS장비수'].sum() / fleet_size * 100:.1f}%")
+
+if unmatched:
+    st.caption(f"자산조회 데이터에 없는 장비의 AS {unmatched:,}건 (전체 {total_cases:,}건 중)은 보유 대수와 연결할 수 없어 제외했습니다.")
+
+st.markdown("---")
+
+if shown.empty:
+    st.info(f"보유 대수가 {min_fleet}대 이상인 {dimension} 그룹이 없습니다.")
+    st.stop()
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader(f"📊 {dimension}별 {METRICS[metric]} 상위 15")
+    ranked = shown.nlargest(15, metric)
+
+    def build_figure():
+        fig = px.bar(
+            x=ranked[metric],
+            y=ranked.index.astype(str),
+            orientation='h',
+            color=ranked[metric],
+            color_continuous_scale='Reds',
+            hover_data={'보유대수': ranked['보유대수'], 'AS건수': ranked['AS건수']}
+        )
+        fig.update_layout(height=500, yaxis={'categoryorder': 'total ascending'},
+                          xaxis_title=METRICS[metric], yaxis_title=dimension)
+        return fig
+    fig = cached_figure((f'{dimension}별 {metric}', ranked), build_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+with col2:
+    st.subheader("🔍 보유 대수 vs AS 건수")
+    st.caption("대각선(전체 평균 대당 AS 건수)보다 위에 있는 그룹은 보유 대수에 비해 AS가 많습니다.")
+    overall = matched_cases / fleet_size
+
+    def build_figure():
+        fig = px.scatter(
+            x=shown['보유대수'],
+            y=shown['AS건수'],
+            size=shown['수리비'].clip(lower=1),
+            hover_name=shown.index.astype(str),
+            log_x=True
+        )
+        line_x = [shown['보유대수'].min(), shown['보유대수'].max()]
+        fig.add_scatter(x=line_x, y=[x * overall for x in line_x], mode='lines',
+                        line={'dash': 'dash', 'color': 'gray'}, name='전체 평균')
+        fig.update_layout(height=500, xaxis_title="보유 대수", yaxis_title="AS 건수", showlegend=False)
+        return fig
+    fig = cached_figure((f'{dimension}별 보유 대수 vs AS', overall, shown), build_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+st.subheader(f"📋 {dimension}별 보유 대수 대비 AS")
+tables.show_table(shown.sort_values(metric, ascending=False), 'table_fleet_rates', {
+    '보유대수': ('대', 'localized', 0),
+    'AS건수': tables.COUNT,
+    'AS장비수': ('대', 'localized', 0),
+    '수리비': tables.WON,
+    '대당AS건수': ('건', '%.3f', 3),
+    '대당수리비': tables.WON,
+    'AS발생률(%)': tables.PERCENT,
+}, cache_key=(version, fleet.version, year, dimension, min_fleet, metric))
@@ -0,0 +1,112 @@
+# 7. 고장유형 분석
+# pages/07_고장유형_분석.py
+
+import streamlit as st
+import pandas as pd
+from utils.lazy_import import lazy_module
+from utils.data_processing import dataset_version
+from utils.figure_cache import cached_figure
+from utils.crosstab import SparseCrosstab, NORMALIZATIONS
+from utils import tables
+
+# 차트 라이브러리는 캐시에 없는 차트를 만들 때 불러옴
+px = lazy_module("plotly.express")
+
+st.set_page_config(page_title="고장유형 분석", layout="wide")
+st.title("🔧 고장유형 분석 - 브랜드/모델별 고장 히트맵")
+
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+ROW_OPTIONS = [column for column in ['브랜드_모델', '브랜드', '모델명', '연료', '운전방식', '현장명', '정비자소속']
+               if column in df.columns]
+COLUMN_OPTIONS = [column for column in ['고장유형', '작업유형', '정비대상', '정비작업'] if column in df.columns]
+
+if not ROW_OPTIONS or not COLUMN_OPTIONS:
+    st.warning("브랜드/모델 또는 고장유형 정보가 없습니다.")
+    st.stop()
+
+# 희소 교차표 (데이터 버전, 행/열 차원마다 한 번 생성)
+@st.cache_resource(max_entries=8, show_spinner="교차표 생성 중...")
+def load_crosstab(version, rows, columns, _df):
+    return SparseCrosstab(_df, rows, columns)
+
+# 사이드바 - 히트맵 조건
+st.sidebar.header("🔧 히트맵 조건 설정")
+rows = st.sidebar.selectbox("행 (장비/조직)", ROW_OPTIONS)
+columns = st.sidebar.selectbox("열 (고장 분류)", COLUMN_OPTIONS)
+
+crosstab = load_crosstab(version, rows, columns, df)
+values = list(crosstab.values)
+value = st.sidebar.radio("값", values, format_func=lambda v: "AS 건수" if v == '건수' else f"{v} 합계", horizontal=True)
+normalize = st.sidebar.selectbox("정규화", list(NORMALIZATIONS), format_func=NORMALIZATIONS.get,
+                                 help="행/열 비율과 기대 대비 배율은 히트맵에 표시되지 않은 행/열까지 포함한 전체 합계 기준입니다. "
+                                      "기대 대비 배율이 1보다 크면 그 조합이 행·열 전체 비중으로 예상되는 것보다 많이 발생한 것입니다.")
+k_rows = st.sidebar.slider("상위 행 수", min_value=1, max_value=max(min(60, crosstab.shape[0]), 2),
+                           value=max(min(20, crosstab.shape[0]), 1))
+k_columns = st.sidebar.slider("상위 열 수", min_value=1, max_value=max(min(60, crosstab.shape[1]), 2),
+                              value=max(min(20, crosstab.shape[1]), 1))
+cluster = st.sidebar.toggle("비슷한 패턴끼리 정렬", value=True,
+                            help="행/열을 고장 분포가 비슷한 순서로 재배치합니다 (계층적 군집). 끄면 합계 순입니다.")
+
+# 상단 지표
+n_rows, n_columns = crosstab.shape
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"{rows} 수", f"{n_rows:,}개")
+with col2:
+    st.metric(f"{columns} 수", f"{n_columns:,}개")
+with col3:
+    st.metric("조합 발생 비율", f"{crosstab.density * 100:.1f}%",
+              help="전체 행×열 조합 중 한 번 이상 발생한 조합의 비율")
+
+st.markdown("---")
+
+heatmap = crosstab.heatmap(k_rows, k_columns, value, normalize, cluster)
+
+if heatmap.empty:
+    st.info("표시할 데이터가 없습니다.")
+    st.stop()
+
+st.subheader(f"🗺️ {rows} × {columns} 히트맵 (상위 {len(heatmap)} × {len(heatmap.columns)})")
+label = NORMALIZATIONS[normalize] if normalize else ("AS 건수" if value == '건수' else f"{value} (원)")
+
+def build_figure():
+    fig = px.imshow(
+        heatmap,
+        color_continuous_scale='RdBu_r' if normalize == 'lift' else 'Reds',
+        color_continuous_midpoint=1.0 if normalize == 'lift' else None,
+        aspect='auto',
+        labels={'color': label}
+    )
+    fig.update_layout(height=max(400, 22 * len(heatmap) + 200), xaxis_title=columns, yaxis_title=rows)
+    fig.update_xaxes(tickangle=45)
+    return fig
+fig = cached_figure(('고장 히트맵', normalize, value, heatmap), build_figure)
+st.plotly_chart(fig, use_container_width=True)
+
+# 상위 고장 목록
+col1, col2 = st.columns(2)
+row_totals, column_totals, _ = crosstab.totals(value)
+formats = {'합계': tables.COUNT if value == '건수' else tables.WON, '비율(%)': tables.PERCENT}
+
+with col1:
+    st.subheader(f"📋 상위 {columns}")
+    top_columns = pd.DataFrame({'합계': column_totals}, index=pd.Index(crosstab.column_names, name=columns))
+    top_columns['비율(%)'] = top_columns['합계'] / max(column_totals.sum(), 1) * 100
+    tables.show_table(top_columns.sort_values('합계', ascending=False), 'table_fault_columns', formats,
+                      cache_key=(version, rows, columns, value, 'columns'))
+
+with col2:
+    st.subheader(f"📋 상위 {rows}")
+    top_rows = pd.DataFrame({'합계': row_totals}, index=pd.Index(crosstab.row_names, name=rows))
+    top_rows['비율(%)'] = top_rows['합계'] / max(row_totals.sum(), 1) * 100
+    tables.show_table(top_rows.sort_values('합계', ascending=False), 'table_fault_rows', formats,
+                      cache_key=(version, rows, columns, value, 'rows'))
+
+with st.expander("📋 히트맵 값 표"):
+    tables.show_table(heatmap, 'table_fault_heatmap')
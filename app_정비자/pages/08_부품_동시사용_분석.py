@@ -0,0 +1,108 @@
+# 8. 부품 동시사용 분석
+# pages/08_부품_동시사용_분석.py
+
+import streamlit as st
+import numpy as np
+from utils.data_processing import dataset_version
+from utils.baskets import PartBaskets, MIN_COUNT
+from utils import tables
+
+st.set_page_config(page_title="부품 동시사용 분석", layout="wide")
+st.title("🧩 부품 동시사용 분석")
+
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+part_pairs = st.session_state.get('part_pairs')
+if part_pairs is None or part_pairs.empty:
+    st.info("소모품 출고 데이터를 함께 업로드하면 정비 건별로 매칭된 부품의 동시사용 패턴을 분석할 수 있습니다.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+# 정비 건 × 자재 희소 행렬 (데이터 버전마다 한 번 생성)
+@st.cache_resource(max_entries=4, show_spinner="부품 발생 행렬 생성 중...")
+def load_baskets(version, _part_pairs, n_events):
+    return PartBaskets(_part_pairs, n_events)
+
+baskets = load_baskets(version, part_pairs, len(df))
+
+# 범위/조건별 결과 (같은 조건으로 돌아오면 다시 계산하지 않음)
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_parts(version, scope, group, min_count, min_confidence):
+    mask = None if scope == "전체" else (df[scope] == group).to_numpy()
+    summary = baskets.part_summary(mask)
+    rules = baskets.rules(mask, min_count=min_count, min_confidence=min_confidence / 100)
+    profile = None if scope == "전체" else baskets.group_profile(df[scope], group, min_count=min_count)
+    n_baskets = baskets.n_baskets if mask is None else int(np.count_nonzero(baskets.has_parts & mask))
+    return summary, rules, profile, n_baskets
+
+# 사이드바 - 분석 범위
+st.sidebar.header("🧩 분석 조건 설정")
+scopes = ["전체"] + [column for column in ['고장유형', '브랜드_모델', '작업유형', '정비대상'] if column in df.columns]
+scope = st.sidebar.selectbox("분석 범위", scopes)
+group = None
+if scope != "전체":
+    # 부품이 매칭된 정비 건이 많은 순
+    groups = df.loc[baskets.has_parts, scope].value_counts()
+    group = st.sidebar.selectbox(scope, groups.index, format_func=lambda g: f"{g} ({groups[g]:,}건)")
+min_count = st.sidebar.slider("최소 동시사용 건수", min_value=1, max_value=50, value=MIN_COUNT,
+                              help="이보다 적게 함께 쓰인 자재 쌍은 규칙에서 제외합니다.")
+min_confidence = st.sidebar.slider("최소 신뢰도 (%)", min_value=0, max_value=100, value=10, step=5)
+
+summary, rules, profile, n_baskets = compute_parts(version, scope, group, min_count, min_confidence)
+
+# 상단 지표
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("🔧 부품 매칭 정비 건", f"{n_baskets:,}건")
+with col2:
+    st.metric("📦 사용 자재 종류", f"{len(summary):,}개")
+with col3:
+    st.metric("🧮 건당 평균 자재 수", f"{summary['사용건수'].sum() / max(n_baskets, 1):.2f}개")
+with col4:
+    st.metric("🔗 연관 규칙 수", f"{len(rules):,}개")
+
+st.caption("지지도: 두 자재가 함께 쓰인 정비 건 비율 · 신뢰도: 선행부품을 쓴 정비 건 중 후행부품도 쓴 비율 · "
+           "향상도: 신뢰도 ÷ 후행부품의 전체 사용 비율 (1보다 크면 함께 쓰이는 경향)")
+
+st.markdown("---")
+
+st.subheader("🔗 함께 쓰이는 자재 (연관 규칙)")
+if rules.empty:
+    st.info("조건을 만족하는 자재 쌍이 없습니다. 최소 동시사용 건수나 최소 신뢰도를 낮춰 보세요.")
+else:
+    tables.show_table(rules, 'table_part_rules', {
+        '동시건수': tables.COUNT,
+        '지지도(%)': tables.PERCENT,
+        '신뢰도(%)': tables.PERCENT,
+        '향상도': ('배', '%.2f', 2),
+    }, cache_key=(version, scope, group, min_count, min_confidence, 'rules'), hide_index=True)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("📦 자재별 사용 현황")
+    tables.show_table(summary, 'table_part_summary', {
+        '사용건수': tables.COUNT,
+        '출고금액': tables.WON,
+        '사용비율(%)': tables.PERCENT,
+    }, cache_key=(version, scope, group, 'summary'), container=st)
+
+with col2:
+    if profile is not None:
+        st.subheader(f"🎯 {group}에서 특히 많이 쓰이는 자재")
+        st.caption("향상도: 이 그룹의 사용 비율 ÷ 전체 정비 건의 사용 비율")
+        if profile.empty:
+            st.info(f"{min_count}건 이상 사용된 자재가 없습니다.")
+        else:
+            tables.show_table(profile, 'table_part_profile', {
+                '사용건수': tables.COUNT,
+                '사용비율(%)': tables.PERCENT,
+                '전체비율(%)': tables.PERCENT,
+                '향상도': ('배', '%.2f', 2),
+            }, cache_key=(version, scope, group, min_count, 'profile'), container=st)
+    else:
+        st.info("사이드바에서 고장유형이나 모델을 선택하면 그 그룹에서 특히 많이 쓰이는 자재를 볼 수 있습니다.")
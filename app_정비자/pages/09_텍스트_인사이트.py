@@ -0,0 +1,146 @@
+# 9. 텍스트 인사이트
+# pages/09_텍스트_인사이트.py
+
+import io
+
+import streamlit as st
+from utils.lazy_import import lazy_module
+from utils.data_processing import dataset_version
+from utils.figure_cache import cached_figure
+from utils.text_analysis import TextIndex, TokenCache, TEXT_COLUMNS
+from utils.visualization import resolve_korean_font
+from utils import tables
+
+# 차트 라이브러리는 캐시에 없는 차트를 만들 때 불러옴
+px = lazy_module("plotly.express")
+
+st.set_page_config(page_title="텍스트 인사이트", layout="wide")
+st.title("📝 텍스트 인사이트 - 정비 기록 키워드 분석")
+
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+text_columns = [column for column in TEXT_COLUMNS if column in df.columns]
+group_columns = [column for column in ['고장유형', '브랜드', '브랜드_모델', '작업유형', '정비대상', '정비자소속']
+                 if column in df.columns]
+if not text_columns:
+    st.warning("분석할 텍스트 컬럼(정비내용/고장내용/사용부품)이 없습니다.")
+    st.stop()
+
+# 형태소 분석 캐시 (프로세스당 하나, 파일은 서버 재시작 후에도 유지)
+@st.cache_resource
+def get_token_cache():
+    return TokenCache()
+
+# 컬럼별 (고유 문자열 × 단어) 행렬 (데이터 버전마다 한 번, 캐시에 없는 문자열만 작업 프로세스에서 분석)
+@st.cache_resource(max_entries=8, show_spinner="형태소 분석 중... (처음 보는 문장만 분석합니다)")
+def load_text_index(version, column, _df):
+    return TextIndex(_df, column, cache=get_token_cache())
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_tfidf(version, column, group_column, top):
+    return load_text_index(version, column, df).group_tfidf(df[group_column], top=top)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_wordcloud(frequencies, font_path):
+    """단어 빈도 → 워드클라우드 PNG"""
+    from wordcloud import WordCloud
+    image = WordCloud(font_path=font_path, width=800, height=400, background_color='white',
+                      colormap='Reds').generate_from_frequencies(dict(frequencies)).to_image()
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+# 사이드바 - 분석 조건
+st.sidebar.header("📝 분석 조건 설정")
+column = st.sidebar.selectbox("텍스트 컬럼", text_columns)
+top_n = st.sidebar.slider("표시할 키워드 수", min_value=5, max_value=50, value=20, step=5)
+
+try:
+    text_index = load_text_index(version, column, df)
+except ImportError:
+    st.error("형태소 분석기(kiwipiepy)가 설치되어 있지 않습니다. requirements.txt의 패키지를 설치해주세요.")
+    st.stop()
+except Exception as e:
+    st.error(f"형태소 분석 중 오류 발생: {e}")
+    st.stop()
+
+keywords = text_index.keyword_counts()
+
+# 상단 지표
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("📄 기록 건수", f"{int((text_index.codes >= 0).sum()):,}건")
+with col2:
+    st.metric("🔁 고유 문장 수", f"{text_index.n_unique:,}개")
+with col3:
+    st.metric("🔤 단어 수", f"{len(keywords):,}개")
+with col4:
+    st.metric("⚙️ 새로 분석한 문장", f"{text_index.tokenized:,}개",
+              help="처음 보는 문장만 형태소 분석하고, 결과는 캐시에 저장해 다음부터 재사용합니다.")
+
+st.markdown("---")
+
+if keywords.empty:
+    st.info("추출된 키워드가 없습니다.")
+    st.stop()
+
+# 전체 키워드 빈도
+st.subheader(f"🔑 {column} 상위 키워드")
+top_keywords = keywords.head(top_n)
+
+def build_figure():
+    fig = px.bar(
+        x=top_keywords['출현횟수'],
+        y=top_keywords.index,
+        orientation='h',
+        color=top_keywords['출현횟수'],
+        color_continuous_scale='Blues'
+    )
+    fig.update_layout(height=max(400, 22 * len(top_keywords) + 100), yaxis={'categoryorder': 'total ascending'},
+                      xaxis_title="출현 횟수", yaxis_title="키워드")
+    return fig
+fig = cached_figure((f'{column} 키워드', top_keywords), build_figure)
+st.plotly_chart(fig, use_container_width=True)
+
+# 그룹별 특징 키워드
+if group_columns:
+    st.markdown("---")
+    st.subheader("🏷️ 그룹별 특징 키워드 (TF-IDF)")
+    st.caption("TF-IDF: 그룹 안에서 자주 나오면서 다른 그룹에는 잘 나오지 않는 단어일수록 높습니다.")
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        group_column = st.selectbox("그룹 기준", group_columns, key='text_group_column')
+    tfidf = compute_tfidf(version, column, group_column, top_n)
+    with col2:
+        groups = df[group_column].value_counts()
+        groups = groups[groups.index.isin(tfidf['그룹'].unique())]
+        group = st.selectbox(group_column, groups.index, format_func=lambda g: f"{g} ({groups[g]:,}건)",
+                             key=f'text_group_{group_column}') if not groups.empty else None
+
+    if group is not None:
+        selected = tfidf[tfidf['그룹'] == group].drop(columns='그룹').set_index('순위')
+        col1, col2 = st.columns(2)
+        with col1:
+            tables.show_table(selected, 'table_text_group', {
+                '출현횟수': ('회', 'localized', 0),
+                'TF-IDF': ('', '%.3f', 3),
+            }, container=st)
+        with col2:
+            _, font_path = resolve_korean_font()
+            if font_path:
+                frequencies = tuple(zip(selected['단어'], selected['TF-IDF']))
+                st.image(render_wordcloud(frequencies, font_path), use_container_width=True)
+            else:
+                st.caption("한글 폰트 파일을 찾지 못해 워드클라우드를 표시하지 않습니다.")
+
+    with st.expander(f"📋 전체 {group_column}별 특징 키워드"):
+        tables.show_table(tfidf, 'table_text_tfidf', {
+            '출현횟수': ('회', 'localized', 0),
+            'TF-IDF': ('', '%.3f', 3),
+        }, cache_key=(version, column, group_column, top_n), hide_index=True)
@@ -0,0 +1,117 @@
+# 10. 지역 지도
+# pages/10_지역_지도.py
+
+import os
+
+import numpy as np
+import streamlit as st
+from utils.lazy_import import lazy_module
+from utils.data_processing import dataset_version
+from utils.geocode import RegionIndex, CENTROID_PATH, cluster_markers, unresolved_addresses
+from utils import tables
+
+# 지도 라이브러리는 지도를 그릴 때 불러옴
+folium = lazy_module("folium")
+streamlit_folium = lazy_module("streamlit_folium")
+
+st.set_page_config(page_title="지역 지도", layout="wide")
+st.title("🗺️ 지역 지도 - 시군구별 AS 현황")
+
+if 'df_maintenance' not in st.session_state:
+    st.warning("데이터를 먼저 업로드해주세요.")
+    st.stop()
+
+if not os.path.exists(CENTROID_PATH):
+    st.warning(f"시군구 좌표 파일(`{CENTROID_PATH}`)이 없어 지도를 표시할 수 없습니다.")
+    st.stop()
+
+df = st.session_state.df_maintenance
+version = dataset_version(df)
+
+if '주소' not in df.columns or df['주소'].notna().sum() == 0:
+    st.info("주소가 확인된 정비 건이 없습니다. 현장 컬럼이 '시도 시군구 ...' 형식인 건만 지도에 표시됩니다.")
+    st.stop()
+
+# 좌표표 트라이 (파일이 바뀔 때만 다시 생성)
+@st.cache_resource
+def load_region_index(path, modified):
+    return RegionIndex.from_csv(path)
+
+region_index = load_region_index(CENTROID_PATH, os.path.getmtime(CENTROID_PATH))
+
+# 기간/단위별 지역 집계 (고유 주소마다 한 번만 좌표를 찾음)
+@st.cache_data(max_entries=32, show_spinner="지역별 집계 중...")
+def compute_regions(version, centroid_version, year, level, _df):
+    if year != "전체":
+        _df = _df[_df['정비일자'].dt.year == year]
+    return region_index.summarize(_df, level), int(_df['주소'].notna().sum()), unresolved_addresses(_df, region_index)
+
+# 사이드바 - 표시 조건
+st.sidebar.header("🗺️ 표시 조건 설정")
+years = sorted(df['정비일자'].dropna().dt.year.unique(), reverse=True)
+year = st.sidebar.selectbox("분석 기간", ["전체"] + [int(y) for y in years],
+                            format_func=lambda y: y if y == "전체" else f"{y}년")
+level = st.sidebar.radio("집계 단위", ["시군구", "시도"], horizontal=True)
+METRICS = {'건수': "AS 건수", '수리비': "수리비"}
+metric = st.sidebar.radio("원 크기 기준", list(METRICS), format_func=METRICS.get)
+cell_km = st.sidebar.slider("가까운 지역 묶기 (km)", min_value=0, max_value=50, value=0, step=5,
+                            help="이 거리 격자 안에 있는 지역을 하나의 원으로 묶어 표시합니다. 0이면 묶지 않습니다.")
+
+summary, address_cases, unresolved = compute_regions(version, os.path.getmtime(CENTROID_PATH), year, level, df)
+markers = cluster_markers(summary, cell_km)
+
+# 상단 지표
+matched_cases = int(summary['건수'].sum())
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("📍 주소 확인 건수", f"{address_cases:,}건")
+with col2:
+    st.metric("🎯 좌표 매칭률", f"{matched_cases / max(address_cases, 1) * 100:.1f}%")
+with col3:
+    st.metric(f"🏙️ {level} 수", f"{len(summary):,}곳")
+with col4:
+    st.metric("💰 총 수리비", f"{summary['수리비'].sum():,.0f}원")
+
+st.caption("좌표는 시군구(또는 시도) 대표 지점입니다. 같은 시군구의 현장은 하나의 원으로 합쳐 표시합니다.")
+
+# 지도 (원 면적이 지표에 비례)
+if markers.empty:
+    st.info("지도에 표시할 지역이 없습니다.")
+else:
+    values = markers[metric].to_numpy(dtype=float)
+    radius = 4 + 26 * np.sqrt(values / max(values.max(), 1))
+    center = (np.average(markers['위도'], weights=markers['건수'] + 1),
+              np.average(markers['경도'], weights=markers['건수'] + 1))
+    region_map = folium.Map(location=center, zoom_start=7, tiles="cartodbpositron")
+    for row, size in zip(markers.itertuples(index=False), radius):
+        label = f"{row.이름}<br>AS {row.건수:,}건 · 수리비 {row.수리비:,.0f}원"
+        folium.CircleMarker(
+            location=(row.위도, row.경도),
+            radius=float(size),
+            color="#c0392b",
+            weight=1,
+            fill=True,
+            fill_opacity=0.5,
+            tooltip=label,
+            popup=folium.Popup(f"{label}<br>{row.포함지역}", max_width=300) if row.지역수 > 1 else None,
+        ).add_to(region_map)
+    streamlit_folium.st_folium(region_map, key='region_map', height=600, use_container_width=True,
+                               returned_objects=[])
+    if cell_km:
+        st.caption(f"{len(summary):,}개 지역을 {len(markers):,}개 원으로 묶어 표시했습니다.")
+
+st.markdown("---")
+
+st.subheader(f"📋 {level}별 AS 현황")
+tables.show_table(summary.drop(columns=['위도', '경도']), 'table_region_map', {
+    '건수': tables.COUNT,
+    '수리비': tables.WON,
+    '현장수': ('곳', 'localized', 0),
+    '장비수': ('대', 'localized', 0),
+    '평균수리비': tables.WON,
+}, cache_key=(version, year, level), hide_index=True)
+
+if not unresolved.empty:
+    with st.expander(f"❓ 좌표를 찾지 못한 주소 ({int(unresolved.sum()):,}건)"):
+        st.caption(f"시도 이름이 다르게 쓰인 주소입니다. `{CENTROID_PATH}`에 행을 추가하면 다음부터 지도에 표시됩니다.")
+        st.dataframe(unresolved.rename('건수').to_frame(), use_container_width=True)
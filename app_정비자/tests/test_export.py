@@ -0,0 +1,46 @@
+# tests/test_export.py
+
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from utils.export import write_parquet, write_xlsx
+
+
+def test_parquet_keeps_missing_values():
+    frame = pd.DataFrame({
+        '현장명': [None, 'A', np.nan],
+        '년월': pd.PeriodIndex(['2024-01', None, '2024-03'], freq='M'),
+        '정비구분': pd.Categorical(['내부', None, '외부']),
+        '수리비': [1.0, np.nan, 3.0],
+    })
+    buffer = io.BytesIO()
+    # 첫 청크가 모두 결측값이어도 문자열 스키마가 유지되는지 함께 확인
+    write_parquet(frame, buffer, index=False, chunk_rows=1)
+
+    result = pq.read_table(io.BytesIO(buffer.getvalue())).to_pandas()
+    assert result['현장명'].tolist()[1] == 'A'
+    assert result['현장명'].isna().tolist() == [True, False, True]
+    assert result['년월'].isna().tolist() == [False, True, False]
+    assert result['년월'].tolist()[0] == '2024-01'
+    assert result['정비구분'].isna().tolist() == [False, True, False]
+    assert not result.isin(['None', 'nan', 'NaT']).any().any()
+
+
+def test_xlsx_splits_sheets_over_row_limit():
+    frame = pd.DataFrame({'값': range(10)})
+    buffer = io.BytesIO()
+    # 머리글 포함 시트당 4행 → 3행씩 4개 시트
+    write_xlsx({'상세데이터': frame}, buffer, index=False, max_rows=4)
+
+    workbook = load_workbook(io.BytesIO(buffer.getvalue()), read_only=True)
+    assert workbook.sheetnames == ['상세데이터', '상세데이터_2', '상세데이터_3', '상세데이터_4']
+    values = []
+    for sheet in workbook.worksheets:
+        rows = list(sheet.iter_rows(values_only=True))
+        assert rows[0] == ('값',)
+        values += [row[0] for row in rows[1:]]
+    assert values == list(range(10))
@@ -0,0 +1,139 @@
+# utils/anomaly.py
+# 기간별 집계 시계열 이상 탐지 (Streamlit 의존성 없음)
+# 파트/업체/고장유형별 수리비 시계열을 (그룹 × 기간) 2차원 배열로 만들고, 모든 그룹을 한 번에 EWMA 평균/분산으로 추적합니다.
+# 각 기간 값은 그 이전까지의 EWMA 기대값과 비교해 z 점수로 판정하므로, 단순 증감률처럼 직전 값이 0일 때 결과가 튀지 않습니다.
+# 기간마다 상태를 보관해 두고, 새 데이터의 앞부분(기존 기간)과 최소 변동 폭이 같으면 그 지점부터 이어서 계산합니다 (새 달만 추가 계산).
+
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+# EWMA 가중치 (클수록 최근 값 반영이 빠름)
+DEFAULT_ALPHA = 0.3
+# 이 기간 수 이상 이력이 쌓인 그룹만 판정
+MIN_PERIODS = 3
+# 기대값 대비 최소 변동 폭 (기대값의 비율) - 분산이 0에 가까운 그룹의 과민 반응 방지
+RELATIVE_FLOOR = 0.25
+
+
+def _column_digest(keys, column):
+    """한 기간 값의 지문 (0이 아닌 (그룹, 값) 쌍 기준이라 새 그룹이 추가되어도 기존 기간 지문은 그대로)"""
+    nonzero = np.flatnonzero(column)
+    pairs = pd.DataFrame({'key': keys[nonzero], 'value': column[nonzero]})
+    return hashlib.sha1(pd.util.hash_pandas_object(pairs, index=False).to_numpy().tobytes()).hexdigest()
+
+
+class EwmaDetector:
+    """그룹별 EWMA 평균/분산 추적기. fit()을 다시 호출하면 바뀌지 않은 앞부분 기간은 재계산하지 않음"""
+
+    def __init__(self, alpha=DEFAULT_ALPHA, min_periods=MIN_PERIODS, relative_floor=RELATIVE_FLOOR, min_scale=None):
+        """min_scale: 최소 변동 폭 (None이면 fit할 때마다 그 데이터에서 0이 아닌 값들의 중앙값의 절반으로 계산)"""
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.relative_floor = relative_floor
+        self.keys = pd.Index([])
+        self.periods = []
+        # 기간별 기록: (지문, 갱신 전 기대값, 갱신 전 표준편차, z 점수, 갱신 후 상태(mean, var, count))
+        self._history = []
+        self.min_scale = min_scale
+        # 이전 fit에 사용한 최소 변동 폭 (바뀌면 기록을 재사용하지 않음)
+        self._fitted_scale = None
+        # 마지막 fit에서 새로 계산한 기간 수
+        self.recomputed = 0
+        self._lock = threading.Lock()
+
+    def _align(self, keys):
+        """새 그룹을 기존 상태 뒤에 추가 (기존 그룹 순서 유지)"""
+        new_keys = pd.Index(keys).difference(self.keys, sort=False)
+        if len(new_keys) == 0:
+            return
+        self.keys = self.keys.append(new_keys)
+        pad = len(new_keys)
+        self._history = [
+            (digest, np.r_[expected, np.zeros(pad)], np.r_[std, np.zeros(pad)], np.r_[z, np.full(pad, np.nan)],
+             tuple(np.r_[array, np.zeros(pad, dtype=array.dtype)] for array in state))
+            for digest, expected, std, z, state in self._history
+        ]
+
+    def _step(self, values, state, min_scale):
+        """한 기간 갱신: (기대값, 표준편차, z 점수, 새 상태)"""
+        mean, var, count = state
+        std = np.sqrt(var)
+        scale = np.maximum(np.maximum(std, self.relative_floor * np.abs(mean)), min_scale)
+        z = np.where(count >= self.min_periods, (values - mean) / scale, np.nan)
+
+        # 첫 값은 그대로 평균으로 사용, 이후 EWMA 갱신
+        first = count == 0
+        diff = values - mean
+        increment = self.alpha * diff
+        new_mean = np.where(first, values, mean + increment)
+        new_var = np.where(first, 0.0, (1 - self.alpha) * (var + diff * increment))
+        return mean, std, z, (new_mean, new_var, count + 1)
+
+    def fit(self, keys, periods, matrix):
+        """
+        (그룹 × 기간) 행렬을 처리하고 (기대값 행렬, z 점수 행렬)을 반환 (행 순서는 keys)
+        periods는 빠짐없이 이어진 기간 번호. 이전 fit과 앞부분 기간 값이 같으면 그 다음 기간부터 계산
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        with self._lock:
+            min_scale = self.min_scale
+            if min_scale is None:
+                positive = matrix[matrix > 0]
+                min_scale = float(np.median(positive)) * 0.5 if positive.size else 1.0
+            if min_scale != self._fitted_scale:
+                self._history = []
+            self._align(keys)
+            order = self.keys.get_indexer(keys)
+            full = np.zeros((len(self.keys), matrix.shape[1]))
+            full[order] = matrix
+
+            # 바뀌지 않은 앞부분 기간 찾기 (기간 번호와 값 지문이 모두 같아야 재사용)
+            digests = [_column_digest(self.keys, full[:, t]) for t in range(full.shape[1])]
+            reuse = 0
+            while (reuse < min(len(self._history), len(periods))
+                   and self.periods[reuse] == periods[reuse] and self._history[reuse][0] == digests[reuse]):
+                reuse += 1
+
+            history = self._history[:reuse]
+            if history:
+                state = history[-1][4]
+            else:
+                size = len(self.keys)
+                state = (np.zeros(size), np.zeros(size), np.zeros(size, dtype=np.int64))
+            for t in range(reuse, full.shape[1]):
+                expected, std, z, state = self._step(full[:, t], state, min_scale)
+                history.append((digests[t], expected, std, z, state))
+
+            self._history = history
+            self._fitted_scale = min_scale
+            self.periods = list(periods)
+            self.recomputed = full.shape[1] - reuse
+            if not history:
+                return np.empty((len(keys), 0)), np.empty((len(keys), 0))
+            expected = np.column_stack([h[1] for h in history])[order]
+            z = np.column_stack([h[3] for h in history])[order]
+            return expected, z
+
+
+def detect(detector, keys, periods, matrix, period, threshold=3.0):
+    """
+    period 기간에 기대값보다 유의하게 높은 그룹 (z >= threshold), z 점수 내림차순
+    반환 컬럼: 현재, 기대값, 초과액, z
+    """
+    columns = ['현재', '기대값', '초과액', 'z']
+    if period not in periods:
+        return pd.DataFrame(columns=columns)
+
+    expected, z = detector.fit(keys, periods, matrix)
+    position = list(periods).index(period)
+    result = pd.DataFrame({
+        '현재': np.asarray(matrix, dtype=float)[:, position],
+        '기대값': expected[:, position],
+        'z': z[:, position],
+    }, index=pd.Index(keys))
+    result['초과액'] = result['현재'] - result['기대값']
+    flagged = result[(result['z'] >= threshold) & (result['초과액'] > 0)]
+    return flagged[columns].sort_values('z', ascending=False)
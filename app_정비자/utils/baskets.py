@@ -0,0 +1,120 @@
+# utils/baskets.py
+# 부품 동시사용(장바구니) 분석 엔진 (Streamlit 의존성 없음)
+# 수리비 매핑에서 보관한 (정비 건, 자재명) 쌍으로 정비 건 × 자재 희소 발생 행렬을 한 번 만들고,
+# 동시사용 건수는 희소 행렬 곱(Xᵀ X), 그룹(고장유형/모델)별 자재 사용 건수는 그룹 지시 행렬 곱(G X)으로 계산합니다.
+# - 연관 규칙(A → B): 지지도 = 동시건수 / 정비 건수, 신뢰도 = 동시건수 / A 건수, 향상도 = 신뢰도 / (B 건수 / 정비 건수)
+# - 분모는 부품이 한 개 이상 매칭된 정비 건만 사용
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 규칙으로 인정할 최소 동시사용 건수 (적은 건수의 우연한 조합으로 향상도가 커지는 것 방지)
+MIN_COUNT = 3
+MIN_CONFIDENCE = 0.1
+
+RULE_COLUMNS = ['선행부품', '후행부품', '동시건수', '지지도(%)', '신뢰도(%)', '향상도']
+
+
+class PartBaskets:
+    """정비 건 × 자재 희소 발생 행렬 (데이터셋마다 한 번 생성해 재사용)"""
+
+    def __init__(self, part_pairs, n_events):
+        """part_pairs: 행번호(정비 건 행 위치), 자재명, 출고금액 / n_events: 정비 건 수"""
+        part_pairs = part_pairs.drop_duplicates(['행번호', '자재명'])
+        codes, self.parts = pd.factorize(part_pairs['자재명'], sort=True)
+        rows = part_pairs['행번호'].to_numpy(dtype=np.int64)
+        shape = (n_events, len(self.parts))
+        self.matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float64), (rows, codes)), shape=shape)
+        amounts = part_pairs['출고금액'] if '출고금액' in part_pairs.columns else pd.Series(0.0, index=part_pairs.index)
+        amounts = np.nan_to_num(pd.to_numeric(amounts, errors='coerce').to_numpy(dtype=float))
+        self.amounts = sparse.csr_matrix((amounts, (rows, codes)), shape=shape)
+        # 부품이 한 개 이상 매칭된 정비 건
+        self.has_parts = np.diff(self.matrix.indptr) > 0
+
+    @property
+    def n_baskets(self):
+        return int(self.has_parts.sum())
+
+    def _rows(self, mask=None):
+        """분석 대상 정비 건 (mask와 부품 매칭 건의 교집합)"""
+        rows = self.has_parts if mask is None else self.has_parts & np.asarray(mask, dtype=bool)
+        return np.flatnonzero(rows)
+
+    def part_summary(self, mask=None):
+        """자재별 사용 건수, 사용 비율(%), 출고금액 합계 (사용 건수 내림차순)"""
+        rows = self._rows(mask)
+        counts = np.asarray(self.matrix[rows].sum(axis=0)).ravel()
+        amounts = np.asarray(self.amounts[rows].sum(axis=0)).ravel()
+        summary = pd.DataFrame({'사용건수': counts, '출고금액': amounts}, index=pd.Index(self.parts, name='자재명'))
+        summary['사용비율(%)'] = summary['사용건수'] / max(len(rows), 1) * 100
+        summary = summary[summary['사용건수'] > 0]
+        return summary.sort_values(['사용건수', '출고금액'], ascending=False)
+
+    def cooccurrence(self, mask=None):
+        """자재 × 자재 동시사용 건수 희소 행렬 (대각선은 자재별 사용 건수)와 정비 건수"""
+        subset = self.matrix[self._rows(mask)]
+        return (subset.T @ subset).tocsr(), subset.shape[0]
+
+    def rules(self, mask=None, min_count=MIN_COUNT, min_confidence=MIN_CONFIDENCE, top=None):
+        """
+        자재 쌍 연관 규칙 (향상도 → 동시건수 내림차순)
+        mask: 정비 건 선택 (예: 특정 고장유형/모델), None이면 전체
+        """
+        matrix, n = self.cooccurrence(mask)
+        support = matrix.diagonal()
+        pairs = matrix.tocoo()
+        keep = (pairs.row != pairs.col) & (pairs.data >= min_count)
+        antecedent, consequent, together = pairs.row[keep], pairs.col[keep], pairs.data[keep]
+
+        confidence = together / support[antecedent]
+        lift = confidence / (support[consequent] / max(n, 1))
+        keep = confidence >= min_confidence
+        rules = pd.DataFrame({
+            '선행부품': self.parts[antecedent[keep]],
+            '후행부품': self.parts[consequent[keep]],
+            '동시건수': together[keep].astype(np.int64),
+            '지지도(%)': together[keep] / max(n, 1) * 100,
+            '신뢰도(%)': confidence[keep] * 100,
+            '향상도': lift[keep],
+        }, columns=RULE_COLUMNS)
+        rules = rules.sort_values(['향상도', '동시건수'], ascending=False, kind='stable').reset_index(drop=True)
+        return rules if top is None else rules.head(top)
+
+    def group_usage(self, labels):
+        """
+        그룹(정비 건별 라벨, 예: 고장유형)별 자재 사용 건수 희소 행렬, 그룹별 정비 건수, 그룹 이름
+        그룹 지시 행렬(그룹 × 정비 건) 곱 한 번으로 모든 그룹을 계산
+        """
+        labels = pd.Series(np.asarray(labels, dtype=object))
+        codes, names = pd.factorize(labels, sort=True)
+        valid = (codes >= 0) & self.has_parts
+        rows = np.flatnonzero(valid)
+        indicator = sparse.csr_matrix((np.ones(len(rows)), (codes[rows], rows)),
+                                      shape=(len(names), self.matrix.shape[0]))
+        usage = (indicator @ self.matrix).tocsr()
+        baskets = np.bincount(codes[rows], minlength=len(names))
+        return usage, baskets, pd.Index(names)
+
+    def group_profile(self, labels, group, min_count=MIN_COUNT, top=None):
+        """
+        한 그룹에서 자주 쓰이는 자재와 전체 대비 향상도 (그룹 내 사용 비율 / 전체 사용 비율)
+        반환 컬럼: 사용건수, 사용비율(%), 전체비율(%), 향상도
+        """
+        usage, baskets, names = self.group_usage(labels)
+        columns = ['사용건수', '사용비율(%)', '전체비율(%)', '향상도']
+        if group not in names:
+            return pd.DataFrame(columns=columns)
+        position = names.get_loc(group)
+        row = usage[position].toarray().ravel()
+        overall = np.asarray(self.matrix[self.has_parts].sum(axis=0)).ravel() / max(self.n_baskets, 1)
+        share = row / max(baskets[position], 1)
+        profile = pd.DataFrame({
+            '사용건수': row.astype(np.int64),
+            '사용비율(%)': share * 100,
+            '전체비율(%)': overall * 100,
+        }, index=pd.Index(self.parts, name='자재명'))
+        profile['향상도'] = share / np.where(overall > 0, overall, np.nan)
+        profile = profile[profile['사용건수'] >= min_count]
+        profile = profile.sort_values(['향상도', '사용건수'], ascending=False, kind='stable')
+        return profile if top is None else profile.head(top)
@@ -0,0 +1,157 @@
+# utils/client_names.py
+# 현장명(업체명) 표기 통합 (Streamlit 의존성 없음)
+# 같은 업체가 띄어쓰기, (주)/주식회사, 지점 표기 차이로 여러 이름으로 나뉘는 문제를 정리합니다.
+# 1. 정규화: 법인 표기/지점 접미어/공백/기호 제거
+# 2. 후보 쌍 찾기: 문자 n-gram 중 드문 것(블로킹 키)을 공유하는 이름끼리만 비교 (전체 쌍 비교 없음)
+# 3. 후보 쌍의 n-gram 자카드 유사도를 희소 행렬 연산으로 한 번에 계산하고, 기준 이상이면 같은 업체로 묶음 (union-find)
+# 결과는 별칭표(원본명 → 대표명) 파일로 저장하고, 다음 업로드부터는 새로 나온 이름만 묶어서 추가합니다.
+# 이미 별칭표에 있는 이름은 다시 묶지 않으므로, 파일에서 대표명을 직접 고친 내용은 그대로 유지됩니다 ('자동': 자동으로 추가된 행 여부).
+
+import os
+import re
+import tempfile
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 법인 표기 (정규화 시 제거)
+LEGAL_FORMS = re.compile(r"\(주\)|㈜|\(유\)|\(사\)|\(재\)|주식회사|유한회사|유한책임회사|사단법인|재단법인|"
+                         r"\bco\b\.?|\bltd\b\.?|\binc\b\.?|\bcorp\b\.?", re.IGNORECASE)
+# 지점 접미어 (이름 끝의 '○○지점', '○○영업소' 등)
+BRANCH_SUFFIX = re.compile(r"\s*\S*(지점|지사|영업소|출장소|사업소|공장)$")
+NON_WORD = re.compile(r"[\W_]+")
+
+# n-gram 길이, 블로킹 키로 쓸 n-gram의 최대 출현 이름 수, 같은 업체로 볼 최소 자카드 유사도
+NGRAM = 2
+MAX_BLOCK_SIZE = 50
+SIMILARITY_THRESHOLD = 0.75
+
+ALIAS_COLUMNS = ['원본명', '대표명', '자동']
+
+
+def normalize_name(name):
+    """업체명 정규화 키 (비교용, 화면 표시에는 쓰지 않음)"""
+    text = unicodedata.normalize('NFKC', str(name)).strip()
+    text = LEGAL_FORMS.sub(" ", text)
+    stripped = BRANCH_SUFFIX.sub("", text.strip())
+    # 지점 접미어를 떼면 아무것도 남지 않는 이름은 그대로 둠
+    text = stripped if NON_WORD.sub("", stripped) else text
+    return NON_WORD.sub("", text).lower()
+
+
+def _ngram_matrix(keys, n=NGRAM):
+    """정규화 키 × 문자 n-gram 이진 희소 행렬 (n보다 짧은 키는 키 전체를 하나의 n-gram으로)"""
+    rows, grams = [], []
+    for i, key in enumerate(keys):
+        parts = {key[j:j + n] for j in range(len(key) - n + 1)} or {key}
+        rows.extend([i] * len(parts))
+        grams.extend(parts)
+    codes, vocabulary = pd.factorize(pd.Series(grams, dtype=object))
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, codes)), shape=(len(keys), len(vocabulary)))
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_keys(keys, threshold=SIMILARITY_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+    """
+    정규화 키 목록 → 그룹 번호 배열 (유사도가 threshold 이상인 키끼리 같은 번호)
+    블로킹: 출현 이름 수가 max_block_size 이하인 n-gram을 하나 이상 공유하는 쌍만 유사도 계산
+    """
+    # 정규화 키가 같은 이름은 먼저 묶고, 고유 키끼리만 비교
+    key_codes, keys = pd.factorize(pd.Series(keys, dtype=object))
+    n_keys = len(keys)
+    if n_keys == 0:
+        return np.zeros(len(key_codes), dtype=np.int64)
+    matrix = _ngram_matrix(keys)
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+
+    # 너무 흔한 n-gram(예: '물류')은 블로킹 키에서 제외 → 후보 쌍 수가 이름 수에 거의 비례
+    document_frequency = np.asarray(matrix.sum(axis=0)).ravel()
+    blocking = matrix[:, np.flatnonzero(document_frequency <= max_block_size)]
+    candidates = sparse.triu(blocking @ blocking.T, k=1).tocoo()
+    left, right = candidates.row, candidates.col
+
+    # 후보 쌍의 공통 n-gram 수 → 자카드 유사도 (전체 n-gram 기준)
+    shared = np.asarray(matrix[left].multiply(matrix[right]).sum(axis=1)).ravel()
+    similarity = shared / np.maximum(sizes[left] + sizes[right] - shared, 1)
+    matched = similarity >= threshold
+
+    parent = np.arange(n_keys)
+    for i, j in zip(left[matched], right[matched]):
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    roots = np.array([_find(parent, i) for i in range(n_keys)])
+    return pd.factorize(roots[key_codes])[0]
+
+
+def load_alias_table(path):
+    """저장된 별칭표 (없거나 읽을 수 없으면 빈 표)"""
+    try:
+        table = pd.read_csv(path, dtype={'원본명': str, '대표명': str}, encoding='utf-8-sig')
+        table['자동'] = table['자동'].astype(str).str.lower().isin(['true', '1'])
+        return table[ALIAS_COLUMNS].dropna(subset=['원본명', '대표명'])
+    except (OSError, ValueError, KeyError):
+        return pd.DataFrame(columns=ALIAS_COLUMNS)
+
+
+def save_alias_table(table, path):
+    """별칭표 저장 (임시 파일에 쓴 뒤 교체하여 동시에 읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.csv')
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8-sig', newline='') as f:
+            table.sort_values(['대표명', '원본명']).to_csv(f, index=False)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def update_alias_table(names, counts, table):
+    """
+    새 이름을 기존 별칭표에 추가한 표와 새로 추가된 행 수
+    names/counts: 이번 데이터의 원본 이름과 건수 (대표명은 묶음에서 건수가 가장 많은 표기)
+    새 이름이 기존 대표명과 묶이면 기존 대표명을 따름
+    """
+    known = set(table['원본명'])
+    new = [(name, count) for name, count in zip(names, counts) if name not in known]
+    if not new:
+        return table, 0
+
+    canonical = list(dict.fromkeys(table['대표명']))
+    universe = canonical + [name for name, _ in new]
+    weights = np.r_[np.full(len(canonical), np.inf), [count for _, count in new]]
+    groups = cluster_keys([normalize_name(name) for name in universe])
+
+    # 묶음별 대표명: 기존 대표명이 있으면 그것(가중치 무한대), 없으면 건수가 가장 많은 표기
+    order = np.lexsort((np.arange(len(universe)), -weights, groups))
+    first = order[np.r_[True, groups[order][1:] != groups[order][:-1]]]
+    representative = dict(zip(groups[first], np.asarray(universe, dtype=object)[first]))
+
+    rows = pd.DataFrame({
+        '원본명': [name for name, _ in new],
+        '대표명': [representative[group] for group in groups[len(canonical):]],
+        '자동': True,
+    })
+    table = pd.concat([table, rows], ignore_index=True) if len(table) else rows
+    return table, len(rows)
+
+
+def apply_aliases(values, table):
+    """
+    원본 이름 배열 → 대표명 배열 (고유값 단위로 바꾼 뒤 코드로 펼침, 별칭표에 없는 이름은 그대로)
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    mapping = dict(zip(table['원본명'], table['대표명']))
+    renamed = np.array([mapping.get(name, name) for name in uniques], dtype=object)
+    return np.where(codes >= 0, renamed[np.maximum(codes, 0)] if len(renamed) else None, None)
@@ -0,0 +1,112 @@
+# utils/crosstab.py
+# 희소 교차표 엔진 (Streamlit 의존성 없음)
+# 브랜드_모델 × 고장유형처럼 양쪽 모두 범주가 많은 교차표는 대부분이 0이라, pd.crosstab의 밀집 행렬 대신
+# 범주 코드로 SciPy 희소 행렬(건수/수리비)을 한 번 만들고, 히트맵에는 요청한 상위 k개 행/열 부분만 밀집 행렬로 꺼냅니다.
+# - 상위 k개 선택은 행/열 합계의 argpartition
+# - 정규화(행 비율, 열 비율, 기대 대비 배율)는 부분 행렬이 아닌 전체 합계 기준
+# - 군집 순서는 부분 행렬의 행/열 프로필(코사인 거리) 계층적 군집의 잎 순서
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 정규화 방식 {이름: 설명}
+NORMALIZATIONS = {
+    None: "원본 값",
+    'row': "행 비율 (%)",
+    'column': "열 비율 (%)",
+    'lift': "기대 대비 배율",
+}
+
+
+def _top_positions(totals, k):
+    """합계 상위 k개 위치 (합계 내림차순, 동률이면 앞 위치 먼저)"""
+    k = min(k, len(totals))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-totals, k - 1)[:k] if k < len(totals) else np.arange(len(totals))
+    return candidates[np.lexsort((candidates, -totals[candidates]))]
+
+
+def cluster_order(matrix):
+    """행 프로필(코사인 거리)의 계층적 군집 잎 순서 (행이 2개 이하이거나 모두 0이면 원래 순서)"""
+    from scipy.cluster.hierarchy import linkage, leaves_list
+
+    matrix = np.asarray(matrix, dtype=float)
+    nonzero = matrix.any(axis=1)
+    if nonzero.sum() <= 2:
+        return np.arange(len(matrix))
+    # 값이 모두 0인 행은 거리가 정의되지 않으므로 군집에서 빼고 맨 뒤에 둠
+    positions = np.flatnonzero(nonzero)
+    tree = linkage(matrix[positions], method='average', metric='cosine', optimal_ordering=True)
+    return np.r_[positions[leaves_list(tree)], np.flatnonzero(~nonzero)]
+
+
+class SparseCrosstab:
+    """rows × columns 희소 건수/합계 행렬 (데이터셋, 차원 조합마다 한 번 생성해 재사용)"""
+
+    def __init__(self, df, rows, columns, value='수리비'):
+        self.rows = rows
+        self.columns = columns
+        valid = df[rows].notna() & df[columns].notna()
+        row_codes, self.row_names = pd.factorize(df.loc[valid, rows], sort=True)
+        column_codes, self.column_names = pd.factorize(df.loc[valid, columns], sort=True)
+        shape = (len(self.row_names), len(self.column_names))
+
+        # 같은 (행, 열) 좌표는 COO → CSR 변환에서 합쳐짐
+        self.values = {'건수': sparse.coo_matrix((np.ones(len(row_codes)), (row_codes, column_codes)),
+                                               shape=shape).tocsr()}
+        if value in df.columns:
+            amounts = np.nan_to_num(pd.to_numeric(df.loc[valid, value], errors='coerce').to_numpy(dtype=float))
+            self.values[value] = sparse.coo_matrix((amounts, (row_codes, column_codes)), shape=shape).tocsr()
+        self._totals = {}
+
+    @property
+    def shape(self):
+        return self.values['건수'].shape
+
+    @property
+    def density(self):
+        """0이 아닌 칸의 비율"""
+        rows, columns = self.shape
+        return self.values['건수'].nnz / max(rows * columns, 1)
+
+    def totals(self, value='건수'):
+        """(행 합계, 열 합계, 전체 합계)"""
+        if value not in self._totals:
+            matrix = self.values[value]
+            self._totals[value] = (np.asarray(matrix.sum(axis=1)).ravel(), np.asarray(matrix.sum(axis=0)).ravel(),
+                                   float(matrix.sum()))
+        return self._totals[value]
+
+    def top(self, k_rows, k_columns, value='건수'):
+        """합계 상위 k개 행/열 위치"""
+        row_totals, column_totals, _ = self.totals(value)
+        return _top_positions(row_totals, k_rows), _top_positions(column_totals, k_columns)
+
+    def submatrix(self, row_positions, column_positions, value='건수', normalize=None):
+        """
+        선택한 행/열만 밀집 DataFrame으로 (정규화는 전체 합계 기준)
+        normalize: None | 'row' (행 합계 대비 %) | 'column' (열 합계 대비 %) | 'lift' (행·열 독립 가정 기대값 대비 배율)
+        """
+        dense = self.values[value][row_positions][:, column_positions].toarray()
+        row_totals, column_totals, total = self.totals(value)
+        row_totals, column_totals = row_totals[row_positions], column_totals[column_positions]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if normalize == 'row':
+                dense = dense / row_totals[:, None] * 100
+            elif normalize == 'column':
+                dense = dense / column_totals[None, :] * 100
+            elif normalize == 'lift':
+                dense = dense * total / (row_totals[:, None] * column_totals[None, :])
+        dense = np.nan_to_num(dense, nan=0.0, posinf=0.0)
+        return pd.DataFrame(dense, index=pd.Index(self.row_names[row_positions], name=self.rows),
+                            columns=pd.Index(self.column_names[column_positions], name=self.columns))
+
+    def heatmap(self, k_rows=20, k_columns=20, value='건수', normalize=None, cluster=False):
+        """히트맵용 상위 k개 부분 행렬 (cluster=True이면 행/열을 프로필이 비슷한 순서로 재배치)"""
+        row_positions, column_positions = self.top(k_rows, k_columns, value)
+        table = self.submatrix(row_positions, column_positions, value, normalize)
+        if cluster and not table.empty:
+            table = table.iloc[cluster_order(table.to_numpy()), cluster_order(table.to_numpy().T)]
+        return table
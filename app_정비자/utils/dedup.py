@@ -0,0 +1,99 @@
+# utils/dedup.py
+# 정비일지 중복 기록 탐지 (Streamlit 의존성 없음)
+# 기간이 겹치는 파일을 함께 올리면 같은 정비 건이 여러 번 들어와 AS 건수가 늘고 수리비 매칭도 중복됩니다.
+# 행마다 64비트 해시 두 개(행 전체, 식별 컬럼)를 만들고 정렬한 뒤 바로 앞 행과만 비교합니다 (해시 정렬 한 번 + 선형 비교).
+# - 완전 중복: 모든 컬럼 값이 같은 행
+# - 근접 중복: 관리번호/정비자번호/정비작업이 같고 정비일자 차이가 window 이하인 행 (다시 내보내며 일부 값만 바뀐 경우)
+# 이미 불러온 달의 지문(fingerprints)을 previous로 넘기면 새로 붙인 달의 행만 기존 행과 함께 검사합니다.
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# 같은 정비 건을 가리키는 컬럼 (정비일자 제외, 없는 컬럼은 건너뜀)
+IDENTITY_COLUMNS = ['관리번호', '정비자번호', '정비작업']
+# 근접 중복으로 볼 최대 정비일자 차이 (정비일자가 날짜 단위이므로 0이면 같은 날)
+NEAR_WINDOW = pd.Timedelta(0)
+# 중복 보고 표에 남길 컬럼
+REPORT_COLUMNS = ['관리번호', '정비일자', '정비자번호', '정비자', '정비작업', '정비구분', '수리시간']
+
+
+def row_hashes(df, columns=None):
+    """행 → 64비트 해시 (columns가 없으면 모든 컬럼)"""
+    frame = df if columns is None else df[columns]
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def fingerprints(df):
+    """
+    행별 지문: 행해시(모든 컬럼), 키해시(IDENTITY_COLUMNS), 정비일자
+    행당 24바이트만 남기므로 이전에 불러온 달의 지문을 보관해 두고 다음 달 검사에 재사용할 수 있음
+    """
+    key_columns = [column for column in IDENTITY_COLUMNS if column in df.columns]
+    return pd.DataFrame({
+        '행해시': row_hashes(df),
+        '키해시': row_hashes(df, key_columns),
+        '정비일자': pd.to_datetime(df['정비일자'], errors='coerce').to_numpy(),
+    })
+
+
+def fingerprint_digest(prints):
+    """지문 표 전체의 지문 (이어 붙일 기준 데이터가 같은지 구분하는 작업 키에 사용)"""
+    return hashlib.sha256(pd.util.hash_pandas_object(prints, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def _repeats(sorted_values):
+    """정렬된 배열에서 바로 앞 값과 같은 위치"""
+    flags = np.zeros(len(sorted_values), dtype=bool)
+    flags[1:] = sorted_values[1:] == sorted_values[:-1]
+    return flags
+
+
+def find_duplicates(prints, window=NEAR_WINDOW, previous=None):
+    """
+    지문 표(fingerprints)에서 (완전 중복, 근접 중복) 행 여부 배열 반환 - 각 묶음의 첫 행(파일 순서/정비일자 기준)은 남김
+    previous: 이미 불러온 행의 지문. 이전 행은 항상 남기고, 새 행이 이전 행과 겹치면 새 행을 중복으로 표시
+    """
+    window = pd.Timedelta(window).to_timedelta64()
+    if previous is not None and len(previous):
+        prints = pd.concat([previous[prints.columns], prints], ignore_index=True)
+        known = np.arange(len(prints)) < len(previous)
+    else:
+        known = np.zeros(len(prints), dtype=bool)
+
+    # 완전 중복: 행해시 정렬 (안정 정렬이라 같은 해시끼리는 원래 순서 → 먼저 들어온 행을 남김)
+    order = np.argsort(prints['행해시'].to_numpy(), kind='stable')
+    exact = np.zeros(len(prints), dtype=bool)
+    exact[order] = _repeats(prints['행해시'].to_numpy()[order])
+
+    # 근접 중복: (키해시, 정비일자) 정렬 후 같은 키의 바로 앞 행과 날짜 차이 비교
+    keys = prints['키해시'].to_numpy()
+    dates = prints['정비일자'].to_numpy()
+    order = np.lexsort((np.arange(len(prints)), dates, keys))
+    sorted_keys, sorted_dates = keys[order], dates[order]
+    same_key = _repeats(sorted_keys)
+    close = np.zeros(len(prints), dtype=bool)
+    close[1:] = (sorted_dates[1:] - sorted_dates[:-1]) <= window
+    near_sorted = same_key & close
+    # 새 행이 바로 뒤의 이전 행보다 조금 앞선 날짜인 경우도 새 행 쪽을 중복으로 표시
+    sorted_known = known[order]
+    near_sorted[:-1] |= ~sorted_known[:-1] & sorted_known[1:] & near_sorted[1:]
+    near = np.zeros(len(prints), dtype=bool)
+    near[order] = near_sorted
+    # 이전 행이 새 행 뒤에 있어 중복으로 잡힌 경우는 이전 행을 남김
+    near &= ~known
+    exact &= ~known
+
+    new = ~known
+    return exact[new], (near & ~exact)[new]
+
+
+def duplicate_report(df, exact, near):
+    """제외된 행 목록 (구분: 완전 중복/근접 중복, 행번호: 업로드 데이터에서의 위치)"""
+    dropped = exact | near
+    columns = [column for column in REPORT_COLUMNS if column in df.columns]
+    report = df.loc[dropped, columns].copy()
+    report.insert(0, '구분', np.where(exact[dropped], '완전 중복', '근접 중복'))
+    report.insert(1, '행번호', np.flatnonzero(dropped))
+    return report.reset_index(drop=True)
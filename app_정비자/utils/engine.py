@@ -0,0 +1,677 @@
+# utils/engine.py
+# 데이터 처리 엔진 (Streamlit 의존성 없음)
+# 각 처리 단계는 (결과, Diagnostics)를 반환하며, 화면 표시는 utils/data_processing.py의 어댑터가 담당합니다.
+# 작업 프로세스, 배치 스크립트, 벤치마크에서 그대로 사용할 수 있습니다.
+
+import time
+import functools
+import tracemalloc
+import traceback
+
+import pandas as pd
+import numpy as np
+
+from utils import client_names, dedup
+
+
+class Diagnostics:
+    """처리 단계의 진단 정보: 메시지(info/warning/error), 통계(매칭 결과 등), 단계별 실행 기록"""
+
+    def __init__(self):
+        self.messages = []
+        self.stats = {}
+        self.stages = []
+
+    def info(self, text):
+        self.messages.append(('info', text))
+
+    def warning(self, text):
+        self.messages.append(('warning', text))
+
+    def error(self, text):
+        self.messages.append(('error', text))
+
+    def merge(self, other):
+        """다른 단계의 진단 정보를 합침"""
+        self.messages.extend(other.messages)
+        self.stats.update(other.stats)
+        self.stages.extend(other.stages)
+        return self
+
+    def collect(self, stage_result):
+        """단계 함수의 (결과, 진단) 반환값에서 진단을 합치고 결과만 반환"""
+        result, diagnostics = stage_result
+        self.merge(diagnostics)
+        return result
+
+    @property
+    def warnings(self):
+        return [text for level, text in self.messages if level in ('warning', 'error')]
+
+    @property
+    def timings(self):
+        """단계별 실행 시간 합계 (초)"""
+        totals = {}
+        for record in self.stages:
+            totals[record['stage']] = totals.get(record['stage'], 0.0) + record['seconds']
+        return totals
+
+
+def _row_count(value):
+    return len(value) if isinstance(value, pd.DataFrame) else None
+
+
+# 단계별 계측 (기본값 꺼짐). 작업 프로세스마다 따로 설정되므로 작업을 제출할 때 함께 전달합니다.
+_profiling = False
+
+
+def set_profiling(enabled):
+    """단계별 계측 사용 여부 설정 (켜면 메모리 할당 추적도 시작)"""
+    global _profiling
+    _profiling = bool(enabled)
+    if _profiling and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not _profiling and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def measure(diagnostics, name, func, /, *args, **kwargs):
+    """
+    func 실행의 소요 시간, 입출력 행 수, 할당 메모리(추적 중 최대치)를 diagnostics.stages에 기록합니다.
+    계측이 꺼져 있으면 아무것도 기록하지 않고 func만 실행합니다.
+    """
+    if not _profiling:
+        return func(*args, **kwargs)
+
+    tracemalloc.reset_peak()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    diagnostics.stages.append({
+        'stage': name,
+        'seconds': seconds,
+        'rows_in': _row_count(args[0]) if args else None,
+        'rows_out': _row_count(result),
+        'bytes_allocated': max(tracemalloc.get_traced_memory()[1] - traced_before, 0),
+        'cache': 'miss',
+    })
+    return result
+
+
+def stage(name):
+    """처리 단계 데코레이터: Diagnostics를 주입하고 (계측이 켜져 있으면 실행 기록을 남긴 뒤) (결과, 진단)을 반환"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            diagnostics = Diagnostics()
+            result = measure(diagnostics, name, func, *args, diagnostics=diagnostics, **kwargs)
+            return result, diagnostics
+        return wrapper
+    return decorator
+
+
+def parse_log_excel(file):
+    """정비일지/소모품 엑셀 파일을 파싱하는 함수 (오류는 예외로 전달)"""
+    # 모든 문자열 컬럼을 문자열로 로드하도록 설정
+    return normalize_log_frame(pd.read_excel(file, dtype=str))
+
+def normalize_log_frame(df):
+    """문자열로 읽은 정비일지/소모품 데이터의 컬럼명 정리, 숫자/날짜 변환, 분류 컬럼명 매핑"""
+    # 컬럼명 정리 (줄바꿈 제거 및 공백 제거)
+    df.columns = [str(col).strip().replace('\n', '') for col in df.columns]
+
+    # 관리번호가 있으면 문자열로 강제 변환
+    if '관리번호' in df.columns:
+        df['관리번호'] = df['관리번호'].astype(str)
+
+    # 숫자형 데이터 변환 (금액, 시간 등)
+    numeric_cols = []
+    for col in df.columns:
+        if any(keyword in col.lower() for keyword in ['금액', '시간', '비용', '단가']):
+            numeric_cols.append(col)
+    
+    # 숫자형 컬럼 변환
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # 날짜형 데이터 변환
+    date_cols = []
+    for col in df.columns:
+        if any(keyword in col.lower() for keyword in ['일자', '날짜', 'date']):
+            date_cols.append(col)
+    
+    # 날짜형 컬럼 변환
+    for col in date_cols:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    # 컬럼명 매핑 (정비일지 데이터인 경우)
+    # 대분류, 중분류, 소분류가 있는 경우 작업유형, 정비대상, 정비작업으로 변환
+    if all(col in df.columns for col in ['대분류', '중분류', '소분류']):
+        df.rename(columns={
+            '대분류': '작업유형',
+            '중분류': '정비대상',
+            '소분류': '정비작업'
+        }, inplace=True)
+
+    return df
+
+def parse_static_excel(file):
+    """자산조회/조직도 같은 내장 엑셀 파일을 파싱하는 함수"""
+    df = pd.read_excel(file)
+    df.columns = [str(col).strip().replace('\n', '') for col in df.columns]
+    return df
+
+@stage('파일 로드')
+def load_data(file, *, diagnostics):
+    """파일에서 데이터를 로드하는 함수 (실패 시 None)"""
+    try:
+        return parse_log_excel(file)
+    except Exception as e:
+        diagnostics.error(f"파일 로드 오류: {e}")
+        return None
+
+def extract_region_from_address(address):
+    """주소에서 지역 정보를 정확하게 추출하는 함수"""
+    if not isinstance(address, str):
+        return None, None
+
+    address = address.strip()
+
+    region_prefixes = ['서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종',
+                       '경기', '강원', '충북', '충남', '전북', '전남', '경북', '경남', '제주']
+
+    tokens = address.split()
+    if len(tokens) < 2:
+        return None, None
+
+    first, second = tokens[0], tokens[1]
+    if first in region_prefixes and second.endswith(('시', '군', '구')):
+        return first, address
+
+    return None, None
+
+@stage('지역 정보 추출')
+def extract_and_apply_region(df, *, diagnostics):
+    """현장 컬럼에서 지역과 주소를 추출하여 적용하는 함수"""
+    df_copy = df.copy()
+    
+    if '현장' in df_copy.columns:
+        results = df_copy['현장'].apply(extract_region_from_address)
+        df_copy['지역'] = results.map(lambda x: x[0])
+        df_copy['주소'] = results.map(lambda x: x[1])
+        df_copy['현장명'] = np.where(df_copy['주소'].isna(), df_copy['현장'], None)
+    
+    return df_copy
+
+@stage('현장명 표기 통합')
+def canonicalize_client_names(df, alias_path=None, *, diagnostics):
+    """
+    현장명 표기 차이(띄어쓰기, (주)/주식회사, 지점 접미어)를 별칭표 기준 대표명으로 통합 (원본은 현장명_원본 컬럼)
+    alias_path가 주어지면 저장된 별칭표를 불러와 새 이름만 묶어 추가하고 다시 저장
+    """
+    if '현장명' not in df.columns:
+        return df
+
+    try:
+        counts = df['현장명'].value_counts()
+        table = client_names.load_alias_table(alias_path) if alias_path else \
+            pd.DataFrame(columns=client_names.ALIAS_COLUMNS)
+        table, added = client_names.update_alias_table(counts.index, counts.to_numpy(), table)
+        if added and alias_path:
+            try:
+                client_names.save_alias_table(table, alias_path)
+            except OSError as e:
+                diagnostics.warning(f"현장명 별칭표 저장 실패 (이번 분석에는 적용됨): {e}")
+
+        df_copy = df.copy()
+        df_copy['현장명_원본'] = df_copy['현장명']
+        df_copy['현장명'] = client_names.apply_aliases(df_copy['현장명'].to_numpy(dtype=object), table)
+        merged = df_copy['현장명'].nunique()
+        if merged < len(counts):
+            diagnostics.info(f"현장명 표기 {len(counts):,}개를 {merged:,}개 업체로 통합했습니다.")
+        return df_copy
+    except Exception as e:
+        diagnostics.warning(f"현장명 표기 통합 중 오류 발생: {e}")
+        return df
+
+@stage('중복 정비 기록 제거')
+def deduplicate_maintenance_records(df, window=dedup.NEAR_WINDOW, previous=None, *, diagnostics):
+    """
+    기간이 겹치는 업로드로 반복된 정비 기록 제거 (완전 중복 + window 이내 근접 중복, 첫 행만 남김)
+    previous: 이미 불러온 데이터의 지문(dedup.fingerprints) - 주어지면 새 행 중 이전 행과 겹치는 행도 제거
+    제외한 행은 diagnostics.stats['duplicate_rows'], 남긴 행의 지문(previous 포함)은 diagnostics.stats['fingerprints']에 보고
+    """
+    if '관리번호' not in df.columns or '정비일자' not in df.columns:
+        return df
+
+    prints = dedup.fingerprints(df)
+    exact, near = dedup.find_duplicates(prints, window, previous)
+    dropped = exact | near
+    kept = prints[~dropped]
+    if previous is not None and len(previous):
+        kept = pd.concat([previous[kept.columns], kept], ignore_index=True)
+    diagnostics.stats['fingerprints'] = kept.reset_index(drop=True)
+    if not dropped.any():
+        return df
+
+    diagnostics.stats['duplicates'] = {'exact': int(exact.sum()), 'near': int(near.sum())}
+    diagnostics.stats['duplicate_rows'] = dedup.duplicate_report(df, exact, near)
+    diagnostics.info(f"중복 정비 기록 {dropped.sum():,}건을 제외했습니다 "
+                     f"(완전 중복 {exact.sum():,}건, 근접 중복 {near.sum():,}건).")
+    return df[~dropped].reset_index(drop=True)
+
+# 문자열 리스트 변환
+def convert_to_str_list(arr):
+    """NaN과 혼합 유형을 처리하여 문자열 리스트로 변환"""
+    return [str(x) for x in arr if not pd.isna(x)]
+
+# 작은 비율 항목을 '기타'로 그룹화
+def group_small_categories(series, threshold=0.03):
+    """작은 비율의 항목을 '기타'로 그룹화"""
+    total = series.sum()
+    mask = series / total < threshold
+    if mask.any():
+        others = pd.Series({'기타': series[mask].sum()})
+        return pd.concat([series[~mask], others])
+    return series
+
+# 최근 정비일자 계산
+@stage('정비일자 계산')
+def calculate_previous_maintenance_dates(df, *, diagnostics):
+    """각 관리번호별 이전 정비일자 계산"""
+    df_copy = df.copy()
+    
+    if '관리번호' not in df_copy.columns or '정비일자' not in df_copy.columns:
+        return df_copy
+
+    # 정비일자 정렬 및 그룹화
+    df_copy = df_copy.sort_values(['관리번호', '정비일자'])
+
+    # 각 관리번호별로 이전 정비일자 계산
+    df_copy['최근정비일자'] = df_copy.groupby('관리번호')['정비일자'].shift(1)
+
+    return df_copy
+
+# 조직도 데이터와 정비자번호/출고자 매핑
+@stage('조직도 데이터 매핑')
+def map_employee_data(df, org_df, *, diagnostics):
+    """정비자번호 또는 출고자를 조직도 데이터와 매핑"""
+    if org_df is None or df is None:
+        return df
+
+    try:
+        # 결과 데이터프레임 복사
+        result_df = df.copy()
+        org_temp = org_df.copy()
+
+        # 조직도의 사번을 문자열로 통일
+        org_temp['사번'] = org_temp['사번'].astype(str)
+
+        # 정비일지 데이터인 경우 (정비자번호 있음)
+        if '정비자번호' in result_df.columns:
+            # 정비자번호를 문자열로 변환
+            result_df['정비자번호'] = result_df['정비자번호'].astype(str)
+
+            # 소속 정보만 가져오기 (left join)
+            result_df = pd.merge(
+                result_df,
+                org_temp[['사번', '소속']],
+                left_on='정비자번호',
+                right_on='사번',
+                how='left'
+            )
+
+            # 소속 컬럼명 변경 및 중복 컬럼 제거
+            result_df.rename(columns={'소속': '정비자소속'}, inplace=True)
+            if '사번' in result_df.columns:
+                result_df.drop('사번', axis=1, inplace=True)
+
+        # 수리비 데이터인 경우 (출고자 있음)
+        elif '출고자' in result_df.columns:
+            # 출고자를 문자열로 변환
+            result_df['출고자'] = result_df['출고자'].astype(str)
+
+            # 소속 정보만 가져오기 (left join)
+            result_df = pd.merge(
+                result_df,
+                org_temp[['사번', '소속']],
+                left_on='출고자',
+                right_on='사번',
+                how='left'
+            )
+
+            # 소속 컬럼명 변경 및 중복 컬럼 제거
+            result_df.rename(columns={'소속': '출고자소속'}, inplace=True)
+            if '사번' in result_df.columns:
+                result_df.drop('사번', axis=1, inplace=True)
+
+        return result_df
+
+    except Exception as e:
+        diagnostics.error(f"직원 데이터 매핑 중 오류 발생: {e}")
+        diagnostics.error(traceback.format_exc())
+        return df
+
+# 두 데이터프레임 병합 함수 - 브랜드 매핑 문제 해결
+@stage('자산 데이터 병합')
+def merge_dataframes(df1, df2, *, diagnostics):
+    """정비일지 데이터와 자산조회 데이터 병합"""
+    if df1 is None or df2 is None:
+        return df1
+
+    try:
+        # 데이터 복사
+        df1_copy = df1.copy()
+        df2_copy = df2.copy()
+        
+        # 데이터 타입 통일 - 관리번호를 문자열로 변환
+        df1_copy['관리번호'] = df1_copy['관리번호'].astype(str)
+        df2_copy['관리번호'] = df2_copy['관리번호'].astype(str)
+        
+        # 중복 관리번호 확인 및 제거 (자산 데이터에서)
+        if df2_copy['관리번호'].duplicated().any():
+            # 중복 제거 (첫 번째 값 유지)
+            df2_copy = df2_copy.drop_duplicates(subset='관리번호')
+            
+        # 자산 데이터에서 필요한 컬럼만 선택
+        df2_subset = df2_copy[['관리번호', '제조사명', '제조사모델명', '제조년도', '취득가', '자재내역']]
+        
+        # 컬럼명 표준화: 제조사명 -> 브랜드, 제조사모델명 -> 모델명
+        df2_subset = df2_subset.rename(columns={
+            '제조사명': '브랜드',
+            '제조사모델명': '모델명'
+        })
+        
+        # 관리번호 컬럼을 기준으로 왼쪽 조인으로 병합 (AS 데이터는 모두 유지)
+        merged_df = pd.merge(df1_copy, df2_subset, on='관리번호', how='left')
+            
+        # 브랜드 컬럼 처리
+        if '브랜드_x' in merged_df.columns and '브랜드_y' in merged_df.columns:
+            # 두 컬럼이 모두 있는 경우 - 병합 처리
+            merged_df['브랜드'] = merged_df['브랜드_x'].fillna(merged_df['브랜드_y'])
+            # 원본 컬럼 삭제
+            merged_df = merged_df.drop(['브랜드_x', '브랜드_y'], axis=1)
+        elif '브랜드_y' in merged_df.columns:
+            # 자산 데이터의 브랜드만 있는 경우
+            merged_df['브랜드'] = merged_df['브랜드_y']
+            merged_df = merged_df.drop(['브랜드_y'], axis=1)
+        elif '브랜드_x' in merged_df.columns:
+            # AS 데이터의 브랜드만 있는 경우
+            merged_df['브랜드'] = merged_df['브랜드_x']
+            merged_df = merged_df.drop(['브랜드_x'], axis=1)
+        
+        # 브랜드에 여전히 NaN이 있으면 '기타'로 채움
+        if '브랜드' in merged_df.columns:
+            merged_df['브랜드'] = merged_df['브랜드'].fillna('기타')
+        else:
+            # 브랜드 컬럼이 없는 경우 새로 생성
+            merged_df['브랜드'] = '기타'
+        
+        # 모델명 처리 (브랜드와 동일한 방식)
+        if '모델명_x' in merged_df.columns and '모델명_y' in merged_df.columns:
+            merged_df['모델명'] = merged_df['모델명_x'].fillna(merged_df['모델명_y'])
+            merged_df = merged_df.drop(['모델명_x', '모델명_y'], axis=1)
+        elif '모델명_y' in merged_df.columns:
+            merged_df['모델명'] = merged_df['모델명_y']
+            merged_df = merged_df.drop(['모델명_y'], axis=1)
+        elif '모델명_x' in merged_df.columns:
+            merged_df['모델명'] = merged_df['모델명_x']
+            merged_df = merged_df.drop(['모델명_x'], axis=1)
+            
+        # 자재내역 컬럼 분할 (있는 경우만)
+        if '자재내역' in merged_df.columns and merged_df['자재내역'].notna().any():
+            # 자재내역에서 추가 정보 추출 (공백으로 나누기)
+            split_result = merged_df['자재내역'].str.split(' ', n=3, expand=True)
+            # 결과가 있을 때만 컬럼 추가
+            if len(split_result.columns) >= 4:
+                merged_df[['연료', '운전방식', '적재용량', '마스트']] = split_result
+            else:
+                # 결과 컬럼 수가 부족한 경우 빈 컬럼 생성
+                for i, col_name in enumerate(['연료', '운전방식', '적재용량', '마스트']):
+                    if i < len(split_result.columns):
+                        merged_df[col_name] = split_result[i]
+                    else:
+                        merged_df[col_name] = None
+
+        # 브랜드와 모델명으로 브랜드_모델 컬럼 생성
+        if '브랜드' in merged_df.columns and '모델명' in merged_df.columns:
+            mask = merged_df['브랜드'].notna() & merged_df['모델명'].notna()
+            merged_df.loc[mask, '브랜드_모델'] = merged_df.loc[mask, '브랜드'].astype(str) + '_' + merged_df.loc[mask, '모델명'].astype(str)
+        
+        # 고장유형 조합 (이제 브랜드가 적절히 설정되었으므로 수행)
+        if all(col in merged_df.columns for col in ['작업유형', '정비대상', '정비작업']):
+            # nan 값을 가진 행 필터링하여 처리
+            mask = merged_df['작업유형'].notna() & merged_df['정비대상'].notna() & merged_df['정비작업'].notna()
+            merged_df.loc[mask, '고장유형'] = (merged_df.loc[mask, '작업유형'].astype(str) + '_' + 
+                                            merged_df.loc[mask, '정비대상'].astype(str) + '_' + 
+                                            merged_df.loc[mask, '정비작업'].astype(str))
+
+        return merged_df
+    except Exception as e:
+        diagnostics.error(f"데이터 병합 중 오류 발생: {e}")
+        diagnostics.error(traceback.format_exc())
+        return df1
+
+@stage('수리비 매핑')
+def merge_repair_costs(maintenance_df, parts_df, *, diagnostics):
+    """
+    정비일지와 소모품 데이터를 병합하여 수리비와 사용부품을 계산합니다.
+    조건:
+    - 관리번호 일치
+    - 정비자번호 == 출고자
+    - 정비일자와 출고일자 간 차이가 ±30일 이내
+    """
+    if maintenance_df is None or parts_df is None:
+        return maintenance_df
+
+    try:
+        df1 = maintenance_df.copy()
+        df3 = parts_df.copy()
+
+        # 필수 컬럼 확인
+        required_cols_df1 = ['관리번호', '정비일자', '정비자번호']
+        required_cols_df3 = ['관리번호', '출고일자', '출고자', '출고금액', '자재명']
+        for col in required_cols_df1 + required_cols_df3:
+            if col not in (df1.columns if col in required_cols_df1 else df3.columns):
+                diagnostics.warning(f"필수 컬럼 누락: '{col}'")
+                return df1
+
+        # 타입 정리
+        df1['관리번호'] = df1['관리번호'].astype(str)
+        df1['정비자번호'] = df1['정비자번호'].fillna("").astype(str)
+        df1['정비일자'] = pd.to_datetime(df1['정비일자'], errors='coerce')
+
+        df3['관리번호'] = df3['관리번호'].astype(str)
+        df3['출고자'] = df3['출고자'].astype(str).fillna("")
+        df3['출고일자'] = pd.to_datetime(df3['출고일자'], errors='coerce')
+        df3['자재명'] = df3['자재명'].fillna("")
+        df3['출고금액'] = pd.to_numeric(df3['출고금액'], errors='coerce').fillna(0)
+
+        # 행 위치를 저장 (부품 매칭 결과를 정비 건과 연결하는 키)
+        df1['원본인덱스'] = np.arange(len(df1))
+
+        # 병합: 관리번호 + 정비자번호 매칭
+        merged = pd.merge(
+            df1[['관리번호', '정비일자', '정비자번호', '원본인덱스']],
+            df3[['관리번호', '출고일자', '출고자', '출고금액', '자재명']],
+            left_on=['관리번호', '정비자번호'],
+            right_on=['관리번호', '출고자'],
+            how='inner'
+        )
+
+        # 날짜 차이 필터
+        merged['일자차이'] = (merged['출고일자'] - merged['정비일자']).dt.days
+        merged = merged[merged['일자차이'].abs() <= 30]
+
+        # 수리비 집계
+        cost_summary = merged.groupby('원본인덱스')['출고금액'].sum()
+
+        # (정비 건, 자재명) 매칭 쌍은 그대로 보관 (부품 동시사용 분석용, 정비 건별 중복 자재는 합침)
+        part_pairs = (merged[merged['자재명'] != ""]
+                      .groupby(['원본인덱스', '자재명'], sort=True, as_index=False)['출고금액'].sum()
+                      .rename(columns={'원본인덱스': '행번호'}))
+        diagnostics.stats['part_pairs'] = part_pairs
+        parts_summary = part_pairs.groupby('행번호')['자재명'].agg(', '.join)
+
+        # 결과 반영
+        df1['수리비'] = df1['원본인덱스'].map(cost_summary).fillna(0)
+        df1['사용부품'] = df1['원본인덱스'].map(parts_summary).fillna("")
+
+        df1.drop('원본인덱스', axis=1, inplace=True)
+
+        # 매칭 결과 기록
+        total = len(df1)
+        matched = int((df1['수리비'] > 0).sum())
+        match_rate = (matched / total * 100) if total > 0 else 0
+        diagnostics.stats['match'] = {'total': total, 'matched': matched, 'rate': match_rate}
+        diagnostics.info(f"총 {total}건 중 {matched}건 수리비 매칭됨 ({match_rate:.1f}%)")
+
+        return df1
+
+    except Exception as e:
+        diagnostics.error("병합 중 오류 발생: " + str(e))
+        diagnostics.error(traceback.format_exc())
+        df1['수리비'] = 0
+        df1['사용부품'] = ""
+        return df1
+
+# 재정비 간격 계산을 위한 날짜 처리
+@stage('날짜 처리')
+def process_date_columns(df, *, diagnostics):
+    """날짜 컬럼 처리 및 재정비 간격 계산"""
+    df_copy = df.copy()
+    
+    try:
+        date_columns = ['정비일자', '최근정비일자']
+        for col in date_columns:
+            if col in df_copy.columns:
+                try:
+                    # 기본 날짜 변환 시도
+                    df_copy[col] = pd.to_datetime(df_copy[col], errors='coerce')
+                except Exception:
+                    try:
+                        # Excel 날짜 숫자 처리 시도
+                        df_copy[col] = pd.to_datetime(df_copy[col], origin='1899-12-30', unit='D', errors='coerce')
+                    except Exception:
+                        pass
+
+        # 재정비 간격 계산 (정비일자 - 최근정비일자)
+        if '최근정비일자' in df_copy.columns and '정비일자' in df_copy.columns:
+            df_copy['재정비간격'] = (df_copy['정비일자'] - df_copy['최근정비일자']).dt.days
+            # 30일 내 재정비 여부
+            df_copy['30일내재정비'] = (df_copy['재정비간격'] <= 30) & (df_copy['재정비간격'] > 0)
+
+    except Exception as e:
+        diagnostics.error(f"날짜 처리 중 오류 발생: {e}")
+        diagnostics.error(traceback.format_exc())
+    
+    return df_copy
+
+# 정비일지 데이터 전처리
+@stage('정비일지 전처리')
+def preprocess_maintenance_data(df, *, diagnostics):
+    """정비일지 데이터 전처리 함수"""
+    try:
+        # 컬럼명 정리 (줄바꿈, 공백 제거)
+        df.columns = [str(col).strip().replace('\n', '') for col in df.columns]
+        
+        # 정비구분 컬럼 전처리
+        if '정비구분' in df.columns:
+            df['정비구분'] = df['정비구분'].astype(str).apply(lambda x: x.strip().replace('\n', '') if not pd.isna(x) else x)
+            # 'nan' 문자열을 실제 NaN으로 변환
+            df.loc[df['정비구분'] == 'nan', '정비구분'] = np.nan
+            
+            # 내부/외부 값 표준화 (대소문자 구분 없이)
+            def standardize_maintenance_type(value):
+                if pd.isna(value):
+                    return value
+                value_lower = str(value).lower()
+                if '내부' in value_lower:
+                    return '내부'
+                elif '외부' in value_lower:
+                    return '외부'
+                return value
+            
+            df['정비구분'] = df['정비구분'].apply(standardize_maintenance_type)
+        
+        # 수치형 데이터 처리
+        numeric_columns = ['가동시간', '수리시간', '수리비']
+        for col in numeric_columns:
+            if col in df.columns:
+                # 숫자가 아닌 값을 NaN으로 변환
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        return df
+    
+    except Exception as e:
+        diagnostics.error(f"정비일지 데이터 전처리 중 오류 발생: {e}")
+        return df
+
+# 소속별 수리비 통계 계산
+@stage('소속별 수리비 통계')
+def calculate_dept_repair_stats(df, df4=None, *, diagnostics):
+    """소속별 수리비 통계 계산 함수"""
+    try:
+        if '정비자소속' in df.columns and '수리비' in df.columns:
+            # 유효한 데이터만 필터링
+            df_valid = df[['정비자소속', '수리비']].copy()
+            df_valid = df_valid.dropna()
+            
+            if not df_valid.empty:
+                # 소속별 총 수리비 및 건수 계산
+                dept_stats = df_valid.groupby('정비자소속').agg({
+                    '수리비': ['sum', 'mean', 'count']
+                })
+                
+                dept_stats.columns = ['총수리비', '평균수리비', '건수']
+                dept_stats = dept_stats.reset_index()
+                
+                # 조직도 데이터에서 소속별 인원 수 가져오기
+                if df4 is not None and '소속' in df4.columns:
+                    total_staff_by_dept = df4['소속'].value_counts()
+                    
+                    # 소속별 인원 수 매핑
+                    dept_stats['소속인원수'] = dept_stats['정비자소속'].map(
+                        lambda x: total_staff_by_dept.get(x, 1)
+                    )
+                else:
+                    # 조직도 데이터가 없으면 기본값 1 설정
+                    dept_stats['소속인원수'] = 1
+                
+                # 인원당 수리비 계산
+                dept_stats['인원당수리비'] = (dept_stats['총수리비'] / dept_stats['소속인원수']).round(0)
+                
+                return dept_stats
+            
+        return None
+    except Exception as e:
+        diagnostics.warning(f"소속별 수리비 통계 계산 중 오류 발생: {e}")
+        return None
+
+# 수리비 데이터 전처리
+@stage('수리비 데이터 전처리')
+def preprocess_repair_costs(df, *, diagnostics):
+    """수리비 데이터 전처리"""
+    df_copy = df.copy()
+    
+    try:
+        # 날짜 변환
+        if '출고일자' in df_copy.columns:
+            df_copy['출고일자'] = pd.to_datetime(df_copy['출고일자'], errors='coerce')
+
+        # 금액 컬럼 숫자로 변환
+        for col in df_copy.columns:
+            if '금액' in col or '비용' in col or '단가' in col:
+                df_copy[col] = pd.to_numeric(df_copy[col], errors='coerce')
+    except Exception as e:
+        diagnostics.warning(f"수리비 데이터 전처리 중 오류가 발생했습니다: {e}")
+    
+    return df_copy
+
+def generate_fault_type_column(df):
+    if all(col in df.columns for col in ['작업유형', '정비대상', '정비작업']):
+        mask = df['작업유형'].notna() & df['정비대상'].notna() & df['정비작업'].notna()
+        df.loc[mask, '고장유형'] = df.loc[mask, ['작업유형', '정비대상', '정비작업']].astype(str).agg('_'.join, axis=1)
+        df['고장유형'] = df['고장유형'].replace('nan_nan_nan', np.nan)
+    return df
\ No newline at end of file
@@ -0,0 +1,179 @@
+# utils/export.py
+
+import io
+import os
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from utils import monthly_report as report
+
+
+def safe_name(value):
+    """파일/시트 이름에 쓸 수 없는 문자 치환"""
+    return re.sub(r'[\\/:*?"<>|\[\]]', '_', str(value))
+
+
+# 청크 단위 직렬화 크기 (행)
+CHUNK_ROWS = 50_000
+# 엑셀 시트 한 장의 최대 행 수 (머리글 포함)
+EXCEL_MAX_ROWS = 1_048_576
+
+
+class _open_binary:
+    """경로면 파일을 열고 닫으며, 파일 객체면 그대로 사용"""
+
+    def __init__(self, target):
+        self.target = target
+        self.file = None
+
+    def __enter__(self):
+        if isinstance(self.target, (str, os.PathLike)):
+            self.file = open(self.target, 'wb')
+            return self.file
+        return self.target
+
+    def __exit__(self, *exc):
+        if self.file is not None:
+            self.file.close()
+
+
+def _parquet_ready(frame):
+    """
+    Period/Categorical/혼합 object 컬럼을 문자열로 변환 (parquet 스키마 고정)
+    pandas 문자열 dtype으로 바꾸므로 결측값은 'None'/'nan' 문자열이 되지 않고 그대로 결측값으로 저장
+    """
+    frame = frame.copy()
+    frame.columns = [str(col) for col in frame.columns]
+    return frame.astype({col: 'string' for col in frame.columns if frame[col].dtype == object or
+                         isinstance(frame[col].dtype, (pd.CategoricalDtype, pd.PeriodDtype))})
+
+
+def iter_csv_chunks(frame, index=True, chunk_rows=CHUNK_ROWS):
+    """UTF-8-BOM CSV를 청크 단위 bytes로 생성 (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    yield '\ufeff'.encode('utf-8')
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=index, header=(start == 0)).encode('utf-8')
+
+
+def write_csv(frame, target, index=True):
+    """CSV를 청크 단위로 파일(경로 또는 바이너리 파일 객체)에 기록"""
+    with _open_binary(target) as f:
+        for chunk in iter_csv_chunks(frame, index=index):
+            f.write(chunk)
+
+
+def write_parquet(frame, target, index=True, chunk_rows=CHUNK_ROWS):
+    """parquet를 행 그룹(청크) 단위로 기록"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    frame = _parquet_ready(frame.reset_index() if index else frame)
+    # 스키마는 첫 청크 기준 (object 컬럼은 모두 문자열로 변환되어 청크 간 타입이 같음)
+    schema = pa.Schema.from_pandas(frame.iloc[:chunk_rows], preserve_index=False)
+    with _open_binary(target) as f, pq.ParquetWriter(f, schema) as writer:
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _cell_value(value):
+    """엑셀 셀 값 변환 (결측값은 빈 셀, Period 등은 문자열)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if isinstance(value, (str, int, float, bool, pd.Timestamp)):
+        return value
+    return str(value)
+
+
+def _sheet_names(name, parts):
+    """표 이름 → 시트 이름 목록 (여러 시트로 나누면 '_2', '_3' ... 접미어, 31자 제한)"""
+    base = safe_name(name)
+    if parts == 1:
+        return [base[:31]]
+    return [base[:31 - len(f'_{part}')] + f'_{part}' if part > 1 else base[:31] for part in range(1, parts + 1)]
+
+
+def write_xlsx(tables, target, index=True, max_rows=EXCEL_MAX_ROWS):
+    """
+    여러 테이블을 시트별로 기록 (openpyxl write-only 모드: 행을 순서대로 흘려 쓰므로 메모리 사용이 일정)
+    시트 최대 행 수(max_rows, 머리글 포함)를 넘는 표는 같은 머리글로 여러 시트에 나눠 기록
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet_rows = max_rows - 1
+    for name, table in tables.items():
+        frame = table.reset_index() if index else table
+        parts = max(-(-len(frame) // sheet_rows), 1)
+        for part, sheet_name in enumerate(_sheet_names(name, parts)):
+            sheet = workbook.create_sheet(title=sheet_name)
+            sheet.append([str(col) for col in frame.columns])
+            end = min((part + 1) * sheet_rows, len(frame))
+            for start in range(part * sheet_rows, end, CHUNK_ROWS):
+                for row in frame.iloc[start:min(start + CHUNK_ROWS, end)].itertuples(index=False, name=None):
+                    sheet.append([_cell_value(value) for value in row])
+    with _open_binary(target) as f:
+        workbook.save(f)
+
+
+def export_bytes(tables, file_format, index=True):
+    """
+    다운로드용 파일 내용 생성
+    - 테이블 하나: csv/parquet/xlsx 파일
+    - 여러 테이블: xlsx는 시트별, csv/parquet는 테이블별 파일을 zip으로 묶음
+    """
+    buffer = io.BytesIO()
+    if file_format == 'xlsx':
+        write_xlsx(tables, buffer, index=index)
+    elif len(tables) == 1:
+        writer = write_csv if file_format == 'csv' else write_parquet
+        writer(next(iter(tables.values())), buffer, index=index)
+    else:
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, table in tables.items():
+                with archive.open(f'{safe_name(name)}.{file_format}', 'w') as f:
+                    (write_csv if file_format == 'csv' else write_parquet)(table, f, index=index)
+    return buffer.getvalue()
+
+
+def write_report_bundle(tables, bundle_dir, bundle_name, formats):
+    """리포트 테이블 묶음을 지정한 형식으로 저장"""
+    os.makedirs(bundle_dir, exist_ok=True)
+    written = []
+
+    for name, table in tables.items():
+        if 'csv' in formats:
+            path = os.path.join(bundle_dir, f'{safe_name(name)}.csv')
+            write_csv(table, path)
+            written.append(path)
+        if 'parquet' in formats:
+            # Period/Categorical 인덱스는 문자열로 변환 후 저장
+            path = os.path.join(bundle_dir, f'{safe_name(name)}.parquet')
+            write_parquet(table, path)
+            written.append(path)
+
+    if 'xlsx' in formats:
+        path = os.path.join(bundle_dir, f'{safe_name(bundle_name)}.xlsx')
+        write_xlsx(tables, path)
+        written.append(path)
+
+    return written
+
+
+def export_report_bundle(month_df, year, month, equipment_filter, maintenance_type, output_dir, formats):
+    """필터 조합 하나의 리포트 테이블을 계산하고 저장 (배치 작업 프로세스에서 실행)"""
+    filtered_df = report.filter_month(month_df, year, month, equipment_filter, maintenance_type)
+    if filtered_df.empty:
+        return None
+
+    tables = report.build_report_tables(filtered_df)
+    bundle_name = f'{year}-{month:02d}_{equipment_filter}_{maintenance_type}'
+    bundle_dir = os.path.join(output_dir, f'{year}-{month:02d}', safe_name(equipment_filter), safe_name(maintenance_type))
+    written = write_report_bundle(tables, bundle_dir, bundle_name, formats)
+    return bundle_name, len(filtered_df), written
@@ -0,0 +1,78 @@
+# utils/figure_cache.py
+# 차트 캐시
+# 같은 집계 결과와 같은 차트 설정이면 Plotly 차트(figure 객체)를 다시 만들지 않고 재사용합니다.
+# (직렬화는 st.plotly_chart가 매번 하므로 여기서는 figure만 보관)
+# 서버 프로세스 전체에서 공유하며 최근에 사용한 항목부터 max_entries개만 보관합니다 (LRU).
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def data_fingerprint(*parts):
+    """집계 결과(DataFrame/Series)와 차트 설정 값들의 지문"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+            columns = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+            digest.update(repr(list(columns)).encode())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """(지문 → Plotly figure) LRU 캐시"""
+
+    def __init__(self, max_entries=256):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def _get(self, key):
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+            return figure
+
+    def _put(self, key, figure):
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def figure(self, key_parts, build):
+        """
+        key_parts(집계 결과 + 차트 설정)가 같으면 캐시된 Plotly figure를 반환하고, 없으면 build()로 만들어 보관
+        반환된 figure는 여러 세션이 공유하므로 수정하지 않고 표시만 합니다.
+        """
+        key = data_fingerprint(*key_parts)
+        figure = self._get(key)
+        if figure is None:
+            figure = build()
+            self._put(key, figure)
+        return figure
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_figure_cache():
+    """서버 프로세스 전체에서 공유하는 차트 캐시"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FigureCache()
+        return _cache
+
+
+def cached_figure(key_parts, build):
+    """get_figure_cache().figure()의 단축 함수"""
+    return get_figure_cache().figure(key_parts, build)
@@ -0,0 +1,131 @@
+# utils/fleet.py
+# 보유 장비 모수 인덱스 (Streamlit 의존성 없음)
+# 자산조회 데이터에서 브랜드/모델/연식구간/연료·운전방식별 보유 대수를 한 번만 세어 두고,
+# AS 건수·수리비를 관리번호로 자산에 연결해 같은 기준의 대당 AS 건수/대당 수리비를 계산합니다.
+# - 자산별 차원 코드는 미리 만들어 두므로, 집계는 관리번호 위치 찾기 + bincount 한 번
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from utils.monthly_report import AGE_BINS, AGE_LABELS
+
+# 기준 차원 {이름: 묶을 자산 속성}
+FLEET_DIMENSIONS = {
+    '브랜드': ('브랜드',),
+    '브랜드_모델': ('브랜드_모델',),
+    '연식구간': ('연식구간',),
+    '연료': ('연료',),
+    '운전방식': ('운전방식',),
+    '연료/운전방식': ('연료', '운전방식'),
+}
+UNKNOWN = "미상"
+
+
+def asset_attributes(asset_df, current_year=None):
+    """
+    자산조회 데이터 → 관리번호별 속성 (브랜드, 모델명, 브랜드_모델, 제조년도, 연식구간, 연료, 운전방식)
+    컬럼 이름/자재내역 분할은 정비일지 병합(engine.merge_dataframes)과 같은 규칙
+    """
+    current_year = current_year or pd.Timestamp.now().year
+    assets = asset_df.copy()
+    assets['관리번호'] = assets['관리번호'].astype(str)
+    assets = assets.drop_duplicates(subset='관리번호')
+    assets = assets.rename(columns={'제조사명': '브랜드', '제조사모델명': '모델명'})
+
+    attributes = pd.DataFrame(index=pd.Index(assets['관리번호'].to_numpy(), name='관리번호'))
+    for column in ['브랜드', '모델명']:
+        values = assets[column] if column in assets.columns else pd.Series(None, index=assets.index, dtype=object)
+        attributes[column] = values.fillna(UNKNOWN).astype(str).to_numpy()
+    attributes['브랜드_모델'] = attributes['브랜드'] + '_' + attributes['모델명']
+
+    years = pd.to_numeric(assets['제조년도'], errors='coerce') if '제조년도' in assets.columns \
+        else pd.Series(np.nan, index=assets.index)
+    attributes['제조년도'] = years.to_numpy()
+    bands = pd.cut(current_year - years, bins=AGE_BINS, labels=AGE_LABELS)
+    attributes['연식구간'] = bands.cat.add_categories([UNKNOWN]).fillna(UNKNOWN).to_numpy()
+
+    if '자재내역' in assets.columns:
+        split_result = assets['자재내역'].astype('string').str.split(' ', n=3, expand=True)
+    else:
+        split_result = pd.DataFrame(index=assets.index)
+    for i, column in enumerate(['연료', '운전방식']):
+        values = split_result[i] if i in split_result.columns else pd.Series(None, index=assets.index, dtype=object)
+        attributes[column] = values.fillna(UNKNOWN).astype(str).to_numpy()
+    return attributes
+
+
+class FleetIndex:
+    """차원별 보유 대수 인덱스 (자산조회 데이터마다 한 번 생성해 재사용)"""
+
+    def __init__(self, asset_df, dimensions=FLEET_DIMENSIONS, current_year=None):
+        self.attributes = asset_attributes(asset_df, current_year)
+        self.size = len(self.attributes)
+        # 자산 속성 지문 (페이지 집계 캐시의 키로 사용)
+        self.version = hashlib.sha256(
+            pd.util.hash_pandas_object(self.attributes.astype(str), index=True).values.tobytes()).hexdigest()
+        # 차원별 (자산 위치 → 그룹 번호, 그룹 이름, 그룹별 보유 대수)
+        self._codes = {}
+        self.counts = {}
+        for name, columns in dimensions.items():
+            if len(columns) > 1:
+                keys = self.attributes[list(columns)].astype(str).agg(' / '.join, axis=1)
+            else:
+                keys = self.attributes[columns[0]]
+            sort = name != '연식구간'
+            codes, names = pd.factorize(keys, sort=sort)
+            if name == '연식구간':
+                # 연식구간은 구간 순서대로
+                order = [label for label in AGE_LABELS + [UNKNOWN] if label in set(names)]
+                remap = np.array([order.index(label) for label in names])
+                codes, names = remap[codes], pd.Index(order)
+            self._codes[name] = codes
+            self.counts[name] = pd.Series(np.bincount(codes, minlength=len(names)),
+                                          index=pd.Index(names, name=name), name='보유대수')
+
+    @property
+    def dimensions(self):
+        return list(self.counts)
+
+    def locate(self, asset_ids):
+        """관리번호 → 자산 위치 (자산조회에 없으면 -1)"""
+        return self.attributes.index.get_indexer(pd.Index(asset_ids).astype(str))
+
+    def rates(self, df, dimension):
+        """
+        df(정비일지)의 AS 건수/수리비를 자산조회 기준 dimension 그룹에 연결한 대당 지표
+        반환 컬럼: 보유대수, AS건수, AS장비수, 수리비, 대당AS건수, 대당수리비, AS발생률(%)
+        자산조회에 없는 장비의 AS는 제외 (건수는 unmatched_cases(df)로 확인)
+        """
+        counts = self.counts[dimension]
+        codes = self._codes[dimension]
+        positions = self.locate(df['관리번호'])
+        matched = positions >= 0
+        groups = codes[positions[matched]]
+        n_groups = len(counts)
+
+        cases = np.bincount(groups, minlength=n_groups)
+        if '수리비' in df.columns:
+            cost = np.nan_to_num(pd.to_numeric(df['수리비'], errors='coerce').to_numpy(dtype=float)[matched])
+        else:
+            cost = np.zeros(len(groups))
+        costs = np.bincount(groups, weights=cost, minlength=n_groups)
+        # 장비 수는 AS가 있었던 자산 위치의 고유값으로
+        assets_with_as = np.bincount(codes[np.unique(positions[matched])], minlength=n_groups)
+
+        fleet = counts.to_numpy()
+        result = pd.DataFrame({
+            '보유대수': fleet,
+            'AS건수': cases,
+            'AS장비수': assets_with_as,
+            '수리비': costs,
+        }, index=counts.index)
+        result['대당AS건수'] = (result['AS건수'] / fleet).round(3)
+        result['대당수리비'] = (result['수리비'] / fleet).round(0)
+        result['AS발생률(%)'] = (result['AS장비수'] / fleet * 100).round(1)
+        return result
+
+    def unmatched_cases(self, df):
+        """자산조회에 없는 관리번호의 AS 건수"""
+        return int((self.locate(df['관리번호']) < 0).sum())
@@ -0,0 +1,169 @@
+# utils/geocode.py
+# 주소 → 시군구 대표 좌표 오프라인 변환 (Streamlit 의존성 없음)
+# 외부 지오코딩 API 없이 data/시군구_좌표.csv(시도/시군구별 대표 좌표)로 토큰 트라이를 만들고,
+# 주소를 공백 단위로 앞에서부터 따라가며 가장 깊게 일치한 시군구(없으면 시도)의 좌표를 씁니다.
+# - 고유 주소마다 한 번만 찾고 행 단위 결과는 factorize 코드로 펼침
+# - 지도에는 시군구별로 미리 집계한 값을 표시하고, 가까운 시군구는 격자 단위로 서버에서 묶어 마커 수를 줄임
+
+import re
+
+import numpy as np
+import pandas as pd
+
+CENTROID_PATH = "data/시군구_좌표.csv"
+
+# 시도 전체 이름 → 정비일지 주소에서 쓰는 줄임말
+PROVINCE_ALIASES = {
+    '서울특별시': '서울', '서울시': '서울', '부산광역시': '부산', '부산시': '부산', '대구광역시': '대구', '대구시': '대구',
+    '인천광역시': '인천', '인천시': '인천', '광주광역시': '광주', '대전광역시': '대전', '대전시': '대전',
+    '울산광역시': '울산', '울산시': '울산', '세종특별자치시': '세종', '경기도': '경기', '강원도': '강원',
+    '강원특별자치도': '강원', '충청북도': '충북', '충청남도': '충남', '전라북도': '전북', '전북특별자치도': '전북',
+    '전라남도': '전남', '경상북도': '경북', '경상남도': '경남', '제주도': '제주', '제주특별자치도': '제주',
+}
+# 격자 한 칸 크기 계산용 (위도 1도 ≈ 111km, 경도는 한반도 중간 위도 기준)
+KM_PER_DEGREE = 111.0
+LONGITUDE_SCALE = np.cos(np.radians(36.5))
+
+SUMMARY_COLUMNS = ['시도', '시군구', '위도', '경도', '건수', '수리비', '현장수', '장비수', '평균수리비']
+
+_SPLIT = re.compile(r"[\s,]+")
+
+
+class RegionIndex:
+    """시도 → 시 → 구 토큰 트라이 (좌표표마다 한 번 생성해 재사용)"""
+
+    def __init__(self, centroids):
+        """centroids: 시도, 시군구('수원시 장안구'처럼 공백으로 단계 구분, 시도 자체 좌표는 빈 값), 위도, 경도"""
+        table = centroids.copy()
+        table['시군구'] = table['시군구'].fillna("").astype(str).str.strip()
+        self.entries = table[['시도', '시군구', '위도', '경도']].reset_index(drop=True)
+        # 노드: {'entry': 좌표표 위치 또는 None, 'children': {토큰: 노드}}
+        self._root = {'entry': None, 'children': {}}
+        for position, (province, district) in enumerate(zip(self.entries['시도'], self.entries['시군구'])):
+            node = self._root
+            for token in [province] + district.split():
+                node = node['children'].setdefault(token, {'entry': None, 'children': {}})
+            node['entry'] = position
+
+        # '경기 분당구'처럼 시를 빼고 쓴 일반구: 같은 시도 안에서 이름이 하나뿐이면 시도 바로 아래에서도 찾도록 연결
+        for province_node in self._root['children'].values():
+            nested = {}
+            for city_node in province_node['children'].values():
+                for name, node in city_node['children'].items():
+                    nested.setdefault(name, []).append(node)
+            for name, nodes in nested.items():
+                if len(nodes) == 1 and name not in province_node['children']:
+                    province_node['children'][name] = nodes[0]
+
+    @classmethod
+    def from_csv(cls, path=CENTROID_PATH):
+        return cls(pd.read_csv(path, encoding='utf-8-sig', dtype={'시도': str, '시군구': str}))
+
+    def lookup(self, address):
+        """주소 하나 → 가장 깊게 일치한 좌표표 위치 (시도도 모르면 -1)"""
+        if not isinstance(address, str):
+            return -1
+        node, found = self._root, -1
+        for depth, token in enumerate(_SPLIT.split(address.strip(), maxsplit=3)[:3]):
+            if depth == 0:
+                token = PROVINCE_ALIASES.get(token, token)
+            node = node['children'].get(token)
+            if node is None:
+                break
+            if node['entry'] is not None:
+                found = node['entry']
+        return found
+
+    def resolve(self, addresses):
+        """
+        주소 배열 → 행별 좌표표 위치 배열 (찾지 못하면 -1)
+        고유 주소마다 한 번만 트라이를 따라감
+        """
+        codes, uniques = pd.factorize(pd.Series(addresses, dtype=object))
+        positions = np.fromiter((self.lookup(address) for address in uniques), dtype=np.int64, count=len(uniques))
+        return np.where(codes >= 0, positions[np.maximum(codes, 0)] if len(positions) else -1, -1)
+
+    def summarize(self, df, level='시군구'):
+        """
+        주소별 AS 건수/수리비를 시군구(level='시도'면 시도) 단위로 집계
+        반환 컬럼: 시도, 시군구, 위도, 경도, 건수, 수리비, 현장수, 장비수, 평균수리비 (건수 내림차순)
+        시도까지만 찾은 주소는 시군구 단위에서도 시도 좌표에 모임 (시군구 값은 빈 문자열)
+        """
+        positions = self.resolve(df['주소'])
+        matched = positions >= 0
+        entries = self.entries
+        if level == '시도':
+            # 시도 자체 좌표 행으로 올림
+            province_rows = entries.index[entries['시군구'] == ""]
+            province_of = pd.Series(province_rows, index=entries.loc[province_rows, '시도'])
+            positions = np.where(matched, province_of.reindex(entries['시도'].to_numpy()[np.maximum(positions, 0)])
+                                 .fillna(-1).to_numpy(dtype=np.int64), -1)
+            matched = positions >= 0
+
+        groups, keys = pd.factorize(positions[matched])
+        n_groups = len(keys)
+        if '수리비' in df.columns:
+            cost = np.nan_to_num(pd.to_numeric(df['수리비'], errors='coerce').to_numpy(dtype=float)[matched])
+        else:
+            cost = np.zeros(int(matched.sum()))
+        summary = entries.iloc[keys].reset_index(drop=True)
+        summary['건수'] = np.bincount(groups, minlength=n_groups)
+        summary['수리비'] = np.bincount(groups, weights=cost, minlength=n_groups)
+        # 현장/장비 수는 (그룹, 값) 고유 쌍을 세어서
+        for column, source in [('현장수', '주소'), ('장비수', '관리번호')]:
+            if source in df.columns:
+                pairs = pd.DataFrame({'그룹': groups, '값': df[source].to_numpy()[matched]}).dropna().drop_duplicates()
+                summary[column] = np.bincount(pairs['그룹'].to_numpy(), minlength=n_groups)
+            else:
+                summary[column] = 0
+        summary['평균수리비'] = (summary['수리비'] / summary['건수']).round(0)
+        return summary[SUMMARY_COLUMNS].sort_values('건수', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def unresolved_addresses(df, index):
+    """좌표를 찾지 못한 주소별 건수 (주소가 있는데 시도부터 일치하지 않는 것)"""
+    addresses = df['주소']
+    missing = (index.resolve(addresses) < 0) & addresses.notna().to_numpy()
+    return addresses[missing].value_counts()
+
+
+def cluster_markers(summary, cell_km=None):
+    """
+    집계표를 cell_km 크기 격자로 묶은 마커 목록 (서버에서 미리 묶어 브라우저에 보내는 마커 수를 줄임)
+    각 마커 좌표는 건수 가중 평균, 이름은 건수가 가장 많은 지역 (+ 외 N곳)
+    반환 컬럼: 이름, 위도, 경도, 건수, 수리비, 지역수, 포함지역
+    """
+    columns = ['이름', '위도', '경도', '건수', '수리비', '지역수', '포함지역']
+    if summary.empty:
+        return pd.DataFrame(columns=columns)
+    names = (summary['시도'] + ' ' + summary['시군구']).str.strip().to_numpy(dtype=object)
+    latitude = summary['위도'].to_numpy(dtype=float)
+    longitude = summary['경도'].to_numpy(dtype=float)
+    if cell_km:
+        step = cell_km / KM_PER_DEGREE
+        cells = pd.DataFrame({'y': np.floor(latitude / step), 'x': np.floor(longitude * LONGITUDE_SCALE / step)})
+        groups, _ = pd.factorize(pd.MultiIndex.from_frame(cells))
+    else:
+        groups = np.arange(len(summary))
+    n_groups = groups.max() + 1
+
+    cases = summary['건수'].to_numpy(dtype=float)
+    weights = np.maximum(cases, 1)
+    totals = np.bincount(groups, weights=weights, minlength=n_groups)
+    # summary는 건수 내림차순이므로 그룹별 첫 행이 대표 지역
+    order = np.argsort(groups, kind='stable')
+    first = order[np.r_[True, groups[order][1:] != groups[order][:-1]]]
+    members = pd.Series(names).groupby(groups).agg(', '.join)
+    sizes = np.bincount(groups, minlength=n_groups)
+
+    markers = pd.DataFrame({
+        '이름': names[first],
+        '위도': np.bincount(groups, weights=latitude * weights, minlength=n_groups) / totals,
+        '경도': np.bincount(groups, weights=longitude * weights, minlength=n_groups) / totals,
+        '건수': np.bincount(groups, weights=cases, minlength=n_groups).astype(np.int64),
+        '수리비': np.bincount(groups, weights=summary['수리비'].to_numpy(dtype=float), minlength=n_groups),
+        '지역수': sizes,
+        '포함지역': members.reindex(groups[first]).to_numpy(),
+    })
+    markers.loc[markers['지역수'] > 1, '이름'] += ' 외 ' + (markers['지역수'] - 1).astype(str) + '곳'
+    return markers[columns].sort_values('건수', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,400 @@
+# utils/ingestion.py
+
+import io
+import os
+import sys
+import types
+import hashlib
+import atexit
+import weakref
+import threading
+from multiprocessing import spawn
+from multiprocessing.context import SpawnContext, SpawnProcess
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from utils import engine, dedup
+from utils.engine import Diagnostics, parse_log_excel, parse_static_excel, generate_fault_type_column
+
+# 내장 데이터 경로
+ASSET_DATA_PATH = "data/자산조회데이터.xlsx"
+ORG_DATA_PATH = "data/조직도데이터.xlsx"
+# 앱 디렉터리 (실행 위치나 작업 프로세스의 현재 디렉터리와 관계없이 같은 파일을 쓰기 위한 기준)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 현장명 별칭표 (업로드할 때마다 새 이름이 추가됨, 대표명은 직접 고쳐도 유지, 저장소에는 포함하지 않음)
+CLIENT_ALIAS_PATH = os.path.join(APP_DIR, "data", "현장명_별칭.csv")
+
+# 입력 파일 종류: 업로드 파일은 load_data 규칙(문자열 로드 + 형 변환), 내장 파일은 그대로 로드
+SOURCE_PARSERS = {
+    'log': parse_log_excel,
+    'static': parse_static_excel,
+}
+
+# 진행 상황 표시용 단계 이름
+STAGE_LABELS = {
+    'parse:asset': "자산조회 데이터 파싱",
+    'parse:org': "조직도 데이터 파싱",
+    'parse:maintenance': "정비일지 데이터 파싱",
+    'parse:parts': "소모품 출고 데이터 파싱",
+    'stage:maintenance': "정비일지 전처리 (중복 제거/자산 병합/지역/날짜/조직도)",
+    'stage:parts': "소모품 출고 전처리 (조직도 매핑)",
+    'finalize': "수리비 매핑 및 후처리",
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+# get_executor로 만든 공용 풀 (작업 프로세스가 죽어 교체된 이전 풀 포함)
+_shared_executors = weakref.WeakSet()
+
+
+def _worker_preparation_data(name):
+    """
+    spawn 작업 프로세스 준비 정보에서 __main__ 항목을 뺀 것
+    Streamlit은 페이지 스크립트를 __main__ 모듈로 실행하므로, 이 항목이 있으면 작업 프로세스가 시작될 때 스크립트 전체를 다시 실행함
+    """
+    data = spawn.get_preparation_data(name)
+    data.pop('init_main_from_name', None)
+    data.pop('init_main_from_path', None)
+    return data
+
+
+def _with_worker_preparation(method):
+    """표준 spawn Popen 메서드를 준비 정보만 _worker_preparation_data로 바꿔 다시 만든 것 (sys.modules 등 전역 상태는 건드리지 않음)"""
+    namespace = dict(method.__globals__, spawn=types.SimpleNamespace(
+        **dict(vars(spawn), get_preparation_data=_worker_preparation_data)))
+    return types.FunctionType(method.__code__, namespace, method.__name__,
+                              method.__defaults__, method.__closure__)
+
+
+if sys.platform == 'win32':
+    from multiprocessing.popen_spawn_win32 import Popen as _SpawnPopen
+
+    class _WorkerPopen(_SpawnPopen):
+        __init__ = _with_worker_preparation(_SpawnPopen.__init__)
+else:
+    from multiprocessing.popen_spawn_posix import Popen as _SpawnPopen
+
+    class _WorkerPopen(_SpawnPopen):
+        _launch = _with_worker_preparation(_SpawnPopen._launch)
+
+
+class _WorkerProcess(SpawnProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        return _WorkerPopen(process_obj)
+
+
+class _WorkerContext(SpawnContext):
+    """작업 프로세스 전용 spawn 컨텍스트 (__main__을 다시 실행하지 않는 프로세스로 시작)"""
+    Process = _WorkerProcess
+
+
+def get_executor(max_workers=None):
+    """파싱/전처리용 프로세스 풀 (프로세스당 한 번만 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if max_workers is None:
+                max_workers = min(4, os.cpu_count() or 1)
+            # Streamlit 서버는 스레드를 사용하므로 fork 대신 spawn으로 작업 프로세스 생성
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=_WorkerContext()
+            )
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+            _shared_executors.add(_executor)
+        return _executor
+
+
+def _reset_executor(broken):
+    """작업 프로세스가 비정상 종료(메모리 부족 등)되어 쓸 수 없게 된 공용 풀을 정리 (다음 get_executor에서 새로 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_task(func, *args, executor=None):
+    """
+    프로세스 풀에 작업 제출 (필요 시 작업 프로세스가 이 호출 중에 생성됨)
+    공용 풀이 깨져 있으면(BrokenProcessPool) 새 풀을 만들어 다시 제출 (직접 넘긴 다른 풀은 그대로 예외 발생)
+    """
+    executor = executor or get_executor()
+    try:
+        return executor.submit(func, *args)
+    except BrokenProcessPool:
+        if executor not in _shared_executors:
+            raise
+        _reset_executor(executor)
+        return get_executor().submit(func, *args)
+
+
+def parse_source(kind, source, name=None, profile=False):
+    """작업 프로세스에서 파일 하나를 파싱 (source는 경로 또는 업로드 파일의 bytes) → (데이터, 진단)"""
+    engine.set_profiling(profile)
+    diagnostics = Diagnostics()
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    df = engine.measure(diagnostics, name or "파일 파싱", SOURCE_PARSERS[kind], source)
+    return df, diagnostics
+
+
+def _run_guarded(diagnostics, name, stage_func, df, *args):
+    """단계 실행 중 예외가 나도 이전 결과로 계속 진행 (오류는 경고로 기록)"""
+    try:
+        return diagnostics.collect(stage_func(df, *args))
+    except Exception as e:
+        diagnostics.warning(f"{name} 중 오류 발생: {e}")
+        return df
+
+
+def run_maintenance_stage(df1, df2=None, df4=None, profile=False, previous=None):
+    """
+    정비일지 전처리 단계: 중복 제거 → 자산 병합 → 이전 정비일자 → 지역 추출 → 날짜 처리 → 조직도 매핑
+    previous: 이어 붙일 기존 데이터의 지문 (주어지면 기존 행과 겹치는 새 행도 중복으로 제거)
+    """
+    engine.set_profiling(profile)
+    diagnostics = Diagnostics()
+
+    df1 = diagnostics.collect(engine.preprocess_maintenance_data(df1))
+    raw_df = df1
+
+    # 여러 파일(월)을 합친 데이터에서 겹치는 기간의 반복 기록 제거 (수리비 매칭 전에 제거해야 매칭이 중복되지 않음)
+    df1 = _run_guarded(diagnostics, "중복 정비 기록 제거", engine.deduplicate_maintenance_records,
+                       df1, dedup.NEAR_WINDOW, previous)
+    if df2 is not None:
+        df1 = _run_guarded(diagnostics, "자산 데이터 병합", engine.merge_dataframes, df1, df2)
+    df1 = _run_guarded(diagnostics, "정비일자 계산", engine.calculate_previous_maintenance_dates, df1)
+    df1 = _run_guarded(diagnostics, "지역 정보 추출", engine.extract_and_apply_region, df1)
+    df1 = _run_guarded(diagnostics, "날짜 처리", engine.process_date_columns, df1)
+    if df4 is not None:
+        df1 = _run_guarded(diagnostics, "조직도 데이터 매핑", engine.map_employee_data, df1, df4)
+
+    return raw_df, df1, diagnostics
+
+
+def run_parts_stage(df3, df4=None, profile=False):
+    """소모품 출고 데이터 전처리 단계: 수리비 전처리 → 조직도 매핑"""
+    engine.set_profiling(profile)
+    diagnostics = Diagnostics()
+    raw_df = df3
+
+    df3 = _run_guarded(diagnostics, "수리비 데이터 전처리", engine.preprocess_repair_costs, df3)
+    if df4 is not None:
+        df3 = _run_guarded(diagnostics, "조직도 데이터 매핑", engine.map_employee_data, df3, df4)
+
+    return raw_df, df3, diagnostics
+
+
+def pipeline_stages(sources):
+    """입력 파일 구성에 따라 실행될 단계 목록"""
+    stages = [f'parse:{key}' for key in ('asset', 'org', 'maintenance', 'parts') if key in sources]
+    stages += [f'stage:{key}' for key in ('maintenance', 'parts') if key in sources]
+    if 'maintenance' in sources:
+        stages.append('finalize')
+    return stages
+
+
+def sources_fingerprint(sources):
+    """입력 파일 구성의 지문 (같은 파일 조합이면 세션이 달라도 같은 값)"""
+    digest = hashlib.sha256()
+    for key, (kind, source) in sorted(sources.items()):
+        digest.update(f'{key}:{kind}:'.encode())
+        for item in _as_file_list(source):
+            if isinstance(item, bytes):
+                digest.update(hashlib.sha256(item).digest())
+            else:
+                # 경로로 주어진 파일은 경로와 수정 시각으로 구분
+                digest.update(f'{item}:{os.path.getmtime(item)}'.encode())
+    return digest.hexdigest()
+
+
+def _as_file_list(source):
+    """단일 파일(경로/bytes) 또는 여러 파일 목록을 목록으로 통일"""
+    return list(source) if isinstance(source, (list, tuple)) else [source]
+
+
+def load_and_process(sources, executor=None, progress=None, profile=False, previous=None):
+    """
+    모든 입력 파일을 프로세스 풀에서 동시에 파싱하고, 준비된 단계부터 바로 실행합니다.
+
+    sources: {'maintenance' | 'parts' | 'asset' | 'org': (종류, 경로 또는 bytes, 혹은 그 목록)}
+    - 파싱 결과는 완료되는 순서대로 수집 (여러 파일로 나뉜 데이터는 파일별로 병렬 파싱 후 합침)
+    - 정비일지 단계(자산/조직도 필요)와 소모품 단계(조직도 필요)는 서로 독립적으로 겹쳐 실행
+    - progress(단계, 상태)가 주어지면 단계 시작('running')/완료('done')/실패('error') 시 호출
+    - profile=True이면 파싱과 각 처리 단계의 실행 기록을 diagnostics.stages에 남김
+    - previous(기존 데이터의 지문)가 주어지면 정비일지에서 기존 행과 겹치는 행을 제외 (이어 붙이기)
+    """
+    executor = executor or get_executor()
+    progress = progress or (lambda stage, state: None)
+
+    frames = {}
+    errors = {}
+    diagnostics = Diagnostics()
+    result = {}
+
+    tasks = {}
+    file_frames = {}
+    for key, (kind, source) in sources.items():
+        files = _as_file_list(source)
+        file_frames[key] = [None] * len(files)
+        for index, item in enumerate(files):
+            future = submit_task(parse_source, kind, item, STAGE_LABELS[f'parse:{key}'], profile, executor=executor)
+            tasks[future] = ('parse', key, index)
+        progress(f'parse:{key}', 'running')
+
+    # 각 후속 단계가 기다려야 하는 파싱 결과
+    stage_deps = {
+        'maintenance': [key for key in ('maintenance', 'asset', 'org') if key in sources],
+        'parts': [key for key in ('parts', 'org') if key in sources],
+    }
+    started = set()
+
+    pending = set(tasks)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            task, key, index = tasks.pop(future)
+            try:
+                value = future.result()
+            except Exception as e:
+                errors[key] = str(e)
+                value = None
+
+            if task == 'parse':
+                if value is not None:
+                    value = diagnostics.collect(value)
+                parts = file_frames[key]
+                parts[index] = value
+                # 같은 종류의 파일이 모두 파싱되면 하나로 합침
+                if any(task_info[:2] == ('parse', key) for task_info in tasks.values()):
+                    continue
+                if key in errors:
+                    frames[key] = None
+                else:
+                    frames[key] = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+                progress(f'parse:{key}', 'error' if frames[key] is None else 'done')
+                continue
+
+            progress(f'stage:{key}', 'error' if value is None else 'done')
+            if value is not None:
+                raw_df, processed_df, stage_diagnostics = value
+                result[f'{key}_raw'] = raw_df
+                result[key] = processed_df
+                # 제외된 중복 행 목록과 남긴 행의 지문 (다음 이어 붙이기의 기준) - 진단 정보에는 남기지 않음
+                result[f'{key}_duplicates'] = stage_diagnostics.stats.pop('duplicate_rows', None)
+                result[f'{key}_fingerprints'] = stage_diagnostics.stats.pop('fingerprints', None)
+                diagnostics.merge(stage_diagnostics)
+
+        # 의존 데이터가 모두 준비된 단계를 바로 제출
+        for stage, deps in stage_deps.items():
+            if stage in started or stage not in sources or not all(dep in frames for dep in deps):
+                continue
+            started.add(stage)
+            if frames.get(stage) is None:
+                continue
+            if stage == 'maintenance':
+                future = submit_task(run_maintenance_stage, frames['maintenance'],
+                                     frames.get('asset'), frames.get('org'), profile, previous, executor=executor)
+            else:
+                future = submit_task(run_parts_stage, frames['parts'], frames.get('org'), profile, executor=executor)
+            tasks[future] = ('stage', stage, None)
+            pending.add(future)
+            progress(f'stage:{stage}', 'running')
+
+    result['asset'] = frames.get('asset')
+    result['org'] = frames.get('org')
+    result['diagnostics'] = diagnostics
+    result['errors'] = errors
+    return result
+
+
+def finalize_maintenance_data(df1, df3=None, df4=None, profile=False, alias_path=None):
+    """
+    정비일지에 수리비를 매핑하고 분석용 후처리(고장유형, 소속별 통계, 현장명 통합)를 적용
+    alias_path: 현장명 별칭표 파일 (주어지면 불러와 새 표기를 추가 저장, None이면 파일 없이 이번 데이터로만 통합)
+    """
+    engine.set_profiling(profile)
+    diagnostics = Diagnostics()
+    result = {}
+
+    if df3 is not None:
+        df1_with_costs = diagnostics.collect(engine.merge_repair_costs(df1, df3))
+        result['match_stats'] = diagnostics.stats.get('match')
+        # 매칭된 (정비 건 행 위치, 자재명, 출고금액) 쌍 - 진단 정보에는 남기지 않음
+        result['part_pairs'] = diagnostics.stats.pop('part_pairs', None)
+        result['message'] = "정비일지와 소모품 출고 데이터 매핑이 완료되었습니다."
+    else:
+        # 수리비 데이터가 없는 경우
+        df1_with_costs = df1.copy()
+        if '수리비' not in df1_with_costs.columns:
+            df1_with_costs['수리비'] = np.nan
+        result['message'] = "소모품 출고 데이터 없이 정비일지 데이터만 로드되었습니다."
+
+    # 추가 전처리
+    df1_with_costs = diagnostics.collect(engine.preprocess_maintenance_data(df1_with_costs))
+    df1_with_costs = engine.measure(diagnostics, "고장유형 생성", generate_fault_type_column, df1_with_costs)
+
+    # 소속별 수리비 통계 계산
+    result['dept_stats'] = diagnostics.collect(engine.calculate_dept_repair_stats(df1_with_costs, df4))
+
+    # 지역/현장명은 정비일지 전처리 단계에서 이미 추출됨 (현장명 통합은 그 결과에 적용)
+    result['df1_with_costs'] = diagnostics.collect(engine.canonicalize_client_names(df1_with_costs, alias_path))
+    result['diagnostics'] = diagnostics
+    return result
+
+
+def run_full_pipeline(sources, progress=None, profile=False, previous=None, alias_path=None):
+    """
+    파일 파싱부터 수리비 매핑까지 업로드 한 건의 전체 파이프라인 실행 (profile=True이면 단계별 계측)
+    previous: 이어 붙일 기존 데이터의 지문 (append_maintenance_data 참고)
+    alias_path: 현장명 별칭표 파일 (앱은 CLIENT_ALIAS_PATH, 배치/벤치마크는 기본값 None으로 파일을 쓰지 않음)
+    """
+    progress = progress or (lambda stage, state: None)
+
+    result = load_and_process(sources, progress=progress, profile=profile, previous=previous)
+
+    if result.get('maintenance') is not None:
+        progress('finalize', 'running')
+        try:
+            # 병합도 작업 프로세스에서 실행 (서버 프로세스의 GIL 점유 방지)
+            future = submit_task(finalize_maintenance_data, result['maintenance'],
+                                 result.get('parts'), result.get('org'), profile, alias_path)
+            finalized = future.result()
+            result['diagnostics'].merge(finalized.pop('diagnostics'))
+            result.update(finalized)
+            progress('finalize', 'done')
+        except Exception as e:
+            result['errors']['finalize'] = str(e)
+            progress('finalize', 'error')
+
+    return result
+
+
+def append_maintenance_data(previous, added, previous_pairs=None, added_pairs=None, df4=None):
+    """
+    이어 붙이기: 이미 불러온 분석 데이터(previous) 뒤에 새로 처리한 데이터(added, previous 지문으로 중복 제외됨)를 붙임
+    - 장비 이력이 달을 넘나드는 값(최근정비일자/재정비간격/30일내재정비)과 소속별 수리비 통계는 합친 데이터로 다시 계산
+    - 행 순서는 그대로 두므로 부품 매칭 쌍(part_pairs)은 새 데이터의 행번호만 previous 행 수만큼 밀어서 합침
+    반환: {'df1_with_costs', 'part_pairs', 'dept_stats', 'diagnostics'}
+    """
+    diagnostics = Diagnostics()
+    combined = pd.concat([previous, added], ignore_index=True)
+    if '최근정비일자' in combined.columns:
+        history = combined.sort_values(['관리번호', '정비일자'], kind='stable')
+        combined['최근정비일자'] = history.groupby('관리번호')['정비일자'].shift(1)
+        combined = _run_guarded(diagnostics, "날짜 처리", engine.process_date_columns, combined)
+
+    pairs = [frame for frame in (previous_pairs, added_pairs) if frame is not None]
+    if added_pairs is not None:
+        pairs[-1] = added_pairs.assign(행번호=added_pairs['행번호'] + len(previous))
+    return {
+        'df1_with_costs': combined,
+        'part_pairs': pd.concat(pairs, ignore_index=True) if pairs else None,
+        'dept_stats': diagnostics.collect(engine.calculate_dept_repair_stats(combined, df4)),
+        'diagnostics': diagnostics,
+    }
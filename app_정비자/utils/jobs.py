@@ -0,0 +1,159 @@
+# utils/jobs.py
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# 작업 상태
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# 완료된 작업 결과 보관 한도 (세션에 반영된 뒤에는 세션이 결과를 들고 있으므로 실행기에는 짧게만 보관)
+FINISHED_JOB_TTL = 600
+FINISHED_JOB_BYTES = 1 << 30
+
+
+def result_bytes(result):
+    """작업 결과(dict)에 담긴 DataFrame의 메모리 사용량 합계 (바이트)"""
+    if not isinstance(result, dict):
+        return 0
+    return int(sum(value.memory_usage(index=True, deep=True).sum()
+                   for value in result.values() if isinstance(value, pd.DataFrame)))
+
+
+class Job:
+    """백그라운드에서 실행되는 파이프라인 작업 한 건 (단계별 진행 상황 포함)"""
+
+    def __init__(self, key, stages):
+        self.key = key
+        self.status = PENDING
+        self.stages = OrderedDict((stage, PENDING) for stage in stages)
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.result_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def finished(cls, key, result):
+        """이미 끝난 결과로 만든 완료 작업 (실행기에서 정리된 작업을 세션에 남긴 결과로 복원할 때 사용)"""
+        job = cls(key, [])
+        job.result = result
+        job.status = DONE
+        job.finished_at = job.submitted_at
+        return job
+
+    def update_stage(self, stage, state):
+        """단계 상태 갱신 (파이프라인의 progress 콜백으로 사용)"""
+        with self._lock:
+            self.stages[stage] = state
+
+    @property
+    def done(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def progress(self):
+        """완료된 단계 비율 (0.0 ~ 1.0)"""
+        with self._lock:
+            if not self.stages:
+                return 1.0 if self.done else 0.0
+            finished = sum(state in ('done', 'error') for state in self.stages.values())
+            return finished / len(self.stages)
+
+    def snapshot(self):
+        """표시용 단계 상태 복사본"""
+        with self._lock:
+            return list(self.stages.items())
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.submitted_at
+
+
+class JobRunner:
+    """
+    파이프라인 작업을 스레드에서 실행하고, 재실행(rerun) 시 상태를 조회할 수 있게 보관합니다.
+
+    - 같은 키의 작업이 진행 중이거나 완료되어 있으면 새로 실행하지 않고 기존 작업을 반환 (세션 간 중복 제거)
+    - 실패한 작업도 그대로 반환하며, retry=True로 제출할 때만 다시 실행
+    - 완료된 작업은 최근 max_finished개까지, 끝난 지 max_age초 이내이고 결과 합계가 max_bytes 이하인 만큼만 보관
+      (결과는 세션에 반영되면 세션이 들고 있으므로, 실행기는 다른 세션이 같은 파일을 올릴 때 재사용할 동안만 보관)
+    """
+
+    def __init__(self, max_workers=2, max_finished=8, max_age=FINISHED_JOB_TTL, max_bytes=FINISHED_JOB_BYTES):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pipeline-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_finished = max_finished
+        self._max_age = max_age
+        self._max_bytes = max_bytes
+
+    def submit(self, key, stages, func, *args, retry=False):
+        """
+        작업 제출. func(*args, progress=콜백)을 실행하며 반환값이 job.result가 됩니다.
+        실패한 작업은 retry=True일 때만 재실행됩니다 (재실행 때마다 자동으로 다시 시작하지 않도록).
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (retry and job.status == FAILED):
+                self._jobs.move_to_end(key)
+                return job
+
+            job = Job(key, stages)
+            self._jobs[key] = job
+            self._evict()
+
+        self._executor.submit(self._run, job, func, args)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            self._evict()
+            return self._jobs.get(key)
+
+    def _run(self, job, func, args):
+        job.status = RUNNING
+        try:
+            job.result = func(*args, progress=job.update_stage)
+            job.result_bytes = result_bytes(job.result)
+            job.status = DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self):
+        """기한이 지난 완료 작업을 정리하고, 개수/결과 크기 한도를 넘으면 오래된 완료 작업부터 정리 (진행 중인 작업은 유지)"""
+        now = time.time()
+        finished = []
+        for key, job in list(self._jobs.items()):
+            if not job.done:
+                continue
+            if now - job.finished_at > self._max_age:
+                self._jobs.pop(key)
+            else:
+                finished.append(key)
+        total = sum(self._jobs[key].result_bytes for key in finished)
+        while finished and (len(finished) > self._max_finished or total > self._max_bytes):
+            total -= self._jobs.pop(finished.pop(0)).result_bytes
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """서버 프로세스 전체에서 공유하는 작업 실행기"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
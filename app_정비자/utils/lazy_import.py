@@ -0,0 +1,37 @@
+# utils/lazy_import.py
+# 무거운 차트 라이브러리 지연 로딩
+# 페이지 상단에서 lazy_module("plotly.express")처럼 선언해 두면, 실제로 함수를 처음 사용할 때 import 합니다.
+# 선택하지 않은 구역이나 캐시된 차트만 표시하는 실행에서는 import 비용이 들지 않습니다.
+
+import sys
+import importlib
+import threading
+
+
+class _LazyModule:
+    """속성에 처음 접근할 때 모듈을 불러오는 대리 객체"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    """이미 불러온 모듈이면 그대로, 아니면 처음 사용할 때 불러오는 대리 객체를 반환"""
+    module = sys.modules.get(name)
+    return module if module is not None else _LazyModule(name)
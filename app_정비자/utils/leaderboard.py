@@ -0,0 +1,166 @@
+# utils/leaderboard.py
+# 정비자 성과 리더보드 엔진 (Streamlit 의존성 없음)
+# 정비자 × 월 사실 테이블(건수, 수리비, 수리시간 합계/건수, 재정비 건수)을 한 번 만들고 월 방향 누적합으로 저장합니다.
+# 어떤 기간 창(1개월/분기/1년 ...)의 합계도 누적합 두 열의 차이라서 정비자 수에 비례하는 계산으로 끝납니다.
+# - 재정비: 같은 장비가 REWORK_DAYS일 안에 다시 정비된 경우, 앞선 정비를 한 정비자의 앞선 정비 월에 1건으로 셈
+# - 동료 백분위: 같은 정비자소속 안에서 지표 순위 비율 (100에 가까울수록 좋음)
+
+import numpy as np
+import pandas as pd
+
+from utils.periods import month_index, period_label
+
+# 재정비로 볼 최대 간격 (engine의 30일내재정비와 같은 기준)
+REWORK_DAYS = 30
+# 누적합으로 저장할 월별 값
+FACT_COLUMNS = ['건수', '수리비', '수리시간합계', '수리시간건수', '재정비건수']
+# 순위 지표 {이름: 낮을수록 좋은지}
+RANKING_METRICS = {
+    '건수': False,
+    '수리비': False,
+    '평균수리시간': True,
+    '재정비율(%)': True,
+}
+
+
+def rework_sources(df, days=REWORK_DAYS):
+    """
+    행별 '다음 정비가 days일 안에 다시 들어왔는지' (앞선 정비 쪽에 표시)
+    관리번호 → 정비일자 순으로 정렬한 뒤 바로 다음 행과 비교
+    """
+    dates = pd.to_datetime(df['정비일자'], errors='coerce').to_numpy()
+    assets = df['관리번호'].astype(str).to_numpy()
+    order = np.lexsort((dates, assets))
+    sorted_dates, sorted_assets = dates[order], assets[order]
+    gaps = (sorted_dates[1:] - sorted_dates[:-1]) / np.timedelta64(1, 'D')
+    followed = (sorted_assets[1:] == sorted_assets[:-1]) & (gaps > 0) & (gaps <= days)
+    flags = np.zeros(len(df), dtype=bool)
+    flags[order[:-1][followed]] = True
+    return flags
+
+
+class TechnicianLedger:
+    """정비자 × 월 누적합 테이블 (데이터셋/필터마다 한 번 생성해 재사용)"""
+
+    def __init__(self, df):
+        months = month_index(df['정비일자'])
+        id_column = '정비자번호' if '정비자번호' in df.columns else '정비자'
+        valid = (months >= 0) & df[id_column].notna().to_numpy()
+        rework = rework_sources(df) if len(df) else np.zeros(0, dtype=bool)
+
+        repair_time = pd.to_numeric(df['수리시간'], errors='coerce').to_numpy(dtype=float) \
+            if '수리시간' in df.columns else np.full(len(df), np.nan)
+        cost = pd.to_numeric(df['수리비'], errors='coerce').fillna(0).to_numpy(dtype=float) \
+            if '수리비' in df.columns else np.zeros(len(df))
+        facts = {
+            '건수': np.ones(len(df)),
+            '수리비': cost,
+            '수리시간합계': np.nan_to_num(repair_time),
+            '수리시간건수': (~np.isnan(repair_time)).astype(float),
+            '재정비건수': rework.astype(float),
+        }
+
+        codes, ids = pd.factorize(df[id_column].to_numpy()[valid])
+        months = months[valid]
+        self.first_month = int(months.min()) if len(months) else 0
+        self.n_months = int(months.max()) - self.first_month + 1 if len(months) else 0
+        n_technicians = len(ids)
+
+        # 정비자 정보: 가장 최근 정비 행의 이름/소속
+        info_columns = [column for column in ['정비자', '정비자소속'] if column in df.columns]
+        recent = pd.DataFrame({'code': codes, 'month': months})
+        for column in info_columns:
+            recent[column] = df[column].to_numpy()[valid]
+        recent = recent.sort_values('month', kind='stable').groupby('code')[info_columns].last()
+        self.technicians = recent.reindex(np.arange(n_technicians))
+        self.technicians.index = pd.Index(ids, name=id_column)
+        if '정비자' not in self.technicians.columns:
+            self.technicians['정비자'] = self.technicians.index.astype(str)
+        if '정비자소속' not in self.technicians.columns:
+            self.technicians['정비자소속'] = "미상"
+        self.technicians['정비자소속'] = self.technicians['정비자소속'].fillna("미상")
+
+        # (정비자, 월) 칸별 합계 → 월 방향 누적합 (맨 앞 0열 포함, 폭 n_months + 1)
+        cells = codes * self.n_months + (months - self.first_month)
+        self._cumulative = {}
+        for name in FACT_COLUMNS:
+            totals = np.bincount(cells, weights=facts[name][valid], minlength=n_technicians * self.n_months)
+            totals = totals.reshape(n_technicians, self.n_months)
+            self._cumulative[name] = np.concatenate([np.zeros((n_technicians, 1)), np.cumsum(totals, axis=1)], axis=1)
+
+    @property
+    def months(self):
+        """데이터가 있는 월 번호 범위 (최근 순)"""
+        return list(range(self.first_month + self.n_months - 1, self.first_month - 1, -1))
+
+    def _bounds(self, end_month, n_months):
+        """월 번호 창 → 누적합 열 위치 (start, end)"""
+        end = int(np.clip(end_month - self.first_month + 1, 0, self.n_months))
+        start = int(np.clip(end_month - n_months + 1 - self.first_month, 0, self.n_months))
+        return start, max(start, end)
+
+    def window(self, end_month, n_months=1):
+        """
+        end_month(월 번호)까지 n_months개월 동안의 정비자별 합계 (누적합 차이, 건수가 있는 정비자만)
+        반환 컬럼: 정비자, 정비자소속, 건수, 수리비, 평균수리비, 평균수리시간, 재정비건수, 재정비율(%)
+        """
+        start, end = self._bounds(end_month, n_months)
+        sums = {name: cumulative[:, end] - cumulative[:, start] for name, cumulative in self._cumulative.items()}
+        result = self.technicians[['정비자', '정비자소속']].copy()
+        result['건수'] = sums['건수'].astype(np.int64)
+        result['수리비'] = sums['수리비']
+        result['평균수리비'] = (sums['수리비'] / np.maximum(sums['건수'], 1)).round(0)
+        result['평균수리시간'] = np.where(sums['수리시간건수'] > 0,
+                                    sums['수리시간합계'] / np.maximum(sums['수리시간건수'], 1), np.nan).round(1)
+        result['재정비건수'] = sums['재정비건수'].astype(np.int64)
+        result['재정비율(%)'] = (sums['재정비건수'] / np.maximum(sums['건수'], 1) * 100).round(1)
+        return result[result['건수'] > 0]
+
+    def leaderboard(self, end_month, n_months=1, by='건수', min_jobs=1, top=None):
+        """
+        기간 창의 by 기준 순위표 (min_jobs건 미만인 정비자는 비율 지표가 흔들리므로 제외)
+        추가 컬럼: 순위, 소속내순위, 소속내백분위, 전체백분위 (백분위는 100에 가까울수록 좋음)
+        """
+        table = self.window(end_month, n_months)
+        table = table[table['건수'] >= min_jobs].copy()
+        ascending = RANKING_METRICS[by]
+        values = table[by]
+        table['순위'] = values.rank(method='min', ascending=ascending).astype('Int64')
+        parts = table.groupby('정비자소속')[by]
+        table['소속내순위'] = parts.rank(method='min', ascending=ascending).astype('Int64')
+        # 백분위: 나보다 나쁘거나 같은 동료 비율
+        table['소속내백분위'] = (parts.rank(method='max', ascending=not ascending, pct=True) * 100).round(0)
+        table['전체백분위'] = (values.rank(method='max', ascending=not ascending, pct=True) * 100).round(0)
+        table = table.sort_values(['순위', '건수'], ascending=[True, False], kind='stable')
+        columns = ['순위', '정비자', '정비자소속', '건수', '수리비', '평균수리비', '평균수리시간', '재정비건수', '재정비율(%)',
+                   '소속내순위', '소속내백분위', '전체백분위']
+        table = table[columns]
+        return table if top is None else table.head(top)
+
+    def rolling(self, technician_ids, n_months=3, value='건수'):
+        """
+        정비자별 n_months개월 이동 합계 추이 (행: 월 표시 이름, 열: 정비자 이름)
+        value: FACT_COLUMNS 중 하나 또는 '평균수리시간', '재정비율(%)'
+        """
+        positions = self.technicians.index.get_indexer(technician_ids)
+        positions = positions[positions >= 0]
+        ends = np.arange(1, self.n_months + 1)
+        starts = np.maximum(ends - n_months, 0)
+
+        def moving(name):
+            cumulative = self._cumulative[name][positions]
+            return cumulative[:, ends] - cumulative[:, starts]
+
+        if value == '재정비율(%)':
+            values = moving('재정비건수') / np.maximum(moving('건수'), 1) * 100
+        elif value == '평균수리시간':
+            counts = moving('수리시간건수')
+            values = np.where(counts > 0, moving('수리시간합계') / np.maximum(counts, 1), np.nan)
+        else:
+            values = moving(value)
+        labels = [period_label(self.first_month + i, "월별") for i in range(self.n_months)]
+        # 이름이 같은 정비자는 번호를 붙여 구분
+        names = pd.Series(self.technicians['정비자'].to_numpy()[positions], dtype=object)
+        ids = pd.Series(self.technicians.index[positions].astype(str), dtype=object)
+        names = names.where(~names.duplicated(keep=False), names + ' (' + ids + ')')
+        return pd.DataFrame(values.T, index=pd.Index(labels, name='월'), columns=names.to_numpy())
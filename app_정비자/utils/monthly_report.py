@@ -0,0 +1,337 @@
+# utils/monthly_report.py
+# 월별 종합 분석(pages/04) 리포트 테이블 계산 함수 모음
+# Streamlit 없이도 실행되므로 배치 리포트(batch_report.py)와 페이지가 함께 사용합니다.
+
+import pandas as pd
+
+# 장비 구분 필터 (자재내역 키워드)
+EQUIPMENT_PATTERNS = {
+    '지게차': '지게차|FORKLIFT|전동|디젤',
+    'AWP': 'AWP|고소작업대|수직형',
+}
+
+# 구간 정의
+OPERATION_TIME_BINS = [0, 1000, 3000, 5000, 8000, float('inf')]
+OPERATION_TIME_LABELS = ['0-1000h', '1000-3000h', '3000-5000h', '5000-8000h', '8000h+']
+AGE_BINS = [0, 5, 10, 15, 20, float('inf')]
+AGE_LABELS = ['0-5년', '6-10년', '11-15년', '16-20년', '20년+']
+COST_BINS = [0, 100000, 500000, 1000000, 2000000, float('inf')]
+COST_LABELS = ['10만원 이하', '10-50만원', '50-100만원', '100-200만원', '200만원+']
+
+# 분류 컬럼 (대분류/중분류/소분류)
+CLASSIFICATION_COLS = {
+    '대분류': '작업유형',
+    '중분류': '정비대상',
+    '소분류': '정비작업'
+}
+
+
+def add_period_columns(df):
+    """년월/년/월 컬럼 추가"""
+    df['년월'] = df['정비일자'].dt.to_period('M')
+    df['년'] = df['정비일자'].dt.year
+    df['월'] = df['정비일자'].dt.month
+    return df
+
+
+def filter_month(df, year, month, equipment_filter="전체", maintenance_type="전체"):
+    """선택한 년/월 및 장비 구분, 정비구분으로 데이터 필터링"""
+    filtered_df = df[(df['년'] == year) & (df['월'] == month)].copy()
+    return filter_segment(filtered_df, equipment_filter, maintenance_type)
+
+
+def filter_segment(df, equipment_filter="전체", maintenance_type="전체"):
+    """장비 구분, 정비구분으로만 데이터 필터링 (기간은 그대로)"""
+    filtered_df = df
+
+    if equipment_filter in EQUIPMENT_PATTERNS and '자재내역' in filtered_df.columns:
+        filtered_df = filtered_df[filtered_df['자재내역'].str.contains(
+            EQUIPMENT_PATTERNS[equipment_filter], na=False, case=False)]
+
+    if maintenance_type != "전체" and '정비구분' in filtered_df.columns:
+        filtered_df = filtered_df[filtered_df['정비구분'] == maintenance_type]
+
+    return filtered_df
+
+
+def _mean_repair_time(df):
+    """수리시간 평균 집계 (컬럼이 없으면 0)"""
+    return ('수리시간', 'mean') if '수리시간' in df.columns else ('관리번호', lambda x: 0)
+
+
+def summary_metrics(filtered_df):
+    """상단 핵심 지표"""
+    total_cases = len(filtered_df)
+    total_cost = filtered_df['수리비'].sum() if '수리비' in filtered_df.columns else 0
+    return {
+        'total_cases': total_cases,
+        'total_cost': total_cost,
+        'avg_cost_per_case': total_cost / total_cases if total_cases > 0 else 0,
+        'unique_clients': filtered_df['현장명'].nunique() if '현장명' in filtered_df.columns else 0,
+        'unique_equipment': filtered_df['관리번호'].nunique(),
+        'unique_workers': filtered_df['정비자'].nunique() if '정비자' in filtered_df.columns else 0,
+    }
+
+
+def part_summary(filtered_df):
+    """소속파트별 건수 및 비율"""
+    part_analysis = filtered_df.groupby('정비자소속').agg({
+        '관리번호': 'count',
+        '수리비': 'sum'
+    }).rename(columns={'관리번호': '건수', '수리비': '총수리비'})
+
+    part_analysis['건수비율(%)'] = (part_analysis['건수'] / part_analysis['건수'].sum() * 100).round(1)
+    part_analysis['평균수리비'] = (part_analysis['총수리비'] / part_analysis['건수']).round(0)
+    return part_analysis.sort_values('건수', ascending=False)
+
+
+def worker_summary(filtered_df, top_n=10):
+    """개별 정비자 성과 (건수 상위 top_n명, top_n=None이면 전체)"""
+    worker_analysis = filtered_df.groupby(['정비자', '정비자소속']).agg(
+        건수=('관리번호', 'count'),
+        총수리비=('수리비', 'sum'),
+        평균수리비=('수리비', 'mean'),
+        평균수리시간=_mean_repair_time(filtered_df)
+    ).round(1)
+
+    worker_analysis = worker_analysis.reset_index()
+    worker_analysis = worker_analysis.sort_values('건수', ascending=False)
+    return worker_analysis if top_n is None else worker_analysis.head(top_n)
+
+
+def category_summary(filtered_df, col_name):
+    """분류(대/중/소)별 건수 및 비율"""
+    category_analysis = filtered_df.groupby(col_name).agg({
+        '관리번호': 'count',
+        '수리비': 'sum'
+    }).rename(columns={'관리번호': '건수'})
+
+    category_analysis['비율(%)'] = (category_analysis['건수'] / category_analysis['건수'].sum() * 100).round(1)
+    return category_analysis.sort_values('건수', ascending=False)
+
+
+def repair_reason_summary(filtered_df, top_n=15):
+    """상세 정비사유 분석 (대>중>소 조합)"""
+    reason = (filtered_df['작업유형'].astype(str) + ' > ' +
+              filtered_df['정비대상'].astype(str) + ' > ' +
+              filtered_df['정비작업'].astype(str)).rename('정비사유조합')
+
+    repair_reason_analysis = filtered_df.groupby(reason).agg(
+        건수=('관리번호', 'count'),
+        총수리비=('수리비', 'sum'),
+        평균수리비=('수리비', 'mean'),
+        평균수리시간=_mean_repair_time(filtered_df)
+    ).round(1)
+
+    return repair_reason_analysis.sort_values('건수', ascending=False).head(top_n)
+
+
+def operation_time_summary(filtered_df):
+    """가동시간 구간별 건수, 평균수리비, 평균수리시간"""
+    operation_bins = pd.cut(filtered_df['가동시간'],
+                            bins=OPERATION_TIME_BINS,
+                            labels=OPERATION_TIME_LABELS).rename('가동시간구간')
+
+    return filtered_df.groupby(operation_bins, observed=False).agg(
+        건수=('관리번호', 'count'),
+        평균수리비=('수리비', 'mean'),
+        평균수리시간=_mean_repair_time(filtered_df)
+    ).round(1)
+
+
+def repair_time_summary(filtered_df):
+    """작업유형별 수리시간 통계"""
+    repair_time_analysis = filtered_df.groupby('작업유형').agg({
+        '수리시간': ['count', 'sum', 'mean', 'min', 'max']
+    }).round(1)
+
+    repair_time_analysis.columns = ['건수', '총수리시간', '평균수리시간', '최단시간', '최장시간']
+    return repair_time_analysis.sort_values('총수리시간', ascending=False)
+
+
+def operation_repair_correlation(filtered_df):
+    """가동시간과 수리시간의 상관계수"""
+    return filtered_df['가동시간'].corr(filtered_df['수리시간'])
+
+
+def region_summary(filtered_df):
+    """지역별 건수, 수리비, 업체수"""
+    region_analysis = filtered_df.groupby('지역').agg({
+        '관리번호': 'count',
+        '수리비': 'sum',
+        '현장명': 'nunique'
+    }).rename(columns={'관리번호': '건수', '현장명': '업체수'})
+
+    region_analysis['평균수리비'] = (region_analysis['수리비'] / region_analysis['건수']).round(0)
+    return region_analysis.sort_values('건수', ascending=False)
+
+
+def client_summary(filtered_df, top_n=10):
+    """수리비 상위 업체별 건수, 총수리비, 수리장비수 (top_n=None이면 전체)"""
+    client_analysis = filtered_df.groupby('현장명').agg(
+        건수=('관리번호', 'count'),
+        총수리비=('수리비', 'sum'),
+        수리장비수=('관리번호', 'nunique')
+    )
+    client_analysis['건당평균수리비'] = (client_analysis['총수리비'] / client_analysis['건수']).round(0)
+    if top_n is None:
+        return client_analysis.sort_values('총수리비', ascending=False)
+    return client_analysis.nlargest(top_n, '총수리비')
+
+
+def brand_summary(filtered_df):
+    """제조사별 건수 및 비율"""
+    brand_analysis = filtered_df.groupby('브랜드').agg({
+        '관리번호': 'count',
+        '수리비': 'sum'
+    }).rename(columns={'관리번호': '건수'})
+
+    brand_analysis['비율(%)'] = (brand_analysis['건수'] / brand_analysis['건수'].sum() * 100).round(1)
+    brand_analysis['평균수리비'] = (brand_analysis['수리비'] / brand_analysis['건수']).round(0)
+    return brand_analysis.sort_values('건수', ascending=False)
+
+
+def age_summary(filtered_df, current_year=None):
+    """장비 연식 구간별 건수 및 평균수리비"""
+    current_year = current_year or pd.Timestamp.now().year
+    equipment_age = current_year - pd.to_numeric(filtered_df['제조년도'], errors='coerce')
+    age_bins = pd.cut(equipment_age, bins=AGE_BINS, labels=AGE_LABELS).rename('연식구간')
+
+    return filtered_df.groupby(age_bins, observed=False).agg({
+        '관리번호': 'count',
+        '수리비': 'mean'
+    }).rename(columns={'관리번호': '건수', '수리비': '평균수리비'})
+
+
+def cost_distribution(filtered_df):
+    """수리비 구간별 건수"""
+    cost_bins = pd.cut(filtered_df['수리비'], bins=COST_BINS, labels=COST_LABELS).rename('수리비구간')
+    return cost_bins.value_counts()
+
+
+def cost_statistics(filtered_df):
+    """수리비 기초 통계"""
+    cost = filtered_df['수리비']
+    return {
+        '평균': cost.mean(),
+        '중앙값': cost.median(),
+        '최소값': cost.min(),
+        '최대값': cost.max(),
+        '표준편차': cost.std(),
+    }
+
+
+def high_cost_summary(filtered_df, quantile=0.9, threshold=None):
+    """
+    상위 10% 고액 수리 케이스의 작업유형별 분석
+    threshold: 고액 기준 금액 (주어지면 quantile 대신 사용, 예: 분위수 스케치의 P90)
+    """
+    high_cost_threshold = filtered_df['수리비'].quantile(quantile) if threshold is None else threshold
+    high_cost_cases = filtered_df[filtered_df['수리비'] >= high_cost_threshold]
+
+    if high_cost_cases.empty:
+        return None
+
+    high_cost_analysis = high_cost_cases.groupby('작업유형').agg({
+        '관리번호': 'count',
+        '수리비': ['mean', 'max']
+    })
+    high_cost_analysis.columns = ['건수', '평균수리비', '최대수리비']
+    return high_cost_analysis.sort_values('평균수리비', ascending=False)
+
+
+def recommendations(filtered_df, avg_cost_per_case):
+    """월말 리포트 주의사항 및 개선점"""
+    items = []
+
+    if '정비자소속' in filtered_df.columns:
+        part_costs = filtered_df.groupby('정비자소속')['수리비'].sum()
+        if len(part_costs) > 0:
+            items.append(f"🔴 **{part_costs.idxmax()}** 파트의 수리비가 {part_costs.max():,.0f}원으로 가장 높음")
+
+    if '현장명' in filtered_df.columns:
+        client_costs = filtered_df.groupby('현장명')['수리비'].sum()
+        if len(client_costs) > 0:
+            top_cost_client = client_costs.idxmax()
+            if len(top_cost_client) > 20:
+                top_cost_client = top_cost_client[:20] + "..."
+            items.append(f"🟡 **{top_cost_client}** 업체의 수리비가 {client_costs.max():,.0f}원으로 높음")
+
+    if avg_cost_per_case > 500000:
+        items.append(f"🟠 건당 평균 수리비({avg_cost_per_case:,.0f}원)가 높은 편임")
+
+    if not items:
+        items.append("✅ 특별한 주의사항 없음")
+
+    return items
+
+
+def part_export_summary(filtered_df):
+    """다운로드용 파트별 요약"""
+    return filtered_df.groupby('정비자소속').agg({
+        '관리번호': 'count',
+        '수리비': 'sum',
+        '현장명': 'nunique'
+    }).rename(columns={'관리번호': '건수', '현장명': '업체수'})
+
+
+def client_export_summary(filtered_df):
+    """다운로드용 업체별 요약"""
+    aggregations = {
+        '관리번호': 'count',
+        '수리비': 'sum',
+    }
+    if '지역' in filtered_df.columns:
+        aggregations['지역'] = 'first'
+    return filtered_df.groupby('현장명').agg(aggregations).rename(columns={'관리번호': '건수'})
+
+
+def build_report_tables(filtered_df):
+    """
+    월별 종합 분석 페이지의 모든 리포트 테이블을 계산합니다.
+    필요한 컬럼이 없는 테이블은 페이지와 같은 조건으로 건너뜁니다.
+    """
+    columns = filtered_df.columns
+    tables = {}
+
+    metrics = summary_metrics(filtered_df)
+    tables['핵심지표'] = pd.DataFrame([metrics])
+
+    if '정비자소속' in columns:
+        tables['파트별'] = part_summary(filtered_df)
+        tables['파트별요약'] = part_export_summary(filtered_df)
+    if '정비자' in columns and '정비자소속' in columns:
+        tables['정비자별'] = worker_summary(filtered_df)
+
+    for title, col_name in CLASSIFICATION_COLS.items():
+        if col_name in columns:
+            tables[f'{title}별'] = category_summary(filtered_df, col_name)
+    if all(col in columns for col in CLASSIFICATION_COLS.values()):
+        tables['정비사유조합'] = repair_reason_summary(filtered_df)
+
+    if '가동시간' in columns:
+        tables['가동시간구간'] = operation_time_summary(filtered_df)
+    if '수리시간' in columns and '작업유형' in columns:
+        tables['작업유형별수리시간'] = repair_time_summary(filtered_df)
+
+    if '지역' in columns:
+        tables['지역별'] = region_summary(filtered_df)
+    if '현장명' in columns:
+        tables['업체별'] = client_summary(filtered_df)
+        tables['업체별요약'] = client_export_summary(filtered_df)
+
+    if '브랜드' in columns:
+        tables['제조사별'] = brand_summary(filtered_df)
+    if '제조년도' in columns:
+        tables['연식구간'] = age_summary(filtered_df)
+
+    if '수리비' in columns:
+        tables['수리비구간'] = cost_distribution(filtered_df).to_frame('건수')
+        tables['수리비통계'] = pd.DataFrame([cost_statistics(filtered_df)])
+        if '작업유형' in columns:
+            high_cost = high_cost_summary(filtered_df)
+            if high_cost is not None:
+                tables['고액수리'] = high_cost
+
+    tables['주의사항'] = pd.DataFrame({'내용': recommendations(filtered_df, metrics['avg_cost_per_case'])})
+    return tables
@@ -0,0 +1,217 @@
+# utils/periods.py
+# 기간 비교 엔진 (Streamlit 의존성 없음)
+# 정비일지를 한 번만 월별로 집계해 두고(전체 + 파트/업체/고장유형별), 분기/반기는 월별 집계를 합쳐서 만듭니다.
+# (분석 기간, 비교 기준) 조합이 바뀌어도 원본 행을 다시 읽지 않고 기간별 집계에서 바로 찾습니다.
+# 수리비/수리시간 분위수는 월 × 장비구분 × 정비구분 × 그룹별 스케치(utils.sketch)로 저장해 두고 필요한 조합만 합쳐 계산합니다.
+
+import numpy as np
+import pandas as pd
+
+from utils import sketch
+from utils.monthly_report import EQUIPMENT_PATTERNS
+
+# 분석 기간별 개월 수
+PERIOD_MONTHS = {"월별": 1, "분기별": 3, "반기별": 6}
+# 비교 기준별 이동 개월 수
+COMPARE_MONTHS = {"전월 대비": 1, "전분기 대비": 3, "전년 동기 대비": 12}
+
+# 기본 집계 차원 {이름: 묶을 컬럼}
+DIMENSIONS = {
+    '정비자소속': ('정비자소속',),
+    '현장명': ('현장명',),
+    '작업유형 > 정비대상': ('작업유형', '정비대상'),
+    '고장유형': ('고장유형',),
+}
+
+VALUE_COLUMNS = ['건수', '수리비']
+# 분위수 스케치를 저장할 값
+SKETCH_VALUES = ['수리비', '수리시간']
+
+
+def month_index(dates):
+    """날짜 → 월 번호 (년*12 + 월-1, 결측값은 -1)"""
+    dates = pd.to_datetime(dates, errors='coerce')
+    index = dates.dt.year * 12 + dates.dt.month - 1
+    return index.fillna(-1).astype(np.int64).to_numpy()
+
+
+def period_label(period, period_type):
+    """기간 번호 → 표시 이름 (예: 2024-03, 2024년 1분기, 2024년 상반기)"""
+    year, month = divmod(int(period) * PERIOD_MONTHS[period_type], 12)
+    if period_type == "분기별":
+        return f"{year}년 {month // 3 + 1}분기"
+    if period_type == "반기별":
+        return f"{year}년 {'상' if month < 6 else '하'}반기"
+    return f"{year}-{month + 1:02d}"
+
+
+def period_months(period, period_type):
+    """기간 번호 → (첫 월 번호, 마지막 월 번호)"""
+    months = PERIOD_MONTHS[period_type]
+    return int(period) * months, int(period) * months + months - 1
+
+
+def equipment_bits(df):
+    """장비 구분(EQUIPMENT_PATTERNS) 일치 여부를 비트로 묶은 행별 코드 (자재내역이 없으면 모든 구분에 포함)"""
+    bits = np.zeros(len(df), dtype=np.int64)
+    for position, pattern in enumerate(EQUIPMENT_PATTERNS.values()):
+        if '자재내역' in df.columns:
+            matched = df['자재내역'].astype('string').str.contains(pattern, na=False, case=False).to_numpy(dtype=bool)
+        else:
+            matched = np.ones(len(df), dtype=bool)
+        bits |= matched.astype(np.int64) << position
+    return bits
+
+
+class PeriodCube:
+    """월별 집계 (전체 + 차원별)와 분기/반기 합계. 데이터셋마다 한 번 만들어 재사용"""
+
+    def __init__(self, df, dimensions=DIMENSIONS):
+        months = month_index(df['정비일자'])
+        valid = months >= 0
+        cost = df['수리비'].fillna(0).to_numpy() if '수리비' in df.columns else np.zeros(len(df))
+        base = pd.DataFrame({'month': months, '건수': 1, '수리비': cost})
+
+        self.monthly_totals = base[valid].groupby('month')[VALUE_COLUMNS].sum()
+        self.monthly = {}
+        for name, columns in dimensions.items():
+            if not all(column in df.columns for column in columns):
+                continue
+            keyed = base.assign(**{f'_key{i}': df[column].to_numpy() for i, column in enumerate(columns)})[valid]
+            key_columns = [f'_key{i}' for i in range(len(columns))]
+            frame = keyed.groupby(['month'] + key_columns, sort=True)[VALUE_COLUMNS].sum()
+            # 여러 컬럼으로 묶은 차원은 'A > B' 형태의 한 키로 합침 (집계 후이므로 그룹 수만큼만 처리)
+            if len(columns) > 1:
+                keys = frame.index.droplevel(0).map(lambda parts: ' > '.join(map(str, parts)))
+                frame.index = pd.MultiIndex.from_arrays([frame.index.get_level_values(0), keys],
+                                                        names=['month', 'key'])
+            else:
+                frame.index = frame.index.set_names(['month', 'key'])
+            self.monthly[name] = frame
+        self._rollups = {}
+
+        # 분위수 스케치 {값: {차원(None=전체): 스케치 행}} - 그룹은 코드로 저장하고 이름은 _sketch_keys에
+        maintenance = df['정비구분'] if '정비구분' in df.columns else pd.Series(None, index=df.index, dtype=object)
+        maintenance_codes, self._maintenance_types = pd.factorize(maintenance)
+        segments = pd.DataFrame({'month': months, '장비구분': equipment_bits(df), '정비구분': maintenance_codes})
+        self._sketch_keys = {}
+        for name, columns in dimensions.items():
+            if not all(column in df.columns for column in columns):
+                continue
+            if len(columns) > 1:
+                # 월별 집계와 같이 한 컬럼이라도 비어 있으면 제외
+                codes, keys = pd.factorize(pd.MultiIndex.from_arrays([df[column].to_numpy() for column in columns]))
+                codes[df[list(columns)].isna().any(axis=1).to_numpy()] = -1
+                keys = keys.map(lambda parts: ' > '.join(map(str, parts)))
+            else:
+                codes, keys = pd.factorize(df[columns[0]])
+            self._sketch_keys[name] = pd.Index(keys)
+            segments[name] = codes
+        segment_columns = ['month', '장비구분', '정비구분']
+        self.sketches = {}
+        for value in SKETCH_VALUES:
+            if value not in df.columns:
+                continue
+            frame = segments.assign(값=pd.to_numeric(df[value], errors='coerce').to_numpy())[valid]
+            self.sketches[value] = {None: sketch.build_sketches(frame, segment_columns)}
+            for name in self._sketch_keys:
+                self.sketches[value][name] = sketch.build_sketches(frame[frame[name] >= 0], segment_columns + [name])
+
+    def rollup(self, period_type):
+        """(기간별 전체 합계, {차원: 기간별 합계}) - 분기/반기는 월별 집계를 합쳐 만들고 캐싱"""
+        if period_type not in self._rollups:
+            months = PERIOD_MONTHS[period_type]
+            if months == 1:
+                result = (self.monthly_totals, self.monthly)
+            else:
+                totals = self.monthly_totals.groupby(self.monthly_totals.index // months).sum()
+                dims = {}
+                for name, frame in self.monthly.items():
+                    periods = frame.index.get_level_values('month') // months
+                    dims[name] = frame.groupby([periods, frame.index.get_level_values('key')], sort=True).sum()
+                    dims[name].index = dims[name].index.set_names(['month', 'key'])
+                result = (totals, dims)
+            self._rollups[period_type] = result
+        return self._rollups[period_type]
+
+    def periods(self, period_type):
+        """데이터가 있는 기간 번호 (최근 순)"""
+        totals, _ = self.rollup(period_type)
+        return list(totals.index[::-1])
+
+    def baseline(self, period, period_type, compare_type):
+        """비교 기간 번호 (비교 기준 개월 수만큼 이전, 최소 한 기간)"""
+        return period - max(1, COMPARE_MONTHS[compare_type] // PERIOD_MONTHS[period_type])
+
+    def totals(self, period, period_type):
+        """기간 전체 건수/수리비/건당 평균 수리비"""
+        totals, _ = self.rollup(period_type)
+        cases, cost = totals.loc[period].tolist() if period in totals.index else (0, 0.0)
+        return {'건수': int(cases), '수리비': float(cost), '건당평균': cost / cases if cases > 0 else 0.0}
+
+    def trend(self, period_type, last=12):
+        """최근 last개 기간의 건수/수리비 (표시 이름 포함)"""
+        totals, _ = self.rollup(period_type)
+        recent = totals.tail(last)
+        return recent.assign(기간=[period_label(period, period_type) for period in recent.index])
+
+    def breakdown(self, dimension, period, period_type):
+        """기간 내 차원별 건수/수리비 (해당 기간에 있는 그룹만)"""
+        _, dims = self.rollup(period_type)
+        frame = dims.get(dimension)
+        if frame is None or period not in frame.index.get_level_values('month'):
+            return pd.DataFrame(columns=VALUE_COLUMNS)
+        return frame.xs(period, level='month')
+
+    def top(self, dimension, period, period_type, n=5, by='수리비'):
+        """기간 내 by 기준 상위 n개 그룹"""
+        return self.breakdown(dimension, period, period_type).nlargest(n, by)
+
+    def matrix(self, dimension, period_type, value='수리비'):
+        """
+        (그룹 키, 기간 번호, 그룹 × 기간 2차원 배열) - 첫 기간부터 마지막 기간까지 빠짐없이, 없는 값은 0
+        dimension=None이면 전체 합계 한 줄 (키 '전체')
+        """
+        totals, dims = self.rollup(period_type)
+        if totals.empty:
+            return [], [], np.zeros((0, 0))
+        periods = np.arange(totals.index.min(), totals.index.max() + 1)
+        if dimension is None:
+            return ['전체'], list(periods), totals[value].reindex(periods, fill_value=0).to_numpy()[None, :]
+        table = dims[dimension][value].unstack('month', fill_value=0).reindex(columns=periods, fill_value=0)
+        return list(table.index), list(periods), table.to_numpy(dtype=float)
+
+    def compare(self, dimension, period, base_period, period_type):
+        """차원별 현재/비교 기간 수리비와 증감 (두 기간 중 한쪽에만 있는 그룹은 0으로 채움)"""
+        current = self.breakdown(dimension, period, period_type)['수리비']
+        previous = self.breakdown(dimension, base_period, period_type)['수리비']
+        comparison = pd.DataFrame({'현재': current, '비교': previous}).fillna(0)
+        comparison['증감액'] = comparison['현재'] - comparison['비교']
+        comparison['증감률'] = comparison['증감액'] / comparison['비교'].replace(0, 1) * 100
+        return comparison
+
+    def percentiles(self, value, dimension=None, months=None, equipment="전체", maintenance_type="전체",
+                    quantiles=sketch.PERCENTILES):
+        """
+        value(수리비/수리시간)의 분위수 - 조건에 맞는 월/구분 스케치를 합쳐 계산 (원본 행을 다시 읽지 않음)
+        months: (첫 월 번호, 마지막 월 번호), None이면 전체 기간
+        equipment/maintenance_type: 월별 종합 분석의 장비 구분/정비구분 필터와 같은 의미
+        반환: 그룹(dimension=None이면 '전체')별 건수, P50, P90, P99
+        """
+        table = self.sketches.get(value, {}).get(dimension)
+        if table is None:
+            return pd.DataFrame(columns=['건수'] + [sketch.percentile_label(q) for q in quantiles])
+
+        mask = np.ones(len(table), dtype=bool)
+        if months is not None:
+            mask &= table['month'].between(*months).to_numpy()
+        if equipment in EQUIPMENT_PATTERNS:
+            bit = 1 << list(EQUIPMENT_PATTERNS).index(equipment)
+            mask &= (table['장비구분'].to_numpy() & bit) != 0
+        if maintenance_type != "전체":
+            mask &= table['정비구분'].to_numpy() == self._maintenance_types.get_indexer([maintenance_type])[0]
+
+        result = sketch.merged_quantiles(table[mask], [] if dimension is None else [dimension], quantiles)
+        if dimension is not None:
+            result.index = pd.Index(self._sketch_keys[dimension][result.index], name=dimension)
+        return result
@@ -0,0 +1,196 @@
+# utils/prediction.py
+# 정비 예측 엔진 (Streamlit 의존성 없음)
+# 재정비간격(같은 장비의 연속 정비 사이 일수)으로 브랜드_모델별 Weibull 분포를 적합하고, 장비별 다음 정비 위험도를 계산합니다.
+# - 각 장비의 마지막 정비 이후 기준일까지의 기간은 "아직 정비가 없었던" 중도절단 관측으로 함께 사용
+# - 모든 그룹을 한 번에 적합 (형상 모수는 그룹별 이분법을 배열 연산으로 동시에 수행)
+# - 정비 건수가 적은 모델은 브랜드, 브랜드도 적으면 전체 분포를 사용
+# - 장비 전체 점수 계산은 한 번의 배열 연산
+
+import numpy as np
+import pandas as pd
+
+# 그룹별 분포를 사용하기 위한 최소 재정비 건수
+MIN_EVENTS = 8
+# 우선순위 구간 (예측 기간 내 정비 발생 확률)
+PRIORITY_LEVELS = [(0.5, "높음"), (0.2, "중간"), (0.0, "낮음")]
+UNKNOWN = "미상"
+
+
+def fit_weibull(durations, observed, groups, n_groups, iterations=60):
+    """
+    그룹별 우측 중도절단 Weibull 최대우도 추정 → (형상 k, 척도 λ, 재정비 건수) 배열
+    durations: 기간(일), observed: 정비 발생 여부(1) / 중도절단(0), groups: 그룹 번호(0..n_groups-1)
+    형상 k는 프로파일 우도 방정식을 이분법으로 풀고, 척도는 λ^k = Σt^k / 발생건수
+    """
+    durations = np.maximum(np.round(np.asarray(durations, dtype=float) * 2) / 2, 0.5)
+    observed = np.asarray(observed, dtype=np.int64)
+    groups = np.asarray(groups, dtype=np.int64)
+
+    # 기간은 일 단위라 (그룹, 발생 여부, 기간) 조합이 많지 않음 → 고유 조합과 건수로 압축해 반복 계산량을 줄임
+    steps = (durations * 2).astype(np.int64)
+    radix = int(steps.max(initial=0)) + 1
+    unique, counts = np.unique((groups * 2 + observed) * radix + steps, return_counts=True)
+    steps_unique, group_observed = unique % radix, unique // radix
+    groups, observed = group_observed // 2, group_observed % 2
+    weights = counts.astype(float)
+
+    # 수치 안정성을 위해 기간을 중앙값으로 나눠 계산한 뒤 척도에 다시 곱함
+    reference = float(np.median(durations)) if len(durations) else 1.0
+    t = steps_unique / 2 / reference
+    log_t = np.log(t)
+
+    events = np.bincount(groups, weights=observed * weights, minlength=n_groups)
+    safe_events = np.maximum(events, 1)
+    mean_log_events = np.bincount(groups, weights=observed * weights * log_t, minlength=n_groups) / safe_events
+
+    def sums(k):
+        tk = weights * t ** k[groups]
+        return (np.bincount(groups, weights=tk, minlength=n_groups),
+                np.bincount(groups, weights=tk * log_t, minlength=n_groups))
+
+    # 1/k + mean(log t | 발생) - Σ t^k log t / Σ t^k 는 k에 대해 감소 → 부호로 구간을 좁힘
+    low = np.full(n_groups, 0.05)
+    high = np.full(n_groups, 20.0)
+    for _ in range(iterations):
+        k = (low + high) / 2
+        s0, s1 = sums(k)
+        score = 1 / k + mean_log_events - s1 / np.maximum(s0, 1e-300)
+        low = np.where(score > 0, k, low)
+        high = np.where(score > 0, high, k)
+
+    shape = (low + high) / 2
+    s0, _ = sums(shape)
+    scale = (s0 / safe_events) ** (1 / shape) * reference
+    return shape, scale, events
+
+
+def _codes(values):
+    """값 → (그룹 번호, 그룹 이름)"""
+    codes, names = pd.factorize(values, sort=True)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(names), codes)
+        names = np.append(np.asarray(names, dtype=object), UNKNOWN)
+    return codes, np.asarray(names, dtype=object)
+
+
+def _mode_by(owner_codes, n_owners, values):
+    """owner별 가장 잦은 values (동률이면 먼저 정렬되는 값, 값이 없으면 None)"""
+    value_codes, names = pd.factorize(values, sort=True)
+    valid = value_codes >= 0
+    pairs = owner_codes[valid].astype(np.int64) * max(len(names), 1) + value_codes[valid]
+    unique, counts = np.unique(pairs, return_counts=True)
+    owners, codes = unique // max(len(names), 1), unique % max(len(names), 1)
+    order = np.lexsort((codes, -counts, owners))
+    first = order[np.r_[True, owners[order][1:] != owners[order][:-1]]] if len(order) else order
+    result = np.full(n_owners, None, dtype=object)
+    result[owners[first]] = np.asarray(names, dtype=object)[codes[first]]
+    return result
+
+
+class IntervalModel:
+    """브랜드_모델 / 브랜드 / 전체 3단계 Weibull 재정비간격 모델 (데이터셋 버전, 기준일마다 한 번 적합)"""
+
+    def __init__(self, df, as_of=None, min_events=MIN_EVENTS):
+        columns = [column for column in ['관리번호', '정비일자', '재정비간격', '브랜드', '브랜드_모델', '현장명', '고장유형']
+                   if column in df.columns]
+        data = df.loc[df['정비일자'].notna() & df['관리번호'].notna(), columns]
+        data = data.sort_values(['관리번호', '정비일자'], kind='stable')
+        self.as_of = pd.Timestamp(as_of) if as_of is not None else data['정비일자'].max()
+        self.min_events = min_events
+        data = data[data['정비일자'] <= self.as_of]
+
+        # 장비별 현재 상태 (정렬된 이력의 마지막 행)
+        self.assets = self._asset_features(data)
+
+        # 관측: 재정비 간격(발생) + 마지막 정비 후 경과 기간(중도절단)
+        intervals = data[data['재정비간격'] > 0] if '재정비간격' in data.columns else data.iloc[0:0]
+        durations = np.r_[intervals['재정비간격'].to_numpy(dtype=float), self.assets['경과일수'].to_numpy(dtype=float)]
+        observed = np.r_[np.ones(len(intervals)), np.zeros(len(self.assets))]
+        brand_models = np.r_[self._column(intervals, '브랜드_모델'), self._column(self.assets, '브랜드_모델')]
+        brands = np.r_[self._column(intervals, '브랜드'), self._column(self.assets, '브랜드')]
+        self.params = self._fit_levels(durations, observed, brand_models, brands)
+
+    @staticmethod
+    def _column(frame, column):
+        if column in frame.columns:
+            return frame[column].to_numpy(dtype=object)
+        return np.full(len(frame), UNKNOWN, dtype=object)
+
+    def _asset_features(self, data):
+        """장비별 마지막 정비일, 정비 횟수, 평균 재정비간격, 가장 잦은 고장유형 (관리번호순 정렬된 이력에서 배열 연산)"""
+        codes = pd.factorize(data['관리번호'])[0]
+        n_assets = codes.max() + 1 if len(codes) else 0
+        last = np.r_[codes[1:] != codes[:-1], True] if len(codes) else np.zeros(0, dtype=bool)
+
+        assets = data[last].drop(columns=['재정비간격', '고장유형'], errors='ignore')
+        assets = assets.rename(columns={'정비일자': '최근정비일자'}).reset_index(drop=True)
+        assets['정비횟수'] = np.bincount(codes, minlength=n_assets)
+        if '재정비간격' in data.columns:
+            intervals = data['재정비간격'].to_numpy(dtype=float)
+            positive = intervals > 0
+            totals = np.bincount(codes, weights=np.where(positive, intervals, 0), minlength=n_assets)
+            counts = np.bincount(codes, weights=positive, minlength=n_assets)
+            assets['평균재정비간격'] = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+        assets['경과일수'] = (self.as_of - assets['최근정비일자']).dt.days.clip(lower=0)
+
+        if '고장유형' in data.columns:
+            faults = data['고장유형'].to_numpy(dtype=object)
+            assets['예상고장유형'] = _mode_by(codes, n_assets, faults)
+            # 장비 이력에 고장유형이 없으면 같은 모델에서 가장 잦은 고장유형
+            if '브랜드_모델' in data.columns:
+                model_codes, model_names = _codes(data['브랜드_모델'].to_numpy(dtype=object))
+                model_top = pd.Series(_mode_by(model_codes, len(model_names), faults), index=model_names)
+                assets['예상고장유형'] = assets['예상고장유형'].fillna(assets['브랜드_모델'].map(model_top))
+        return assets
+
+    def _fit_levels(self, durations, observed, brand_models, brands):
+        """모델/브랜드/전체 분포를 적합하고 모델별로 사용할 분포를 선택"""
+        model_codes, model_names = _codes(brand_models)
+        brand_codes, brand_names = _codes(brands)
+
+        model_k, model_scale, model_events = fit_weibull(durations, observed, model_codes, len(model_names))
+        brand_k, brand_scale, brand_events = fit_weibull(durations, observed, brand_codes, len(brand_names))
+        global_k, global_scale, global_events = fit_weibull(durations, observed, np.zeros(len(durations), dtype=np.int64), 1)
+
+        # 모델 → 브랜드 (모델별 관측의 첫 브랜드)
+        first = pd.Series(brand_codes).groupby(model_codes).first().reindex(range(len(model_names))).to_numpy()
+        use_model = model_events >= self.min_events
+        use_brand = ~use_model & (brand_events[first] >= self.min_events)
+
+        params = pd.DataFrame({
+            '브랜드_모델': model_names,
+            '브랜드': brand_names[first],
+            '적용분포': np.where(use_model, "모델", np.where(use_brand, "브랜드", "전체")),
+            '형상': np.where(use_model, model_k, np.where(use_brand, brand_k[first], global_k[0])),
+            '척도(일)': np.where(use_model, model_scale, np.where(use_brand, brand_scale[first], global_scale[0])),
+            '재정비건수': model_events.astype(np.int64),
+        })
+        params['중앙값(일)'] = params['척도(일)'] * np.log(2) ** (1 / params['형상'])
+        return params.set_index('브랜드_모델')
+
+    def score(self, horizon_days=30):
+        """
+        장비 전체 위험도 (한 번의 배열 연산, 위험도 내림차순)
+        위험도: 마지막 정비 후 지금까지 정비가 없었다는 조건에서 horizon_days 안에 정비가 발생할 확률
+        예상다음정비일: 조건부 잔여기간의 중앙값 기준
+        """
+        assets = self.assets
+        params = self.params.reindex(pd.Series(self._column(assets, '브랜드_모델')).fillna(UNKNOWN))
+        shape = params['형상'].fillna(self.params['형상'].median()).to_numpy()
+        scale = params['척도(일)'].fillna(self.params['척도(일)'].median()).to_numpy()
+        age = assets['경과일수'].to_numpy(dtype=float)
+
+        hazard_now = (age / scale) ** shape
+        risk = 1 - np.exp(hazard_now - ((age + horizon_days) / scale) ** shape)
+        residual = scale * (hazard_now + np.log(2)) ** (1 / shape) - age
+
+        result = assets.assign(
+            위험도=risk,
+            예상잔여일수=np.round(residual),
+            예상다음정비일=self.as_of + pd.to_timedelta(np.round(residual), unit='D'),
+            적용분포=params['적용분포'].fillna("전체").to_numpy(),
+        )
+        thresholds = [level for level, _ in PRIORITY_LEVELS]
+        labels = np.array([label for _, label in PRIORITY_LEVELS])
+        result['우선순위'] = labels[np.argmax(risk[:, None] >= np.array(thresholds)[None, :], axis=1)]
+        return result.sort_values('위험도', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,125 @@
+# utils/render_profiler.py
+# 페이지 렌더링 시간 측정 (선택 사용)
+# 페이지를 구역(탭, 요약, 다운로드 등)으로 나누고, 구역마다 집계 / 차트 생성 / 직렬화(st.plotly_chart, st.dataframe)
+# 시간을 따로 합산합니다. 꺼져 있으면 모듈을 감싸지 않고 원래 객체를 그대로 사용하므로 추가 비용이 없습니다.
+
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+import streamlit as st
+
+from utils import tables
+
+# 측정 분류
+AGGREGATION = "집계"
+FIGURE = "차트 생성"
+SERIALIZATION = "직렬화"
+OTHER = "기타"
+CATEGORIES = [AGGREGATION, FIGURE, SERIALIZATION, OTHER]
+
+# 구역 밖에서 실행된 코드 (필터링, 상단 지표 등)
+COMMON_SECTION = "공통"
+
+
+class _Instrumented:
+    """모듈/객체의 함수 호출 시간을 측정하는 대리 객체 (names가 주어지면 해당 이름만 측정)"""
+
+    def __init__(self, profiler, target, category, names=None):
+        self._profiler = profiler
+        self._target = target
+        self._category = category
+        self._names = names
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if not callable(value) or (self._names is not None and name not in self._names):
+            return value
+        return self._profiler.timed(self._category, name, value)
+
+
+class RenderProfiler:
+    """한 번의 페이지 실행(rerun) 동안 구역별/분류별 시간을 기록"""
+
+    def __init__(self, page, enabled=False):
+        self.page = page
+        self.enabled = enabled
+        self.records = []
+        self.section_seconds = {}
+        self._section = COMMON_SECTION
+        self._started = time.perf_counter()
+
+    def instrument(self, target, category, names=None):
+        """target(모듈 등)의 함수 호출을 category로 측정하는 대리 객체 (꺼져 있으면 target 그대로)"""
+        if not self.enabled:
+            return target
+        return _Instrumented(self, target, category, names)
+
+    def timed(self, category, name, func):
+        """func 호출 시간을 현재 구역의 category로 기록하는 함수"""
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.records.append((self._section, category, name, time.perf_counter() - start))
+        return wrapper
+
+    def section(self, name):
+        """구역 시간 측정 컨텍스트 (꺼져 있으면 아무것도 하지 않음)"""
+        if not self.enabled:
+            return nullcontext()
+        return self._section_context(name)
+
+    @contextmanager
+    def _section_context(self, name):
+        previous, self._section = self._section, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.section_seconds[name] = self.section_seconds.get(name, 0.0) + time.perf_counter() - start
+            self._section = previous
+
+    def summary(self):
+        """구역 × 분류별 시간 표 (초). 구역 전체 시간에서 측정된 호출을 뺀 나머지는 '기타'"""
+        total_seconds = time.perf_counter() - self._started
+        records = pd.DataFrame(self.records, columns=['구역', '분류', '호출', '초'])
+        table = records.pivot_table(index='구역', columns='분류', values='초', aggfunc='sum', fill_value=0.0)
+        table = table.reindex(columns=CATEGORIES[:-1], fill_value=0.0)
+
+        section_seconds = dict(self.section_seconds)
+        section_seconds[COMMON_SECTION] = total_seconds - sum(self.section_seconds.values())
+        table = table.reindex(list(section_seconds), fill_value=0.0)
+        table['합계'] = pd.Series(section_seconds)
+        table[OTHER] = (table['합계'] - table[CATEGORIES[:-1]].sum(axis=1)).clip(lower=0)
+        return table[CATEGORIES + ['합계']]
+
+    def slowest_calls(self, top_n=10):
+        """가장 오래 걸린 개별 호출"""
+        records = pd.DataFrame(self.records, columns=['구역', '분류', '호출', '초'])
+        return records.nlargest(top_n, '초')
+
+    def render(self, container=st, history_size=20):
+        """측정 결과 표시 (페이지별로 최근 실행 기록을 세션에 보관)"""
+        if not self.enabled:
+            return
+
+        table = self.summary()
+        history = st.session_state.setdefault('render_profiles', {}).setdefault(self.page, [])
+        history.append(table)
+        del history[:-history_size]
+
+        with container.expander(f"⏱️ 렌더링 시간 측정 (총 {table['합계'].sum():.2f}초)", expanded=True):
+            # Styler 대신 column_config로 표시 (측정 결과 표 자체의 서식 비용이 측정에 섞이지 않도록)
+            seconds = {column: tables.SECONDS for column in CATEGORIES + ['합계']}
+            st.write("**구역별 시간 (초, 이번 실행)**")
+            tables.show_table(table, 'render_profile_sections', seconds)
+
+            if len(history) > 1:
+                st.write(f"**최근 {len(history)}회 평균 (초)**")
+                average = pd.concat(history).groupby(level=0, sort=False).mean()
+                tables.show_table(average, 'render_profile_average', seconds)
+
+            st.write("**오래 걸린 호출 Top 10**")
+            tables.show_table(self.slowest_calls(), 'render_profile_slowest', {'초': tables.SECONDS}, hide_index=True)
@@ -0,0 +1,143 @@
+# utils/scatter.py
+# 대량 데이터 산점도 (Streamlit 의존성 없음)
+# - WebGL(Scattergl)로 그려 브라우저 렌더링 부담을 줄임
+# - 추세선은 statsmodels 없이 NumPy 합계로 최소제곱 직선을 계산 (표본 추출 전 전체 데이터 기준)
+# - 점이 많으면 밀도를 보존하는 표본 추출 또는 구간 집계(2차원 히스토그램)로 표시하고 실제 건수를 함께 표시
+
+import numpy as np
+
+# 이 건수를 넘으면 표본 추출/구간 집계 적용
+LARGE_SCATTER_THRESHOLD = 5000
+
+# 표시 방식
+MODE_SAMPLE = "sample"
+MODE_BINNED = "binned"
+
+
+def ols_fit(x, y):
+    """최소제곱 직선 y = slope * x + intercept (결측값 제외, 점이 2개 미만이거나 x가 모두 같으면 None)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = int(mask.sum())
+    if n < 2:
+        return None
+
+    x, y = x[mask], y[mask]
+    sum_x, sum_y = x.sum(), y.sum()
+    sxx = (x * x).sum() - sum_x * sum_x / n
+    if sxx <= 0:
+        return None
+    sxy = (x * y).sum() - sum_x * sum_y / n
+    syy = (y * y).sum() - sum_y * sum_y / n
+
+    slope = sxy / sxx
+    intercept = (sum_y - slope * sum_x) / n
+    r_squared = (sxy * sxy) / (sxx * syy) if syy > 0 else 0.0
+    return {'slope': slope, 'intercept': intercept, 'r_squared': r_squared, 'n': n,
+            'x_min': x.min(), 'x_max': x.max()}
+
+
+def density_sample(x, y, max_points=LARGE_SCATTER_THRESHOLD, bins=64, seed=0):
+    """
+    밀도를 보존하는 표본 추출: 격자 칸별로 건수에 비례해 추출하되, 점이 있는 칸은 최소 1개를 남겨
+    드문 영역(이상치)이 사라지지 않게 합니다. 선택된 행의 위치(정수 인덱스)를 반환합니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+
+    cell = _grid_cells(x, y, bins)
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(n)
+
+    # 무작위 순서로 칸별 순번을 매겨, 칸마다 앞에서부터 할당량만큼 선택
+    cell_sorted = cell[order]
+    sort_index = np.argsort(cell_sorted, kind='stable')
+    cells_in_order = cell_sorted[sort_index]
+    starts = np.r_[0, np.flatnonzero(np.diff(cells_in_order)) + 1]
+    counts = np.diff(np.r_[starts, n])
+    rank = np.arange(n) - np.repeat(starts, counts)
+
+    quota = np.maximum(1, np.floor(counts * (max_points / n))).astype(np.int64)
+    keep = rank < np.repeat(quota, counts)
+    return np.sort(order[sort_index[keep]])
+
+
+def _grid_cells(x, y, bins):
+    """점이 속한 격자 칸 번호 (결측값은 별도 칸)"""
+    def bucket(values):
+        finite = np.isfinite(values)
+        if not finite.any():
+            return np.zeros(len(values), dtype=np.int64)
+        low, high = values[finite].min(), values[finite].max()
+        scaled = (values - low) / (high - low) * (bins - 1) if high > low else np.zeros(len(values))
+        return np.where(finite, np.nan_to_num(scaled), bins).astype(np.int64)
+    return bucket(x) * (bins + 1) + bucket(y)
+
+
+def binned_density(x, y, bins=60):
+    """2차원 구간 집계 (건수 격자와 구간 중심값)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    mask = np.isfinite(x) & np.isfinite(y)
+    counts, x_edges, y_edges = np.histogram2d(x[mask], y[mask], bins=bins)
+    return counts, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def large_scatter(df, x, y, color=None, title=None, mode=MODE_SAMPLE, threshold=LARGE_SCATTER_THRESHOLD,
+                  trendline=True):
+    """
+    대량 데이터용 산점도 (Scattergl + 그룹별 최소제곱 추세선)
+    - 건수가 threshold 이하이면 모든 점 표시
+    - 초과하면 mode에 따라 밀도 보존 표본 추출(MODE_SAMPLE) 또는 구간 집계 히트맵(MODE_BINNED)
+    제목에 실제 건수(N)와 표시한 점 수를 함께 표시합니다.
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    data = df[[x, y] + ([color] if color else [])].dropna(subset=[x, y])
+    total = len(data)
+    fig = go.Figure()
+
+    # 그룹별 색상은 전체 데이터 기준으로 고정 (표본에 없는 그룹이 있어도 점/추세선 색이 일치)
+    palette = qualitative.Plotly
+    names = sorted(data[color].dropna().unique()) if color else [None]
+    colors = {name: palette[i % len(palette)] for i, name in enumerate(names)}
+
+    if total > threshold and mode == MODE_BINNED:
+        counts, x_centers, y_centers = binned_density(data[x], data[y])
+        fig.add_trace(go.Heatmap(x=x_centers, y=y_centers, z=np.where(counts.T > 0, counts.T, np.nan),
+                                 colorscale='Blues', colorbar=dict(title='건수'), name='건수'))
+        shown_text = "구간 집계"
+    else:
+        shown = data.iloc[density_sample(data[x], data[y], threshold)] if total > threshold else data
+        groups = shown.groupby(color, sort=True) if color else [(None, shown)]
+        for name, group in groups:
+            fig.add_trace(go.Scattergl(x=group[x], y=group[y], mode='markers', name=str(name) if color else y,
+                                       legendgroup=str(name), showlegend=bool(color),
+                                       marker=dict(color=colors[name], size=5, opacity=0.6)))
+        shown_text = f"표시 {len(shown):,}개" if len(shown) < total else "전체 표시"
+
+    if trendline:
+        # 추세선은 항상 전체 데이터 기준
+        groups = data.groupby(color, sort=True) if color else [(None, data)]
+        for name, group in groups:
+            fit = ols_fit(group[x], group[y])
+            if fit is None:
+                continue
+            line_x = np.array([fit['x_min'], fit['x_max']])
+            fig.add_trace(go.Scattergl(
+                x=line_x, y=fit['slope'] * line_x + fit['intercept'], mode='lines',
+                name=f"{name} 추세선" if color else "추세선", legendgroup=str(name), showlegend=False,
+                line=dict(color=colors[name] if color else 'red', width=2),
+                hovertemplate=(f"{name}<br>" if color else "") +
+                              f"y = {fit['slope']:.4g}x + {fit['intercept']:.4g}<br>R² = {fit['r_squared']:.3f}"
+                              f"<br>N = {fit['n']:,}<extra></extra>"
+            ))
+
+    fig.update_layout(title=f"{title or f'{x} vs {y}'} (N={total:,}, {shown_text})",
+                      xaxis_title=x, yaxis_title=y)
+    return fig
@@ -0,0 +1,82 @@
+# utils/sketch.py
+# 합칠 수 있는 분위수 스케치 (Streamlit 의존성 없음)
+# 값을 로그 간격 구간(γ = (1+α)/(1-α))에 넣고 구간별 건수만 저장하는 DDSketch 방식입니다.
+# - 같은 구간 번호끼리 건수를 더하면 두 스케치가 합쳐지므로, 월/그룹별 스케치를 더해서 어떤 기간·그룹 조합의 분위수도 계산
+# - 구간 대표값의 상대 오차는 α 이내 (수리비 100만원이면 ±1만원)
+# - 0 이하 값은 별도 구간 하나에 모음
+
+import numpy as np
+import pandas as pd
+
+# 상대 오차 한도
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(GAMMA)
+# 0 이하 값 구간 번호
+ZERO_BUCKET = np.iinfo(np.int32).min
+# 기본 표시 분위수
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def percentile_label(q):
+    """0.9 → 'P90'"""
+    return f"P{q * 100:g}"
+
+
+def bucket_index(values):
+    """값 배열 → 구간 번호 배열 (0 이하는 ZERO_BUCKET)"""
+    values = np.asarray(values, dtype=float)
+    positive = values > 0
+    index = np.full(len(values), ZERO_BUCKET, dtype=np.int64)
+    index[positive] = np.ceil(np.log(values[positive]) / _LOG_GAMMA)
+    return index
+
+
+def bucket_value(index):
+    """구간 번호 → 대표값 (구간 [γ^(i-1), γ^i]에서 상대 오차가 가장 작은 값)"""
+    index = np.asarray(index, dtype=np.int64)
+    values = 2 * np.power(GAMMA, index.astype(float)) / (GAMMA + 1)
+    return np.where(index == ZERO_BUCKET, 0.0, values)
+
+
+def build_sketches(frame, by):
+    """
+    frame의 '값' 컬럼을 by 컬럼 조합별 스케치로 요약
+    반환: by 컬럼 + 구간, 건수 (결측값 제외, 구간별 건수만 저장하므로 행 수는 조합 수 × 구간 수 이하)
+    """
+    frame = frame[frame['값'].notna()]
+    keyed = frame[by].assign(구간=bucket_index(frame['값'].to_numpy()))
+    return keyed.groupby(by + ['구간'], sort=False).size().rename('건수').reset_index()
+
+
+def merged_quantiles(sketches, by=(), quantiles=PERCENTILES):
+    """
+    스케치 행(by 컬럼 + 구간, 건수)을 by 조합별로 합친 뒤 분위수 계산
+    반환: by 조합을 인덱스로 건수 + 분위수별 컬럼(P50, P90, ...) (by가 비면 '전체' 한 행)
+    """
+    by = list(by)
+    columns = ['건수'] + [percentile_label(q) for q in quantiles]
+    if sketches.empty:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    # 합치기: 같은 (그룹, 구간)의 건수를 더함
+    merged = sketches.groupby(by + ['구간'], sort=True)['건수'].sum()
+    if by:
+        groups, index = merged.index.droplevel('구간').factorize()
+        index = index.set_names(by)
+    else:
+        groups, index = np.zeros(len(merged), dtype=np.int64), pd.Index(['전체'])
+    buckets = merged.index.get_level_values('구간').to_numpy()
+    counts = merged.to_numpy()
+
+    # 그룹별 누적 건수에서 순위 q·(n-1)를 넘는 첫 구간 (정렬되어 있으므로 그룹 구간은 연속)
+    cumulative = np.cumsum(counts)
+    totals = np.bincount(groups, weights=counts, minlength=len(index))
+    starts = np.searchsorted(groups, np.arange(len(index)))
+    offsets = np.where(starts > 0, cumulative[np.maximum(starts - 1, 0)], 0)
+    result = pd.DataFrame({'건수': totals.astype(np.int64)}, index=index)
+    for q in quantiles:
+        targets = offsets + np.floor(q * (totals - 1))
+        positions = np.searchsorted(cumulative, targets, side='right')
+        result[percentile_label(q)] = bucket_value(buckets[positions])
+    return result
@@ -0,0 +1,89 @@
+# utils/tables.py
+# 표 표시 (pandas Styler 대신 column_config 사용)
+# - 숫자 열은 숫자 dtype 그대로 보내고, 천 단위 구분/소수 자릿수는 브라우저에서 column_config로 표시 (단위는 열 이름에 표시)
+# - 행이 많은 표는 서버에서 정렬한 뒤 현재 페이지 구간만 보냄 (정렬 순서는 cache_key별로 캐싱)
+
+import pandas as pd
+import streamlit as st
+
+# 표시 형식: (단위, column_config 숫자 형식, 소수 자릿수)
+WON = ('원', 'localized', 0)
+COUNT = ('건', 'localized', 0)
+HOURS = ('시간', '%.1f', 1)
+PERCENT = ('%', '%.1f', 1)
+SECONDS = ('초', '%.3f', 3)
+
+# 이 행 수를 넘으면 페이지 나눔
+PAGE_SIZE = 50
+
+
+def column_config(frame, formats):
+    """formats {열: 표시 형식}으로 st.dataframe의 column_config 생성 (열 이름에 단위가 없으면 붙임)"""
+    config = {}
+    for column, (unit, number_format, _) in formats.items():
+        if column not in frame.columns:
+            continue
+        label = column if unit in column else f"{column} ({unit})"
+        config[column] = st.column_config.NumberColumn(label, format=number_format)
+    return config
+
+
+def _round_for_display(frame, formats):
+    """'localized' 형식은 소수 자릿수를 지정할 수 없어 표시할 행만 반올림 (dtype 유지)"""
+    decimals = {column: digits for column, (_, number_format, digits) in formats.items()
+                if column in frame.columns and number_format == 'localized'
+                and pd.api.types.is_float_dtype(frame[column])}
+    return frame.round(decimals) if decimals else frame
+
+
+def sort_positions(frame, column, ascending):
+    """column 기준 정렬 순서 (행 위치 배열, 결측값은 마지막)"""
+    values = pd.Series(frame[column].to_numpy())
+    return values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_sort_positions(cache_key, column, ascending, _frame):
+    """cache_key(데이터 버전, 표 이름 등)별 정렬 순서"""
+    return sort_positions(_frame, column, ascending)
+
+
+def show_table(frame, key, formats=None, cache_key=None, page_size=PAGE_SIZE, container=st, **kwargs):
+    """
+    표 표시
+    - 행이 page_size 이하이면 전체를 그대로 표시 (브라우저에서 정렬 가능)
+    - 많으면 정렬 기준/페이지를 선택받아 서버에서 정렬한 구간만 표시
+    key: 위젯 key 접두어, cache_key: frame을 식별하는 값 (주어지면 정렬 순서를 캐싱)
+    """
+    formats = formats or {}
+    config = column_config(frame, formats)
+
+    if len(frame) <= page_size:
+        container.dataframe(_round_for_display(frame, formats), column_config=config,
+                            use_container_width=True, **kwargs)
+        return
+
+    page_count = -(-len(frame) // page_size)
+    col1, col2, col3 = container.columns([2, 1, 1])
+    with col1:
+        sort_column = st.selectbox("정렬 기준", [None] + list(frame.columns), key=f"{key}_sort",
+                                   format_func=lambda column: "기본 순서" if column is None else column)
+    with col2:
+        ascending = st.toggle("오름차순", value=False, key=f"{key}_ascending")
+    with col3:
+        page = st.number_input(f"페이지 (전체 {page_count:,})", min_value=1, max_value=page_count,
+                               value=1, step=1, key=f"{key}_page")
+
+    start = (int(page) - 1) * page_size
+    if sort_column is None:
+        rows = frame.iloc[start:start + page_size]
+    else:
+        if cache_key is None:
+            positions = sort_positions(frame, sort_column, ascending)
+        else:
+            positions = _cached_sort_positions(cache_key, sort_column, ascending, frame)
+        rows = frame.iloc[positions[start:start + page_size]]
+
+    container.dataframe(_round_for_display(rows, formats), column_config=config,
+                        use_container_width=True, **kwargs)
+    container.caption(f"{start + 1:,}–{start + len(rows):,}행 / 전체 {len(frame):,}행")
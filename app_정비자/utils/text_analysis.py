@@ -0,0 +1,170 @@
+# utils/text_analysis.py
+# 자유 입력 텍스트(정비내용/고장내용/사용부품) 형태소 분석 엔진 (Streamlit 의존성 없음)
+# - 같은 문장이 반복되는 경우가 많아 고유 문자열만 분석하고, 결과는 문자열 해시를 키로 sqlite 파일에 저장해 다음 실행부터 재사용
+# - 캐시에 없는 문자열은 묶음으로 나눠 작업 프로세스 풀(ingestion.get_executor)에서 Kiwi로 분석
+# - 키워드 빈도와 그룹(고장유형/브랜드 등)별 TF-IDF는 (고유 문자열 × 단어) 희소 행렬 곱으로 계산
+
+import os
+import sqlite3
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 분석 대상 컬럼 (있는 것만 사용)
+TEXT_COLUMNS = ['정비내용', '고장내용', '사용부품']
+# 남길 품사: 일반/고유 명사, 어근, 외국어
+KEEP_TAGS = ('NNG', 'NNP', 'XR', 'SL')
+# 의미 없는 단어
+STOPWORDS = {'및', '등', '건', '후', '시', '중', '부분', '작업', '확인'}
+# 분석 규칙이 바뀌면 캐시 키도 바뀌도록 해시에 포함
+TOKENIZER_VERSION = f"kiwi:{'+'.join(KEEP_TAGS)}:1"
+# 작업 프로세스 한 번에 보낼 문자열 수
+BATCH_SIZE = 2000
+# 토큰 캐시 파일 (사용자 캐시 폴더)
+TOKEN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "as_employee_analysis", "kiwi_tokens.sqlite")
+
+_SEPARATOR = "\x1f"
+_cache_lock = threading.Lock()
+
+
+def text_key(text):
+    """문자열 → 64비트 정수 키 (분석 규칙 버전 포함)"""
+    digest = hashlib.blake2b(f"{TOKENIZER_VERSION}\x00{text}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+# 작업 프로세스마다 한 번만 생성 (모델 로드에 1초 이상 걸림)
+_kiwi = None
+
+
+def tokenize_batch(texts):
+    """작업 프로세스에서 실행: 문자열 목록 → 단어 튜플 목록"""
+    global _kiwi
+    if _kiwi is None:
+        from kiwipiepy import Kiwi
+        _kiwi = Kiwi()
+    return [tuple(token.form for token in tokens
+                  if token.tag in KEEP_TAGS and len(token.form) > 1 and token.form not in STOPWORDS)
+            for tokens in _kiwi.tokenize(texts)]
+
+
+class TokenCache:
+    """문자열 해시 → 단어 목록 sqlite 캐시 (여러 세션/스레드에서 공유)"""
+
+    def __init__(self, path=TOKEN_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS tokens (key INTEGER PRIMARY KEY, tokens TEXT NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys):
+        """{키: 단어 튜플} (캐시에 있는 것만)"""
+        found = {}
+        with _cache_lock, self._connect() as connection:
+            # sqlite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(keys), 900):
+                chunk = keys[start:start + 900]
+                rows = connection.execute(
+                    f"SELECT key, tokens FROM tokens WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                found.update((key, tuple(value.split(_SEPARATOR)) if value else ()) for key, value in rows)
+        return found
+
+    def put_many(self, items):
+        """[(키, 단어 튜플)] 저장"""
+        with _cache_lock, self._connect() as connection:
+            connection.executemany("INSERT OR REPLACE INTO tokens (key, tokens) VALUES (?, ?)",
+                                   [(key, _SEPARATOR.join(tokens)) for key, tokens in items])
+
+
+def tokenize_unique(texts, cache=None, executor=None, batch_size=BATCH_SIZE):
+    """
+    고유 문자열 목록 → 단어 튜플 목록 (같은 순서)
+    캐시에 없는 문자열만 batch_size씩 작업 프로세스에 나눠 분석하고 결과를 캐시에 저장
+    반환: (단어 튜플 목록, 새로 분석한 문자열 수)
+    """
+    from utils.ingestion import submit_task
+
+    texts = list(texts)
+    keys = [text_key(text) for text in texts]
+    cached = cache.get_many(keys) if cache is not None else {}
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+
+    futures = [submit_task(tokenize_batch, [texts[i] for i in missing[start:start + batch_size]], executor=executor)
+               for start in range(0, len(missing), batch_size)]
+    new_items = []
+    for start, future in zip(range(0, len(missing), batch_size), futures):
+        for i, tokens in zip(missing[start:start + batch_size], future.result()):
+            new_items.append((keys[i], tokens))
+    if cache is not None and new_items:
+        cache.put_many(new_items)
+
+    cached.update(new_items)
+    return [cached[key] for key in keys], len(missing)
+
+
+class TextIndex:
+    """한 텍스트 컬럼의 (고유 문자열 × 단어) 희소 행렬 (데이터셋, 컬럼마다 한 번 생성)"""
+
+    def __init__(self, df, column, cache=None, executor=None):
+        self.column = column
+        texts = df[column].astype('string').str.strip()
+        self.codes, unique = pd.factorize(texts.mask(texts == ""))
+        token_lists, self.tokenized = tokenize_unique(unique, cache=cache, executor=executor)
+
+        # 단어 사전과 (고유 문자열 × 단어) 출현 횟수 행렬
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        flat = [token for tokens in token_lists for token in tokens]
+        term_codes, self.terms = pd.factorize(pd.Series(flat, dtype=object))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(flat)), (np.repeat(np.arange(len(token_lists)), lengths), term_codes)),
+            shape=(len(token_lists), len(self.terms)))
+        self.n_unique = len(token_lists)
+
+    def _group_matrix(self, labels):
+        """(그룹 × 고유 문자열) 행 수 행렬과 그룹 이름"""
+        group_codes, names = pd.factorize(pd.Series(np.asarray(labels, dtype=object)), sort=True)
+        valid = (group_codes >= 0) & (self.codes >= 0)
+        pairs = sparse.csr_matrix((np.ones(valid.sum()), (group_codes[valid], self.codes[valid])),
+                                  shape=(len(names), self.n_unique))
+        return pairs, pd.Index(names)
+
+    def keyword_counts(self, mask=None):
+        """단어별 출현 횟수와 출현 행 수 (mask: 행 선택)"""
+        codes = self.codes if mask is None else self.codes[np.asarray(mask, dtype=bool)]
+        rows = np.bincount(codes[codes >= 0], minlength=self.n_unique).astype(float)
+        counts = self.matrix.T @ rows
+        presence = (self.matrix > 0).astype(float).T @ rows
+        result = pd.DataFrame({'출현횟수': counts, '출현건수': presence}, index=pd.Index(self.terms, name='단어'))
+        result = result[result['출현횟수'] > 0]
+        return result.sort_values('출현횟수', ascending=False)
+
+    def group_tfidf(self, labels, top=10):
+        """
+        그룹(고장유형/브랜드 등)을 한 문서로 보고 단어별 TF-IDF 상위 top개
+        TF: 그룹 안 단어 비율, IDF: log((1 + 그룹 수) / (1 + 단어가 나온 그룹 수)) + 1
+        반환 컬럼: 그룹, 순위, 단어, 출현횟수, TF-IDF
+        """
+        pairs, names = self._group_matrix(labels)
+        counts = (pairs @ self.matrix).tocsr()
+        n_groups = len(names)
+        document_frequency = np.bincount(counts.indices, minlength=len(self.terms))
+        idf = np.log((1 + n_groups) / (1 + document_frequency)) + 1
+        totals = np.asarray(counts.sum(axis=1)).ravel()
+
+        records = []
+        for position in range(n_groups):
+            start, end = counts.indptr[position], counts.indptr[position + 1]
+            if start == end:
+                continue
+            terms, values = counts.indices[start:end], counts.data[start:end]
+            scores = values / totals[position] * idf[terms]
+            order = np.argsort(-scores, kind='stable')[:top]
+            for rank, i in enumerate(order, start=1):
+                records.append((names[position], rank, self.terms[terms[i]], int(values[i]), scores[i]))
+        return pd.DataFrame(records, columns=['그룹', '순위', '단어', '출현횟수', 'TF-IDF'])
@@ -1,60 +1,86 @@
 ## 1. utils/visualization.py
 
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import matplotlib as mpl
+import os
+import json
 import platform
 import streamlit as st
-import io
-import base64
 
-# 폰트 설정 함수 (한 번만 실행되도록 캐싱)
-@st.cache_resource
-def setup_korean_font():
-    # 1. 프로젝트 내 포함된 폰트 우선 적용
-    import os
-    font_path = os.path.join("fonts", "NanumGothic.ttf")
+# matplotlib은 차트를 처음 만들 때 불러옵니다 (앱 시작 시간 단축)
+
+# 프로젝트 내 포함 폰트
+BUNDLED_FONT_PATH = os.path.join("fonts", "NanumGothic.ttf")
+# 리눅스 fallback 순서
+FALLBACK_FONTS = ["Noto Sans CJK KR", "NanumGothic", "Droid Sans Fallback", "UnDotum", "Liberation Sans"]
+# 폰트 검색 결과 저장 파일 (matplotlib 캐시 폴더)
+FONT_CACHE_FILE = "korean_font.json"
+
+
+def _font_cache_path():
+    import matplotlib as mpl
+    return os.path.join(mpl.get_cachedir(), FONT_CACHE_FILE)
 
-    if os.path.exists(font_path):
-        fm.fontManager.addfont(font_path)
-        mpl.rcParams["font.family"] = "NanumGothic"
-        return font_path
 
-    # 2. 시스템별 fallback (폰트가 없을 경우)
+def _scan_korean_font():
+    """시스템 폰트 목록을 검색해 한글 폰트 (family, path) 결정 (없으면 (None, None))"""
     system = platform.system()
     if system == "Windows":
-        mpl.rcParams["font.family"] = "Malgun Gothic"
-    elif system == "Darwin":
-        mpl.rcParams["font.family"] = "AppleGothic"
-    else:
-        fallback_fonts = ["Noto Sans CJK KR", "NanumGothic", "Droid Sans Fallback", "UnDotum", "Liberation Sans"]
-        available_fonts = set(f.name for f in fm.fontManager.ttflist)
-        matched = next((font for font in fallback_fonts if font in available_fonts), None)
+        return "Malgun Gothic", None
+    if system == "Darwin":
+        return "AppleGothic", None
+
+    import matplotlib.font_manager as fm
+    available_fonts = {f.name: f.fname for f in fm.fontManager.ttflist}
+    matched = next((font for font in FALLBACK_FONTS if font in available_fonts), None)
+    return (matched, available_fonts[matched]) if matched else (None, None)
+
+
+def resolve_korean_font(refresh=False):
+    """
+    한글 폰트 (family, path) 결정
+    - 프로젝트 내 폰트가 있으면 항상 우선
+    - 시스템 폰트 검색 결과는 파일로 저장해 다음 프로세스부터 폰트 목록 검색을 건너뜀
+      (저장된 폰트 파일이 없어졌거나 refresh=True이면 다시 검색)
+    """
+    if os.path.exists(BUNDLED_FONT_PATH):
+        return "NanumGothic", BUNDLED_FONT_PATH
 
-        if matched:
-            mpl.rcParams["font.family"] = matched
-        else:
-            mpl.rcParams["font.family"] = "sans-serif"
-            st.warning("⚠️ 한글 폰트가 시스템에 없어 기본 폰트로 대체됩니다. (한글 깨질 수 있음)")
+    cache_path = _font_cache_path()
+    if not refresh:
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved['platform'] == platform.system() and (saved['path'] is None or os.path.exists(saved['path'])):
+                return saved['family'], saved['path']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    family, path = _scan_korean_font()
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'platform': platform.system(), 'family': family, 'path': path}, f, ensure_ascii=False)
+    except OSError:
+        pass  # 저장 실패 시 다음 프로세스에서 다시 검색
+    return family, path
+
+
+# 폰트 설정 함수 (프로세스당 한 번만 실행되도록 캐싱)
+@st.cache_resource
+def setup_korean_font():
+    import matplotlib as mpl
+
+    family, path = resolve_korean_font()
+    if path == BUNDLED_FONT_PATH:
+        import matplotlib.font_manager as fm
+        fm.fontManager.addfont(path)
+
+    if family:
+        mpl.rcParams["font.family"] = family
+    else:
+        mpl.rcParams["font.family"] = "sans-serif"
+        st.warning("⚠️ 한글 폰트가 시스템에 없어 기본 폰트로 대체됩니다. (한글 깨질 수 있음)")
 
     mpl.rcParams["axes.unicode_minus"] = False
-    return None  # fallback일 경우 경로 반환 안 함
-
-# 그래프 다운로드 기능
-def get_image_download_link(fig, filename, text):
-    """그래프를 이미지로 변환하고 다운로드 링크 생성"""
-    buf = io.BytesIO()
-    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    b64 = base64.b64encode(buf.getvalue()).decode()
-    href = f'<a href="data:image/png;base64,{b64}" download="{filename}">{text}</a>'
-    return href
-
-# 한글 폰트가 적용된 그림 객체 생성
-def create_figure(figsize=(10, 6), dpi=100):
-    setup_korean_font()  # 폰트 설정 (캐싱되므로 첫 번째 호출만 실행됨)
-    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
-    return fig, ax
+    return path
 
 # 메뉴별 색상 테마 정의
 def get_color_theme(menu_name):